@@ -1,331 +1,531 @@
+import argparse
+import importlib
+import sys
 import pytest
-from unittest.mock import MagicMock
-from functools import update_wrapper, wraps
 from typing import (
     TYPE_CHECKING,
     Any,
-    Dict,
-    Tuple,
-    Union,
-    List,
-    Sequence,
-    Collection,
-    Callable,
     Optional,
-    TypeVar,
-    Generic,
+    Tuple,
 )
 
-
-F = TypeVar('F', bound=Callable[..., None])
+from pytest_funparam._items import (
+    IdPositionPlugin,
+    is_funparam_item,
+    funparam_group,
+)
 
 
 if TYPE_CHECKING:  # pragma: no cover
-    from _pytest.python import Metafunc, FunctionDefinition
-    from _pytest.fixtures import FixtureDef
-    from _pytest.mark import Mark, MarkDecorator, ParameterSet
-    # This is from the type signature of `marks` kwarg for `pytest.param`.
-    TYPE_MARKS = Union[MarkDecorator, Collection[Union[MarkDecorator, Mark]]]
-
+    from _pytest.python import Metafunc
+    from _pytest.config import Config
+    from _pytest.config.argparsing import Parser
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.nodes import Item
+    from _pytest.fixtures import FixtureRequest
+    # Re-exported for type checkers. See `__getattr__` for the real thing.
+    from pytest_funparam._core import (  # noqa: F401
+        FunparamDryRunWarning as FunparamDryRunWarning,
+        FunparamFixture as FunparamFixture,
+        GenerateTestsFunparamFixture as GenerateTestsFunparamFixture,
+        IdentifiedFunparamFunction as IdentifiedFunparamFunction,
+        NestedFunparamError as NestedFunparamError,
+        RuntestFunparamFixture as RuntestFunparamFixture,
+        UnidentifiedFunparamFunction as UnidentifiedFunparamFunction,
+    )
 
-class NotFunparam(Exception):
-    """
-    Signal that no funparam was found where we were looking.
-    """
 
+# Everything else lives in `_core`, which imports a lot more (like
+# `unittest.mock`). It's only loaded once a test uses `funparam`, or when one
+# of these names is looked up.
+_CORE_NAMES = (
+    "FunparamDryRunWarning",
+    "FunparamFixture",
+    "GenerateTestsFunparamFixture",
+    "IdentifiedFunparamFunction",
+    "NestedFunparamError",
+    "RuntestFunparamFixture",
+    "UnidentifiedFunparamFunction",
+)
 
-# Sentinel value to mark an unrelated fixture.
-_unrelated_fixture = object()
 
+def _load_core() -> Any:
+    # Not `from pytest_funparam import _core`: that can return a stale module
+    # if `sys.modules` was restored after the first import (like pytester
+    # does), while this always agrees with `from pytest_funparam._core ...`.
+    return importlib.import_module("pytest_funparam._core")
 
-def grab_mock_fixture_value(
-    fixture_name: str,
-    funparam_fixture: "GenerateTestsFunparamFixture",
-    name2fixturedefs: Dict[str, Sequence["FixtureDef[Any]"]],
-) -> Union[MagicMock, Any]:
-    try:
-        # TODO: can we count on the order of name2fixturedefs?
-        *_, fixture_def = name2fixturedefs[fixture_name]
-    except KeyError:
-        # EARLY RETURN
-        return _unrelated_fixture
-
-    if fixture_def.argname == "funparam":
-        # HACK: Ignore type because mypy doesn't recognize it as a wrapper.
-        if fixture_def.func is funparam.__wrapped__:  # type: ignore
-            return funparam_fixture
-        else:
-            return _unrelated_fixture
-
-    fixture_kwargs = {
-        arg: grab_mock_fixture_value(
-            arg, funparam_fixture, name2fixturedefs
-        )
-        for arg in fixture_def.argnames
-    }
 
-    # EARLY RETURN
-    if all(val is _unrelated_fixture for val in fixture_kwargs.values()):
-        # None of these dependent fixtures use a funparam fixture. So this one
-        # doesn't either!
-        return _unrelated_fixture
-
-    # Use MagicMocks to represent all the unrelated fixtures. Hopefully they
-    # won't cause any heinous errors when we run this fixture.
-    kwargs = {}
-    for name, value in fixture_kwargs.items():
-        if value is _unrelated_fixture:
-            value = MagicMock()
-        kwargs[name] = value
-
-    return fixture_def.func(**kwargs)
-
-
-def generate_kwargs(
-    definition: "FunctionDefinition",
-    funparam_fixture: "GenerateTestsFunparamFixture",
-) -> Dict[str, Union[MagicMock, Any]]:
-    found_values = {}
-    fixtureinfo = definition._fixtureinfo
-    sought_names = fixtureinfo.argnames
-
-    name2fixturedefs = fixtureinfo.name2fixturedefs
-    for name in sought_names:
-        found = grab_mock_fixture_value(
-            name, funparam_fixture, name2fixturedefs
-        )
-        if found is not _unrelated_fixture:
-            found_values[name] = found
-
-    if found_values == {}:
-        raise NotFunparam()
+def __getattr__(name: str) -> Any:
+    if name in _CORE_NAMES:
+        return getattr(_load_core(), name)
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name)
+    )
 
-    dryrun_kwargs = {
-        name: found_values.get(name) or MagicMock()
-        for name in sought_names
-    }
 
-    return dryrun_kwargs
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Modules can't have a `__getattr__` before Python 3.7 (PEP 562).
+    globals().update(
+        (name, getattr(_load_core(), name)) for name in _CORE_NAMES
+    )
 
 
+@pytest.hookimpl(trylast=True)
 def pytest_generate_tests(metafunc: "Metafunc") -> None:
+    # Run after `pytest.mark.parametrize` is applied, so the dry run can use
+    # the parametrized values.
     # EARLY RETURN
     if "funparam" not in metafunc.fixturenames:
         # Not interested in it, since our fixture isn't involved
         return
+    id_position = call_id_position(metafunc)
+
+    if metafunc.config.getoption("funparam_skip_deselected"):
+        from pytest_funparam._selection import is_deselected
+        if is_deselected(metafunc.config, metafunc.definition):
+            # Selection will drop this placeholder along with the rest of the
+            # function's items. It only runs if the guess was wrong.
+            metafunc.parametrize("_funparam_call_number", [pytest.param(
+                None,
+                id="funparam-deselected",
+                marks=pytest.mark.skip(
+                    reason=(
+                        "funparam: dry run skipped because the test looked "
+                        "deselected (--funparam-skip-deselected)"
+                    ),
+                ),
+            )])
+            return
+
+    from pytest_funparam._core import dryrun
+    dryrun(metafunc, id_position)
+
+
+def call_id_position(metafunc: "Metafunc") -> int:
+    """
+    Where the call number's id goes among the ids of `metafunc`'s tests.
+    """
+    plugin = metafunc.config.pluginmanager.get_plugin("funparam-id-position")
+    if plugin is None:
+        return 0
+    position: int = plugin.positions.pop(metafunc.definition.nodeid, 0)
+    return position
 
-    # Call the test function with dummy fixtures to see how many times the
-    # verify function is called.
-    dryrun_funparam = GenerateTestsFunparamFixture()
 
-    try:
-        kwargs = generate_kwargs(metafunc.definition, dryrun_funparam)
-    except NotFunparam:
-        return
+@pytest.fixture
+def funparam(
+    request: "FixtureRequest",
+    _funparam_call_number: int,
+) -> "FunparamFixture":
+    return _load_core().RuntestFunparamFixture(  # type: ignore
+        _funparam_call_number, request.node,
+    )
 
-    metafunc.function(**kwargs)
 
-    metafunc.parametrize(
-        "_funparam_call_number",
-        dryrun_funparam.generate_params()
+def pytest_addoption(parser: "Parser") -> None:
+    group = parser.getgroup("funparam")
+    group.addoption(
+        "--funparam-baseline",
+        choices=("save", "compare"),
+        default=None,
+        help=(
+            "save: store per-case verify function durations in the pytest "
+            "cache. compare: flag cases that got slower than the stored "
+            "baseline."
+        ),
+    )
+    group.addoption(
+        "--funparam-baseline-threshold",
+        type=float,
+        default=0.2,
+        metavar="RATIO",
+        help=(
+            "Relative slowdown (0.2 == 20%%) a case needs before it's "
+            "considered a regression. (default: %(default)s)"
+        ),
+    )
+    group.addoption(
+        "--funparam-baseline-fail",
+        action="store_true",
+        default=False,
+        help="Fail cases that regressed, instead of only reporting them.",
+    )
+    group.addoption(
+        "--funparam-shard",
+        type=parse_shard,
+        default=None,
+        metavar="I/N",
+        help=(
+            "Only generate the funparam cases assigned to shard I of N "
+            "(counting from 1). Other tests are split between shards by "
+            "node id."
+        ),
+    )
+    group.addoption(
+        "--funparam-shard-by",
+        choices=("hash", "duration"),
+        default="hash",
+        help=(
+            "hash: assign cases by a stable hash of their id. duration: "
+            "balance shards using the durations in the "
+            "--funparam-durations file, which every shard needs a copy of. "
+            "(default: %(default)s)"
+        ),
+    )
+    group.addoption(
+        "--funparam-durations",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Read and record funparam case durations in this JSON file, "
+            "instead of the pytest cache, so CI nodes can share them."
+        ),
+    )
+    group.addoption(
+        "--funparam-order",
+        choices=("collection", "longest-first"),
+        default="collection",
+        help=(
+            "longest-first: run funparam cases in order of the durations "
+            "recorded by earlier runs, slowest first. Cases without history "
+            "go first. (default: %(default)s)"
+        ),
+    )
+    group.addoption(
+        "--funparam-maxfail-per-test",
+        type=int,
+        default=None,
+        metavar="K",
+        help=(
+            "Skip the remaining funparam cases of a test once K of them "
+            "have failed."
+        ),
+    )
+    group.addoption(
+        "--funparam-dedup",
+        action="store_true",
+        default=False,
+        help=(
+            "Only generate the first of several funparam calls that pass "
+            "equal arguments to the same verify function."
+        ),
+    )
+    group.addoption(
+        "--funparam-dryrun-warn",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help=(
+            "Warn about test functions whose funparam dry run takes longer "
+            "than this. 0 disables the warning. (default: %(default)s)"
+        ),
+    )
+    group.addoption(
+        "--funparam-skip-deselected",
+        action="store_true",
+        default=False,
+        help=(
+            "Skip the funparam dry run of test functions that node ids, "
+            "--deselect, -m, -k or --lf are going to deselect anyway. -k only "
+            "sees function names and keywords, not case ids."
+        ),
+    )
+    group.addoption(
+        "--funparam-redundancy",
+        action="store_true",
+        default=False,
+        help=(
+            "Trace the code each funparam case runs, and report cases that "
+            "run exactly the same code as another case of the same test."
+        ),
+    )
+    group.addoption(
+        "--funparam-redundancy-output",
+        default=None,
+        metavar="PATH",
+        help=(
+            "With --funparam-redundancy, write the node ids of a subset of "
+            "cases that covers all the code the cases ran, one per line."
+        ),
+    )
+    group.addoption(
+        "--funparam-compact",
+        action="store_true",
+        default=False,
+        help=(
+            "Report the cases of each funparam test as a group: one "
+            "progress character per test, and one junitxml testcase for its "
+            "passed cases. Failures are still reported one by one."
+        ),
+    )
+    group.addoption(
+        "--funparam-results",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Write the outcome and duration of every funparam case to a CSV "
+            "file."
+        ),
+    )
+    group.addoption(
+        "--funparam-budget",
+        type=parse_duration,
+        default=None,
+        metavar="DURATION",
+        help=(
+            "Run funparam cases in priority order (failed last time, then "
+            "not run for longest, then fastest) and skip the rest once this "
+            "much time has passed. Like 300, 300s, 5m or 1h."
+        ),
+    )
+    group.addoption(
+        "--funparam-leak-check",
+        action="store_true",
+        default=False,
+        help=(
+            "Trace memory with tracemalloc, and report funparam tests whose "
+            "memory keeps growing from one case to the next."
+        ),
+    )
+    group.addoption(
+        "--funparam-leak-sample",
+        type=int,
+        default=10,
+        metavar="N",
+        help=(
+            "With --funparam-leak-check, measure memory after every N-th "
+            "case of each test. (default: %(default)s)"
+        ),
+    )
+    group.addoption(
+        "--funparam-efficiency",
+        action="store_true",
+        default=False,
+        help=(
+            "Report how much time each funparam test spends on dry runs, on "
+            "re-running its body and on fixtures for every case, compared "
+            "with the time spent in its verify functions."
+        ),
+    )
+    group.addoption(
+        "--funparam-watch",
+        action="store_true",
+        default=False,
+        help=(
+            "Stay running, and re-run the affected tests whenever a Python "
+            "file under the rootdir changes. Unchanged funparam cases that "
+            "passed aren't run again."
+        ),
+    )
+    group.addoption(
+        "--funparam-snapshot-update",
+        action="store_true",
+        default=False,
+        help=(
+            "Store the output of `@funparam.snapshot` verify functions as "
+            "their new golden values, instead of comparing them."
+        ),
+    )
+    parser.addini(
+        "funparam_dryrun_fixtures",
+        type="args",
+        default=[],
+        help=(
+            "Session- or module-scoped fixtures to evaluate for real during "
+            "the funparam dry run (instead of using a MagicMock). Their "
+            "values are reused when the tests run."
+        ),
+    )
+    parser.addini(
+        "funparam_memo_groups",
+        default="8",
+        help=(
+            "How many test functions' `funparam.memo()` values to keep at "
+            "once. The least recently used are dropped first."
+        ),
+    )
+    parser.addini(
+        "funparam_resources",
+        type="linelist",
+        default=[],
+        help=(
+            "The number of tokens of each resource that `.resources()` "
+            "verify functions share, one NAME=COUNT per line."
+        ),
+    )
+    parser.addini(
+        "funparam_snapshot_store",
+        default="funparam-snapshots.bin",
+        help=(
+            "Where `@funparam.snapshot` golden values are stored, relative "
+            "to the rootdir."
+        ),
     )
 
 
-class NestedFunparamError(Exception):
-    """
-    A 'funparam' function was called from within another 'funparam' function.
-
-    'funparam' does a dry run of the test function to discover how many times
-    'funparam' functions are called. It then generates that many parametrized
-    test items.
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
 
-    Because 'funparam' functions aren't actually called during the dry run, any
-    calls from inside them will not be detected. 'funparam' cannot generate
-    the right number test runs in these circumstances.
-    """
-    pass
-
-
-class IdentifiedFunparamFunction(Generic[F]):
-
-    def __init__(
-        self,
-        function: F,
-        *,
-        id: Union[str, None] = None,
-        marks: Collection['MarkDecorator'] = (),
-    ) -> None:
-        self._function = function
-        self._id = id
-        self._marks = marks
-        update_wrapper(self, function)
-
-    __call__: F
-
-    def __call__(self, *args, **kwargs):  # type: ignore
-        return self._function(
-            *args,
-            _id=self._id,
-            _marks=self._marks,
-            **kwargs
-        )
 
-    def marks(
-        self,
-        *marks: 'MarkDecorator'
-    ) -> "IdentifiedFunparamFunction[F]":
-        all_marks = (*self._marks, *marks)
-        return type(self)(
-            self._function,
-            id=self._id,
-            marks=all_marks,
+def parse_duration(value: str) -> float:
+    number, unit = value, "s"
+    if value[-1:] in DURATION_UNITS:
+        number, unit = value[:-1], value[-1]
+    try:
+        seconds = float(number) * DURATION_UNITS[unit]
+    except ValueError:
+        seconds = -1
+    if not seconds > 0:
+        raise argparse.ArgumentTypeError(
+            "expected a positive duration like 300, 300s, 5m or 1h, "
+            "got {!r}".format(value)
         )
+    return seconds
 
 
-class UnidentifiedFunparamFunction(IdentifiedFunparamFunction[F]):
-
-    def id(self, id_: str) -> "IdentifiedFunparamFunction[F]":
-        return IdentifiedFunparamFunction(
-            self._function,
-            id=id_,
-            marks=self._marks,
+def parse_shard(value: str) -> Tuple[int, int]:
+    index, sep, count = value.partition("/")
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        shard = (0, 0)
+    if not sep or not 1 <= shard[0] <= shard[1]:
+        raise argparse.ArgumentTypeError(
+            "expected I/N with 1 <= I <= N, got {!r}".format(value)
         )
-
-    def __getitem__(self, id_: str) -> "IdentifiedFunparamFunction[F]":
-        return self.id(id_)
-
-    def marks(
-        self,
-        *marks: 'MarkDecorator'
-    ) -> "UnidentifiedFunparamFunction[F]":
-        # HACK: Superclass uses `type(self)` to get class. We don't need to do
-        #       anything special to get the type correct.
-        return super().marks(*marks)  # type: ignore
+    return shard
 
 
-class FunparamFixture:
-    """
-    The base API for the `funparam` fixture.
-
-    This is never instantiated directly, but it represents the common interface
-    between all values of the `funparam` fixture. If you're looking for
-    something to use in a type hint, this is it.
-    """
+def pytest_cmdline_main(config: "Config") -> Optional[int]:
+    if not config.getoption("funparam_watch"):
+        return None
+    from pytest_funparam._watch import watch
+    return watch(config)
 
-    def __init__(self) -> None:
-        self.verify_functions: Dict[int, Callable[..., None]] = {}
 
-    def call_verify_function(
-        self,
-        key: int,
-        *args: Any,
-        _marks: "TYPE_MARKS" = (),
-        _id: Optional[str] = None,
-        **kwargs: Any,
-    ) -> None:  # pragma: no cover
-        raise NotImplementedError()
-
-    def _make_key(self, verify_function: Callable[..., None]) -> int:
-        return id(verify_function)
-
-    def __call__(
-        self,
-        verify_function: F,
-    ) -> UnidentifiedFunparamFunction[F]:
-
-        key = self._make_key(verify_function)
-        self.verify_functions[key] = verify_function
-
-        @wraps(verify_function)
-        def funparam_wrapper(*args: Any, **kwargs: Any) -> None:
-            return self.call_verify_function(key, *args, **kwargs)
-
-        return UnidentifiedFunparamFunction(funparam_wrapper)  # type: ignore
-
-
-class GenerateTestsFunparamFixture(FunparamFixture):
-    """
-    The `funparam` fixture provided to the "dry run" test call during
-    `pytest_generate_tests`.
-
-    Record all calls to verify_function, but don't call the wrapped function.
-
-    Generate test parameters based off `funparam` configuration and the
-    recorded calls with `generate_params()`.
-    """
-
-    def __init__(self) -> None:
-        self.calls: List[
-            Tuple[
-                int,
-                Sequence[Any],
-                Dict[str, Any],
-                "TYPE_MARKS",
-                Optional[str],
-            ]
-        ] = []
-        super().__init__()
-
-    def call_verify_function(
-        self,
-        key: int,
-        *args: Any,
-        _marks: "TYPE_MARKS" = (),
-        _id: Optional[str] = None,
-        **kwargs: Any,
-    ) -> None:
-        self.calls.append((key, args, kwargs, _marks, _id))
-
-    def generate_params(self) -> Sequence["ParameterSet"]:
-        params = []
-        for callnum, call_args in enumerate(self.calls):
-            key, args, kwargs, marks, id_ = call_args
-            params.append(pytest.param(
-                callnum,
-                id=id_,
-                marks=marks,
-            ))
-        return params
-
-
-class RuntestFunparamFixture(FunparamFixture):
-    """
-    The `funparam` fixture provided to each run of the test function.
-
-    Skips all calls to verify_function, except for when the current_call_number
-    matches the _funparam_call_number (provided by the parametrized fixture.)
-    """
+def pytest_configure(config: "Config") -> None:
+    config.addinivalue_line(
+        "markers",
+        "funparam_maxfail(count): skip the remaining funparam cases of this "
+        "test once `count` of them have failed.",
+    )
+    config.addinivalue_line(
+        "markers",
+        "funparam_static: the funparam calls of this test don't depend on "
+        "its parametrized arguments, so one dry run covers all of them.",
+    )
 
-    def __init__(self, _funparam_call_number: int) -> None:
-        super().__init__()
-
-        self._funparam_call_number = _funparam_call_number
-        self.current_call_number = 0
-        # Track when we're inside a call, so we can tell users not to nest
-        # funparams.
-        self._inside_call = False
-
-    def call_verify_function(
-        self,
-        key: int,
-        *args: Any,
-        _marks: "TYPE_MARKS" = (),
-        _id: Optional[str] = None,
-        **kwargs: Any,
-    ) -> None:
-        if self._inside_call is True:
-            raise NestedFunparamError(
-                "Cannot nest functions decorated with 'funparam'."
-            )
-        try:
-            if self.current_call_number == self._funparam_call_number:
-                self._inside_call = True
-                return self.verify_functions[key](*args, **kwargs)
-        finally:
-            self.current_call_number += 1
-            self._inside_call = False
+    config.pluginmanager.register(IdPositionPlugin(), "funparam-id-position")
+    from pytest_funparam._run import RunPlugin
+    config.pluginmanager.register(RunPlugin(config), "funparam-run")
+    if (
+        config.getoption("funparam_durations") is not None
+        or config.getoption("funparam_order") == "longest-first"
+        or config.getoption("funparam_budget") is not None
+    ):
+        # Something reads the durations, so record them.
+        from pytest_funparam._durations import DurationsPlugin
+        config.pluginmanager.register(
+            DurationsPlugin(config), "funparam-durations"
+        )
+    # The plugins behind the fixture's features are registered by the first
+    # dry run, so sessions that never use `funparam` don't import them. The
+    # pytest-xdist controller never collects, though, so it needs the ones
+    # that summarize the workers' reports up front.
+    controller = (
+        getattr(config.option, "dist", "no") != "no"
+        and not hasattr(config, "workerinput")
+    )
+    if (
+        controller
+        or config.getoption("funparam_maxfail_per_test") is not None
+    ):
+        from pytest_funparam._maxfail import MaxfailPlugin
+        config.pluginmanager.register(
+            MaxfailPlugin(config), "funparam-maxfail"
+        )
+    if controller or config.getoption("funparam_snapshot_update"):
+        from pytest_funparam._snapshot import SnapshotPlugin
+        config.pluginmanager.register(
+            SnapshotPlugin(config), "funparam-snapshot"
+        )
+    if controller or config.getini("funparam_resources"):
+        from pytest_funparam._resources import ResourcesPlugin
+        config.pluginmanager.register(
+            ResourcesPlugin(config), "funparam-resources"
+        )
+    if config.getini("funparam_dryrun_fixtures"):
+        from pytest_funparam._real_fixtures import RealFixturesPlugin
+        config.pluginmanager.register(
+            RealFixturesPlugin(config), "funparam-real-fixtures"
+        )
+    if config.getoption("funparam_baseline"):
+        from pytest_funparam._baseline import BaselinePlugin
+        config.pluginmanager.register(
+            BaselinePlugin(config), "funparam-baseline"
+        )
+    if config.getoption("funparam_dedup"):
+        from pytest_funparam._dedup import DedupPlugin
+        config.pluginmanager.register(DedupPlugin(), "funparam-dedup")
+    if config.getoption("funparam_shard"):
+        from pytest_funparam._sharding import ShardPlugin
+        config.pluginmanager.register(ShardPlugin(config), "funparam-shard")
+    if config.getoption("funparam_redundancy"):
+        from pytest_funparam._redundancy import RedundancyPlugin
+        config.pluginmanager.register(
+            RedundancyPlugin(config), "funparam-redundancy"
+        )
+    if config.getoption("funparam_efficiency"):
+        from pytest_funparam._efficiency import EfficiencyPlugin
+        config.pluginmanager.register(
+            EfficiencyPlugin(config), "funparam-efficiency"
+        )
+    if config.getoption("funparam_compact"):
+        from pytest_funparam._reporting import CompactPlugin
+        config.pluginmanager.register(
+            CompactPlugin(config), "funparam-compact"
+        )
+    if config.getoption("funparam_results"):
+        from pytest_funparam._reporting import ResultsPlugin
+        config.pluginmanager.register(
+            ResultsPlugin(config), "funparam-results"
+        )
+    if config.getoption("funparam_leak_check"):
+        from pytest_funparam._leaks import LeakCheckPlugin
+        config.pluginmanager.register(
+            LeakCheckPlugin(config), "funparam-leak-check"
+        )
+    if config.getoption("funparam_budget") is not None:
+        # Registered before the ordering plugin, so its trylast
+        # `pytest_collection_modifyitems` runs after that one and has the
+        # final say over the order.
+        from pytest_funparam._budget import BudgetPlugin
+        config.pluginmanager.register(BudgetPlugin(config), "funparam-budget")
+    if config.getoption("funparam_order") == "longest-first":
+        from pytest_funparam._ordering import LongestFirstPlugin
+        config.pluginmanager.register(
+            LongestFirstPlugin(config), "funparam-order"
+        )
 
 
-@pytest.fixture
-def funparam(_funparam_call_number: int) -> FunparamFixture:
-    return RuntestFunparamFixture(_funparam_call_number)
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(
+    item: "Item",
+    call: "CallInfo[None]",
+) -> Any:
+    outcome = yield
+    if not is_funparam_item(item):
+        return
+    report: "TestReport" = outcome.get_result()
+    # Plain attributes on the report survive serialization, so these also
+    # reach the controller process under pytest-xdist.
+    report.funparam_group = funparam_group(report.nodeid)  # type: ignore
+    if report.when != "call":
+        return
+    from pytest_funparam._core import get_funparam_fixture
+    fixture = get_funparam_fixture(item)
+    if fixture is not None and fixture.duration is not None:
+        report.funparam_call_duration = fixture.duration  # type: ignore
+    if fixture is not None and fixture.coverage is not None:
+        report.funparam_coverage = sorted(fixture.coverage)  # type: ignore
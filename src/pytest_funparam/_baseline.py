@@ -0,0 +1,147 @@
+"""
+Per-case performance baselines.
+
+`--funparam-baseline=save` stores the duration of each case's verify function
+call in the pytest cache. `--funparam-baseline=compare` checks later runs
+against those stored samples.
+"""
+import statistics
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import pytest
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+CACHE_KEY = "funparam/baseline"
+
+# Only keep the most recent samples for each case, so old hardware or old
+# implementations age out of the baseline.
+MAX_SAMPLES = 20
+
+# A sample has to be this many standard deviations above the baseline mean to
+# count as a regression. This keeps noisy cases from being flagged.
+NOISE_SIGMAS = 3.0
+
+# Ignore slowdowns smaller than this (in seconds). Timer resolution and
+# scheduling jitter dominate anything below it.
+MIN_DELTA = 0.001
+
+
+def find_regression(
+    duration: float,
+    samples: List[float],
+    threshold: float,
+) -> Optional[str]:
+    """
+    Compare `duration` against the baseline `samples`.
+
+    Return a description of the regression, or `None` if `duration` is within
+    the noise of the baseline.
+    """
+    if not samples:
+        return None
+    mean = statistics.mean(samples)
+    limit = mean * (1 + threshold)
+    if len(samples) > 1:
+        limit = max(limit, mean + NOISE_SIGMAS * statistics.stdev(samples))
+    limit = max(limit, mean + MIN_DELTA)
+    if duration <= limit:
+        return None
+    return (
+        "verify call took {:.6f}s, baseline mean is {:.6f}s "
+        "over {} run(s) (limit {:.6f}s)".format(
+            duration, mean, len(samples), limit,
+        )
+    )
+
+
+class BaselinePlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.mode: str = config.getoption("funparam_baseline")
+        self.threshold: float = config.getoption(
+            "funparam_baseline_threshold"
+        )
+        self.fail: bool = config.getoption("funparam_baseline_fail")
+        self.cache = getattr(config, "cache", None)
+        self.baseline: Dict[str, List[float]] = {}
+        if self.cache is not None:
+            self.baseline = self.cache.get(CACHE_KEY, {})
+        self.durations: Dict[str, float] = {}
+        self.regressions: Dict[str, str] = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        if self.mode != "compare":
+            return
+        report: "TestReport" = outcome.get_result()
+        duration = getattr(report, "funparam_call_duration", None)
+        if duration is None or not report.passed:
+            return
+        regression = find_regression(
+            duration,
+            self.baseline.get(report.nodeid, []),
+            self.threshold,
+        )
+        if regression is None:
+            return
+        report.funparam_regression = regression  # type: ignore
+        if self.fail:
+            report.outcome = "failed"
+            report.longrepr = "funparam performance regression: " + regression
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        duration = getattr(report, "funparam_call_duration", None)
+        if duration is None:
+            return
+        if report.passed:
+            self.durations[report.nodeid] = duration
+        regression = getattr(report, "funparam_regression", None)
+        if regression is not None:
+            self.regressions[report.nodeid] = regression
+
+    def pytest_sessionfinish(self) -> None:
+        if self.mode != "save" or self.cache is None:
+            return
+        if hasattr(self.config, "workerinput"):
+            # Under pytest-xdist, the controller sees every report and saves
+            # the baseline on its own.
+            return
+        baseline = self.cache.get(CACHE_KEY, {})
+        for nodeid, duration in self.durations.items():
+            samples = baseline.get(nodeid, [])
+            samples.append(duration)
+            baseline[nodeid] = samples[-MAX_SAMPLES:]
+        self.cache.set(CACHE_KEY, baseline)
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if self.mode == "save":
+            terminalreporter.write_line(
+                "funparam: saved baseline for {} case(s)".format(
+                    len(self.durations)
+                )
+            )
+            return
+        if not self.regressions:
+            return
+        terminalreporter.write_sep("=", "funparam performance regressions")
+        for nodeid, regression in sorted(self.regressions.items()):
+            terminalreporter.write_line(
+                "{}: {}".format(nodeid, regression)
+            )
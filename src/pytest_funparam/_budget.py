@@ -0,0 +1,118 @@
+"""
+Run funparam cases in priority order until a time budget runs out.
+
+Cases that failed last time run first, then the cases that have gone the
+longest without running, then the fastest ones. Once the budget is used up,
+the remaining cases are skipped. The pytest cache remembers when each case
+last ran, so the next budgeted run starts with the cases this one left out.
+"""
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple
+
+import pytest
+
+from pytest_funparam._durations import load_durations
+from pytest_funparam._items import is_funparam_item, point_skip_at_test
+from pytest_funparam._ordering import reorder_funparam_items
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+CACHE_KEY = "funparam/budget"
+
+
+class BudgetPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.budget: float = config.getoption("funparam_budget")
+        self.cache = getattr(config, "cache", None)
+        # When each case last ran (as a `time.time()` timestamp of the
+        # start of its session), by node id.
+        self.last_run: Dict[str, float] = {}
+        self.last_failed: Set[str] = set()
+        if self.cache is not None:
+            self.last_run = self.cache.get(CACHE_KEY, {})
+            self.last_failed = set(self.cache.get("cache/lastfailed", {}))
+        self.durations = load_durations(config)
+        self.session_time = time.time()
+        self.start = time.perf_counter()
+        self.ran: Set[str] = set()
+        self.skipped_nodeids: Set[str] = set()
+        self.skip_count = 0
+
+    def sort_key(self, item: "Item") -> Tuple[bool, float, float]:
+        return (
+            item.nodeid not in self.last_failed,
+            self.last_run.get(item.nodeid, 0.0),
+            self.durations.get(item.nodeid, 0.0),
+        )
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: List["Item"]) -> None:
+        reorder_funparam_items(items, self.sort_key)
+
+    def pytest_sessionstart(self) -> None:
+        self.session_time = time.time()
+        self.start = time.perf_counter()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: "Item") -> None:
+        if not is_funparam_item(item):
+            return
+        elapsed = time.perf_counter() - self.start
+        if elapsed + self.durations.get(item.nodeid, 0.0) > self.budget:
+            self.skipped_nodeids.add(item.nodeid)
+            pytest.skip(
+                "funparam: not enough of the {:g}s time budget left to run "
+                "this case".format(self.budget)
+            )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        if call.when == "setup" and item.nodeid in self.skipped_nodeids:
+            report: "TestReport" = outcome.get_result()
+            report.funparam_budget_skipped = True  # type: ignore
+            point_skip_at_test(item, report)
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        if getattr(report, "funparam_group", None) is None:
+            return
+        if getattr(report, "funparam_budget_skipped", False):
+            self.skip_count += 1
+        elif report.when == "call":
+            self.ran.add(report.nodeid)
+
+    def pytest_sessionfinish(self) -> None:
+        if self.cache is None or hasattr(self.config, "workerinput"):
+            # Under pytest-xdist, the controller sees every report and saves
+            # on its own.
+            return
+        last_run = self.cache.get(CACHE_KEY, {})
+        for nodeid in self.ran:
+            last_run[nodeid] = self.session_time
+        self.cache.set(CACHE_KEY, last_run)
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if not self.skip_count:
+            return
+        terminalreporter.write_line(
+            "funparam: the {:g}s time budget ran out; skipped {} case(s), "
+            "which will run first next time".format(
+                self.budget, self.skip_count,
+            )
+        )
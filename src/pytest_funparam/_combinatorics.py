@@ -0,0 +1,101 @@
+"""
+Covering arrays for `funparam` functions' `.combinations()` method.
+
+A covering array of strength `t` is a set of rows in which every combination
+of `t` values (from `t` different parameters) shows up in at least one row.
+For `t=2` ("pairwise"), that takes far fewer rows than the full cross
+product, while still catching every bug triggered by a pair of values.
+"""
+import functools
+import itertools
+from typing import Dict, List, Optional, Sequence, Set, Tuple, cast
+
+
+# A `t`-way interaction: which parameters, and the index of each one's value.
+Interaction = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+
+def _interactions(
+    row: Sequence[Optional[int]],
+    strength: int,
+    including: int,
+) -> List[Interaction]:
+    """
+    The interactions covered by the assigned values of `row` that involve
+    parameter `including`.
+    """
+    assigned = [
+        param
+        for param, value in enumerate(row)
+        if value is not None and param != including
+    ]
+    found = []
+    for others in itertools.combinations(assigned, strength - 1):
+        params = tuple(sorted((including, *others)))
+        values = tuple(cast(int, row[param]) for param in params)
+        found.append((params, values))
+    return found
+
+
+def covering_array(
+    sizes: Sequence[int],
+    strength: int,
+) -> List[Tuple[int, ...]]:
+    """
+    Build a covering array for parameters with `sizes` possible values each.
+
+    Rows are tuples of value indices. The result is deterministic, so the dry
+    run and every test run agree on it. It's also cached, since each of a
+    test's cases builds the same one.
+    """
+    return list(_covering_array(tuple(sizes), strength))
+
+
+@functools.lru_cache()
+def _covering_array(
+    sizes: Tuple[int, ...],
+    strength: int,
+) -> Tuple[Tuple[int, ...], ...]:
+    if strength < 1:
+        raise ValueError(
+            "strength must be at least 1, got {!r}".format(strength)
+        )
+    if not sizes or 0 in sizes:
+        return ()
+    if strength >= len(sizes):
+        return tuple(itertools.product(*(range(size) for size in sizes)))
+
+    uncovered: Set[Interaction] = {
+        (params, values)
+        for params in itertools.combinations(range(len(sizes)), strength)
+        for values in itertools.product(*(range(sizes[p]) for p in params))
+    }
+    rows = []
+    while uncovered:
+        # Seed the row with an interaction we still need.
+        seed_params, seed_values = min(uncovered)
+        row: List[Optional[int]] = [None] * len(sizes)
+        for param, value in zip(seed_params, seed_values):
+            row[param] = value
+
+        # Greedily fill in every other parameter with whichever value covers
+        # the most interactions we still need.
+        for param, size in enumerate(sizes):
+            if row[param] is not None:
+                continue
+            gains: Dict[int, int] = {}
+            for value in range(size):
+                row[param] = value
+                gains[value] = sum(
+                    interaction in uncovered
+                    for interaction in _interactions(row, strength, param)
+                )
+            row[param] = max(range(size), key=lambda value: gains[value])
+
+        complete = tuple(value for value in row if value is not None)
+        for params in itertools.combinations(range(len(sizes)), strength):
+            uncovered.discard(
+                (params, tuple(complete[param] for param in params))
+            )
+        rows.append(complete)
+    return tuple(rows)
@@ -0,0 +1,1059 @@
+"""
+The dry run and runtime machinery behind the `funparam` fixture.
+
+The plugin module only imports this the first time a test uses `funparam`,
+so sessions without funparam tests don't pay for it.
+"""
+import time
+from contextlib import ExitStack
+from unittest.mock import MagicMock
+from functools import update_wrapper, wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Tuple,
+    Union,
+    List,
+    Sequence,
+    Collection,
+    Callable,
+    ContextManager,
+    Optional,
+    TypeVar,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    FrozenSet,
+    overload,
+)
+
+import pytest
+
+from pytest_funparam._combinatorics import covering_array
+from pytest_funparam._dedup import call_fingerprint
+from pytest_funparam._files import FileRows
+from pytest_funparam._vectorized import (
+    DEFAULT_CHUNK_SIZE,
+    VectorizedFunparamFunction,
+)
+from pytest_funparam._items import (
+    parametrization_key,
+    place_call_id,
+    sibling_group,
+)
+
+
+F = TypeVar('F', bound=Callable[..., None])
+T = TypeVar('T')
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.python import CallSpec2, Metafunc, FunctionDefinition
+    from _pytest.nodes import Item
+    from pytest_funparam._files import TYPE_PATH
+    from _pytest.fixtures import FixtureDef
+    from _pytest.mark import Mark, MarkDecorator, ParameterSet
+    # This is from the type signature of `marks` kwarg for `pytest.param`.
+    TYPE_MARKS = Union[MarkDecorator, Collection[Union[MarkDecorator, Mark]]]
+    # Ids for the rows passed to `.many()`.
+    TYPE_IDS = Union[
+        None,
+        Sequence[Optional[str]],
+        Callable[[Any], Optional[str]],
+    ]
+    RecordedCall = Tuple[
+        int,
+        Sequence[Any],
+        Dict[str, Any],
+        TYPE_MARKS,
+        Optional[str],
+    ]
+
+
+class NotFunparam(Exception):
+    """
+    Signal that no funparam was found where we were looking.
+    """
+
+
+# Sentinel value to mark an unrelated fixture.
+_unrelated_fixture = object()
+
+
+def grab_mock_fixture_value(
+    fixture_name: str,
+    funparam_fixture: "GenerateTestsFunparamFixture",
+    name2fixturedefs: Dict[str, Sequence["FixtureDef[Any]"]],
+    stand_in: Callable[[str], Any] = lambda name: MagicMock(),
+) -> Union[MagicMock, Any]:
+    try:
+        # TODO: can we count on the order of name2fixturedefs?
+        *_, fixture_def = name2fixturedefs[fixture_name]
+    except KeyError:
+        # EARLY RETURN
+        return _unrelated_fixture
+
+    if fixture_def.argname == "funparam":
+        from pytest_funparam import funparam
+        # HACK: Ignore type because mypy doesn't recognize it as a wrapper.
+        if fixture_def.func is funparam.__wrapped__:  # type: ignore
+            return funparam_fixture
+        else:
+            return _unrelated_fixture
+
+    fixture_kwargs = {
+        arg: grab_mock_fixture_value(
+            arg, funparam_fixture, name2fixturedefs, stand_in
+        )
+        for arg in fixture_def.argnames
+    }
+
+    # EARLY RETURN
+    if all(val is _unrelated_fixture for val in fixture_kwargs.values()):
+        # None of these dependent fixtures use a funparam fixture. So this one
+        # doesn't either!
+        return _unrelated_fixture
+
+    # Use MagicMocks to represent all the unrelated fixtures. Hopefully they
+    # won't cause any heinous errors when we run this fixture.
+    kwargs = {}
+    for name, value in fixture_kwargs.items():
+        if value is _unrelated_fixture:
+            value = stand_in(name)
+        kwargs[name] = value
+
+    return fixture_def.func(**kwargs)
+
+
+def generate_kwargs(
+    definition: "FunctionDefinition",
+    funparam_fixture: "GenerateTestsFunparamFixture",
+    params: Mapping[str, Any] = {},
+) -> Dict[str, Union[MagicMock, Any]]:
+    found_values = {}
+    fixtureinfo = definition._fixtureinfo
+    sought_names = fixtureinfo.argnames
+
+    name2fixturedefs = fixtureinfo.name2fixturedefs
+    real_fixtures = definition.config.pluginmanager.get_plugin(
+        "funparam-real-fixtures"
+    )
+    module = definition.getparent(pytest.Module)
+    assert module is not None
+
+    def stand_in(name: str) -> Any:
+        if name in params:
+            # Directly parametrized, so we know the value the test will get.
+            return params[name]
+        if real_fixtures is not None and name in real_fixtures.names:
+            # The user asked for the real thing.
+            return real_fixtures.get_value(
+                name, name2fixturedefs, module.nodeid
+            )
+        return MagicMock()
+
+    for name in sought_names:
+        found = grab_mock_fixture_value(
+            name, funparam_fixture, name2fixturedefs, stand_in
+        )
+        if found is not _unrelated_fixture:
+            found_values[name] = found
+
+    if found_values == {}:
+        raise NotFunparam()
+
+    dryrun_kwargs = {
+        name: (
+            found_values[name] if name in found_values else stand_in(name)
+        )
+        for name in sought_names
+    }
+
+    return dryrun_kwargs
+
+
+def direct_params(
+    metafunc: "Metafunc",
+    callspec: "CallSpec2",
+) -> Dict[str, Any]:
+    """
+    Return the values of the arguments that `callspec` parametrizes directly,
+    rather than through a fixture.
+    """
+    funcargs = getattr(callspec, "funcargs", None)
+    if funcargs is not None:
+        # pytest < 8 keeps direct parametrization apart.
+        return dict(funcargs)
+    directness = getattr(metafunc, "_params_directness", {})
+    return {
+        name: value
+        for name, value in callspec.params.items()
+        if directness.get(name) == "direct"
+    }
+
+
+def run_dryrun(
+    metafunc: "Metafunc",
+    params: Mapping[str, Any],
+) -> Optional["GenerateTestsFunparamFixture"]:
+    """
+    Call the test function with dummy fixtures (and the directly parametrized
+    values in `params`) to record its verify function calls.
+
+    Return `None` if the test function doesn't actually use `funparam`.
+    """
+    dryrun_funparam = GenerateTestsFunparamFixture()
+
+    start = time.perf_counter()
+    try:
+        kwargs = generate_kwargs(
+            metafunc.definition, dryrun_funparam, params,
+        )
+    except NotFunparam:
+        return None
+
+    metafunc.function(**kwargs)
+    dryrun_duration = time.perf_counter() - start
+
+    efficiency = metafunc.config.pluginmanager.get_plugin(
+        "funparam-efficiency"
+    )
+    if efficiency is not None:
+        efficiency.record_dryrun(metafunc.definition.nodeid, dryrun_duration)
+
+    warn_after = metafunc.config.getoption("funparam_dryrun_warn")
+    if warn_after and dryrun_duration > warn_after:
+        metafunc.definition.warn(FunparamDryRunWarning(
+            "The funparam dry run of {} took {:.2f}s. Consider skipping "
+            "expensive setup when `funparam.dryrun` is true.".format(
+                metafunc.definition.nodeid, dryrun_duration,
+            )
+        ))
+    return dryrun_funparam
+
+
+def parametrize_calls(
+    metafunc: "Metafunc",
+    dryrun_funparam: "GenerateTestsFunparamFixture",
+    callspec: Optional["CallSpec2"],
+    id_position: int,
+) -> None:
+    """
+    Parametrize with a call number for each of the calls recorded by
+    `dryrun_funparam`, leaving out any that other options deselect.
+
+    `callspec` is the other parametrization being extended, if there is one.
+    """
+    params = dryrun_funparam.generate_params()
+    parametrization = (
+        parametrization_key(callspec) if callspec is not None else ()
+    )
+
+    watch = metafunc.config.pluginmanager.get_plugin("funparam-watch")
+    if watch is not None:
+        watch.record_calls(
+            metafunc.definition, dryrun_funparam, parametrization,
+        )
+
+    dedup = metafunc.config.pluginmanager.get_plugin("funparam-dedup")
+    if dedup is not None:
+        params = dedup.select_params(
+            metafunc.definition.nodeid, dryrun_funparam.iter_calls(), params,
+        )
+
+    shard = metafunc.config.pluginmanager.get_plugin("funparam-shard")
+    if shard is not None:
+        params = shard.select_params(
+            metafunc.definition.nodeid,
+            params,
+            callspec._idlist if callspec is not None else (),
+            id_position,
+        )
+
+    metafunc.parametrize("_funparam_call_number", params)
+
+
+def register_plugins(config: "Config") -> None:
+    """
+    Register the plugins behind the fixture's features, unless
+    `pytest_configure` already did.
+    """
+    from pytest_funparam._maxfail import MaxfailPlugin
+    from pytest_funparam._memo import MemoPlugin
+    from pytest_funparam._resources import ResourcesPlugin
+    from pytest_funparam._shared import SharedPlugin
+    from pytest_funparam._snapshot import SnapshotPlugin
+    plugins: Sequence[Tuple[str, Callable[["Config"], object]]] = (
+        ("funparam-maxfail", MaxfailPlugin),
+        ("funparam-memo", MemoPlugin),
+        ("funparam-snapshot", SnapshotPlugin),
+        ("funparam-resources", ResourcesPlugin),
+        ("funparam-shared", SharedPlugin),
+    )
+    for name, plugin in plugins:
+        if not config.pluginmanager.has_plugin(name):
+            config.pluginmanager.register(plugin(config), name)
+
+
+def dryrun(metafunc: "Metafunc", id_position: int = 0) -> None:
+    """
+    Parametrize a test function that uses `funparam`, with a call number for
+    each of the verify function calls found by a dry run.
+
+    If the test is parametrized in other ways too, each parametrization gets
+    its own dry run with its own values, since the verify function calls can
+    depend on them. Parametrizations with the same direct values share a dry
+    run, and `@pytest.mark.funparam_static` makes all of them share one.
+    The call number's id is put at `id_position` among their ids.
+    """
+    register_plugins(metafunc.config)
+    calls: List["CallSpec2"] = metafunc._calls
+    if not calls:
+        dryrun_funparam = run_dryrun(metafunc, {})
+        if dryrun_funparam is not None:
+            parametrize_calls(metafunc, dryrun_funparam, None, id_position)
+        return
+
+    static = metafunc.definition.get_closest_marker("funparam_static")
+    dryruns: Dict[Hashable, Optional[GenerateTestsFunparamFixture]] = {}
+    new_calls = []
+    for callspec in calls:
+        values = direct_params(metafunc, callspec)
+        key: Hashable = None
+        if static is None:
+            key = call_fingerprint(0, (), values)
+            if key is None:
+                # Values that can't be pickled are only shared by identity.
+                key = tuple(sorted(
+                    (name, id(value)) for name, value in values.items()
+                ))
+        if key not in dryruns:
+            dryruns[key] = run_dryrun(metafunc, values)
+        dryrun_funparam = dryruns[key]
+        if dryrun_funparam is None:
+            # Not a funparam test after all.
+            metafunc._calls = calls
+            return
+        # `parametrize()` builds on `metafunc._calls`, so give it only this
+        # parametrization to extend.
+        metafunc._calls = [callspec]
+        parametrize_calls(metafunc, dryrun_funparam, callspec, id_position)
+        for new_callspec in metafunc._calls:
+            place_funparam_id(new_callspec, id_position)
+        new_calls.extend(metafunc._calls)
+    metafunc._calls = new_calls
+
+
+def place_funparam_id(callspec: "CallSpec2", id_position: int) -> None:
+    """
+    Move the call number's id (added last) to `id_position` in `callspec`'s
+    id, where it was before the dry run had to wait for the other
+    parametrizations. Node ids, and so `--lf`, `--deselect` and anything
+    else keyed by them, stay the same as ever.
+    """
+    idlist = place_call_id(
+        callspec._idlist[:-1], callspec._idlist[-1], id_position,
+    )
+    # `CallSpec2` is frozen since pytest 7, but this one was only just
+    # created by `parametrize()`, so nothing else has seen it yet.
+    object.__setattr__(callspec, "_idlist", idlist)
+
+
+class FunparamDryRunWarning(pytest.PytestWarning):
+    """
+    A test function's dry run took longer than `--funparam-dryrun-warn`.
+    """
+
+
+class NestedFunparamError(Exception):
+    """
+    A 'funparam' function was called from within another 'funparam' function.
+
+    'funparam' does a dry run of the test function to discover how many times
+    'funparam' functions are called. It then generates that many parametrized
+    test items.
+
+    Because 'funparam' functions aren't actually called during the dry run, any
+    calls from inside them will not be detected. 'funparam' cannot generate
+    the right number test runs in these circumstances.
+    """
+    pass
+
+
+class IdentifiedFunparamFunction(Generic[F]):
+
+    def __init__(
+        self,
+        function: F,
+        *,
+        id: Union[str, None] = None,
+        marks: Collection['MarkDecorator'] = (),
+        many: Optional[Callable[..., None]] = None,
+        timeout: Optional[float] = None,
+        resources: Mapping[str, int] = {},
+    ) -> None:
+        if timeout is not None and not timeout > 0:
+            raise ValueError(
+                "timeout must be a positive number of seconds, "
+                "got {!r}".format(timeout)
+            )
+        for name, count in resources.items():
+            if not isinstance(count, int) or count < 1:
+                raise ValueError(
+                    "resource {!r} needs a positive number of tokens, "
+                    "got {!r}".format(name, count)
+                )
+        self._function = function
+        self._id = id
+        self._marks = marks
+        self._many = many
+        self._timeout = timeout
+        self._resources = resources
+        update_wrapper(self, function)
+
+    __call__: F
+
+    def __call__(self, *args, **kwargs):  # type: ignore
+        return self._function(
+            *args,
+            _id=self._id,
+            _marks=self._marks,
+            _timeout=self._timeout,
+            _resources=self._resources,
+            **kwargs
+        )
+
+    def marks(
+        self,
+        *marks: 'MarkDecorator'
+    ) -> "IdentifiedFunparamFunction[F]":
+        all_marks = (*self._marks, *marks)
+        return type(self)(
+            self._function,
+            id=self._id,
+            marks=all_marks,
+            many=self._many,
+            timeout=self._timeout,
+            resources=self._resources,
+        )
+
+    def timeout(self, seconds: float) -> "IdentifiedFunparamFunction[F]":
+        """
+        Fail the call if the verify function takes longer than `seconds`.
+
+        Only that call's test item fails; its siblings run as usual.
+        """
+        return type(self)(
+            self._function,
+            id=self._id,
+            marks=self._marks,
+            many=self._many,
+            timeout=seconds,
+            resources=self._resources,
+        )
+
+    def resources(self, **tokens: int) -> "IdentifiedFunparamFunction[F]":
+        """
+        Hold `tokens` of each named resource while the verify function runs,
+        like `.resources(db=1)`.
+
+        The capacity of each resource is set with the `funparam_resources`
+        ini option. Calls wait until enough tokens are free, including in
+        other pytest-xdist workers.
+        """
+        return type(self)(
+            self._function,
+            id=self._id,
+            marks=self._marks,
+            many=self._many,
+            timeout=self._timeout,
+            resources={**self._resources, **tokens},
+        )
+
+    def many(
+        self,
+        rows: Iterable[Any],
+        *,
+        ids: "TYPE_IDS" = None,
+        marks: Collection['MarkDecorator'] = (),
+    ) -> None:
+        """
+        Call the function once for each of `rows`, like
+        `for row in rows: verify(*row)`. Rows that are mappings are passed as
+        keyword arguments instead.
+
+        `ids` is either a sequence with an id for each row, or a function
+        that returns the id of a row. `marks` apply to every row.
+
+        When `rows` is a sequence, each test run looks up its own row
+        directly, without going through the rows before it.
+        """
+        assert self._many is not None
+        self._many(
+            rows,
+            _ids=ids,
+            _id=self._id,
+            _marks=(*self._marks, *marks),
+            _timeout=self._timeout,
+            _resources=self._resources,
+        )
+
+    def combinations(
+        self,
+        *,
+        strength: int = 2,
+        **values: Iterable[Any],
+    ) -> None:
+        """
+        Call the function with keyword arguments drawn from `values`, so that
+        every combination of `strength` values shows up in some call.
+
+        This takes far fewer calls than the full cross product. With the
+        default `strength=2`, every pair of values is still tested together.
+        """
+        names = list(values)
+        columns = [list(column) for column in values.values()]
+        sizes = [len(column) for column in columns]
+        for row in covering_array(sizes, strength):
+            self(**{
+                name: column[index]
+                for name, column, index in zip(names, columns, row)
+            })
+
+
+class UnidentifiedFunparamFunction(IdentifiedFunparamFunction[F]):
+
+    def id(self, id_: str) -> "IdentifiedFunparamFunction[F]":
+        return IdentifiedFunparamFunction(
+            self._function,
+            id=id_,
+            marks=self._marks,
+            many=self._many,
+            timeout=self._timeout,
+            resources=self._resources,
+        )
+
+    def __getitem__(self, id_: str) -> "IdentifiedFunparamFunction[F]":
+        return self.id(id_)
+
+    def marks(
+        self,
+        *marks: 'MarkDecorator'
+    ) -> "UnidentifiedFunparamFunction[F]":
+        # HACK: Superclass uses `type(self)` to get class. We don't need to do
+        #       anything special to get the type correct.
+        return super().marks(*marks)  # type: ignore
+
+    def timeout(self, seconds: float) -> "UnidentifiedFunparamFunction[F]":
+        return super().timeout(seconds)  # type: ignore
+
+    def resources(self, **tokens: int) -> "UnidentifiedFunparamFunction[F]":
+        return super().resources(**tokens)  # type: ignore
+
+
+class FunparamFixture:
+    """
+    The base API for the `funparam` fixture.
+
+    This is never instantiated directly, but it represents the common interface
+    between all values of the `funparam` fixture. If you're looking for
+    something to use in a type hint, this is it.
+    """
+
+    #: True during the dry run that counts the calls to funparam functions.
+    #: Verify functions are never called during the dry run, so expensive
+    #: setup that only they need can be skipped.
+    dryrun = False
+
+    def __init__(self) -> None:
+        self.verify_functions: Dict[int, Callable[..., None]] = {}
+
+    def call_verify_function(
+        self,
+        key: int,
+        *args: Any,
+        _marks: "TYPE_MARKS" = (),
+        _id: Optional[str] = None,
+        _timeout: Optional[float] = None,
+        _resources: Mapping[str, int] = {},
+        **kwargs: Any,
+    ) -> None:  # pragma: no cover
+        raise NotImplementedError()
+
+    def call_verify_function_many(
+        self,
+        key: int,
+        rows: Iterable[Any],
+        *,
+        _ids: "TYPE_IDS" = None,
+        _marks: "TYPE_MARKS" = (),
+        _id: Optional[str] = None,
+        _timeout: Optional[float] = None,
+        _resources: Mapping[str, int] = {},
+    ) -> None:  # pragma: no cover
+        raise NotImplementedError()
+
+    def memo(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Return `factory()`, computed once and shared by all the items
+        generated from this test function (and the same parametrization).
+
+        The value is kept until the last of those items has run (in this
+        process), so `key` only needs to be unique within the test function.
+        The dry run gets a value of its own, since it might be running with
+        stand-ins for some fixtures.
+        """
+        return factory()
+
+    def shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return a read-only view of the buffer returned by `factory()` (like
+        bytes, an `array.array` or a NumPy array), computed once per run and
+        shared by all the items generated from this test function (and the
+        same parametrization).
+
+        The buffer is memory-mapped rather than copied, so pytest-xdist
+        workers share it too. NumPy arrays come back as arrays, and anything
+        else as a memoryview. Like `memo()`, the dry run gets a value of its
+        own.
+        """
+        return factory()
+
+    def from_file(
+        self,
+        path: "TYPE_PATH",
+        format: Optional[str] = None,
+        *,
+        header: bool = True,
+    ) -> FileRows:
+        """
+        Read cases from a CSV or JSON Lines file, for use with `.many()`.
+
+        The format is guessed from the file's extension, unless `format` is
+        "csv" or "jsonl". Each test run only parses its own row.
+        """
+        return FileRows(path, format, header=header)
+
+    @overload
+    def vectorized(
+        self,
+        check: Callable[..., Any],
+    ) -> VectorizedFunparamFunction:
+        ...  # pragma: no cover
+
+    @overload
+    def vectorized(
+        self,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Callable[[Callable[..., Any]], VectorizedFunparamFunction]:
+        ...  # pragma: no cover
+
+    def vectorized(
+        self,
+        check: Optional[Callable[..., Any]] = None,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Any:
+        """
+        Decorate a verify function that checks whole columns of values at
+        once.
+
+        The function returns a boolean for each row (like a NumPy mask), or
+        `None` if every row passed. Each chunk of `chunk_size` rows becomes
+        one test item, and its failure lists every failing row.
+        """
+        def decorate(
+            check: Callable[..., Any],
+        ) -> VectorizedFunparamFunction:
+            return VectorizedFunparamFunction(self, check, chunk_size)
+
+        if check is None:
+            return decorate
+        return decorate(check)
+
+    def snapshot(
+        self,
+        verify_function: Callable[..., Any],
+    ) -> "UnidentifiedFunparamFunction[Callable[..., None]]":
+        """
+        Decorate a verify function that returns its output, instead of
+        checking it.
+
+        The output is compared with the golden value stored for the test
+        item, or stored as the new golden value with
+        `--funparam-snapshot-update`.
+        """
+        @wraps(verify_function)
+        def verify_snapshot(*args: Any, **kwargs: Any) -> None:
+            self._check_snapshot(verify_function(*args, **kwargs))
+
+        return self(verify_snapshot)
+
+    def _check_snapshot(self, value: Any) -> None:  # pragma: no cover
+        raise NotImplementedError()
+
+    def _make_key(self, verify_function: Callable[..., None]) -> int:
+        return id(verify_function)
+
+    @overload
+    def __call__(
+        self,
+        verify_function: F,
+    ) -> UnidentifiedFunparamFunction[F]:
+        ...  # pragma: no cover
+
+    @overload
+    def __call__(
+        self,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Callable[[F], UnidentifiedFunparamFunction[F]]:
+        ...  # pragma: no cover
+
+    def __call__(
+        self,
+        verify_function: Optional[F] = None,
+        *,
+        timeout: Optional[float] = None,
+    ) -> Any:
+
+        def decorate(verify_function: F) -> UnidentifiedFunparamFunction[F]:
+            key = self._make_key(verify_function)
+            self.verify_functions[key] = verify_function
+
+            @wraps(verify_function)
+            def funparam_wrapper(*args: Any, **kwargs: Any) -> None:
+                return self.call_verify_function(key, *args, **kwargs)
+
+            def funparam_many(rows: Iterable[Any], **kwargs: Any) -> None:
+                return self.call_verify_function_many(key, rows, **kwargs)
+
+            return UnidentifiedFunparamFunction(
+                funparam_wrapper,  # type: ignore
+                many=funparam_many,
+                timeout=timeout,
+            )
+
+        if verify_function is None:
+            return decorate
+        return decorate(verify_function)
+
+
+def unpack_row(row: Any) -> Tuple[Sequence[Any], Dict[str, Any]]:
+    """
+    Split a row passed to `.many()` into args and kwargs.
+    """
+    if isinstance(row, Mapping):
+        return (), dict(row)
+    return tuple(row), {}
+
+
+class RecordedBatch(NamedTuple):
+    """
+    All the calls made by one `.many()` call during the dry run.
+
+    `rows` is the caller's own sequence, so recording a batch doesn't copy
+    its rows.
+    """
+    key: int
+    rows: Sequence[Any]
+    ids: "TYPE_IDS"
+    marks: "TYPE_MARKS"
+    id: Optional[str]
+
+
+class GenerateTestsFunparamFixture(FunparamFixture):
+    """
+    The `funparam` fixture provided to the "dry run" test call during
+    `pytest_generate_tests`.
+
+    Record all calls to verify_function, but don't call the wrapped function.
+
+    Generate test parameters based off `funparam` configuration and the
+    recorded calls with `generate_params()`.
+    """
+
+    dryrun = True
+
+    def __init__(self) -> None:
+        self.calls: List[Union["RecordedCall", RecordedBatch]] = []
+        super().__init__()
+
+    def call_verify_function(
+        self,
+        key: int,
+        *args: Any,
+        _marks: "TYPE_MARKS" = (),
+        _id: Optional[str] = None,
+        _timeout: Optional[float] = None,
+        _resources: Mapping[str, int] = {},
+        **kwargs: Any,
+    ) -> None:
+        self.calls.append((key, args, kwargs, _marks, _id))
+
+    def call_verify_function_many(
+        self,
+        key: int,
+        rows: Iterable[Any],
+        *,
+        _ids: "TYPE_IDS" = None,
+        _marks: "TYPE_MARKS" = (),
+        _id: Optional[str] = None,
+        _timeout: Optional[float] = None,
+        _resources: Mapping[str, int] = {},
+    ) -> None:
+        if not isinstance(rows, Sequence):
+            # We can't go through an iterator twice, so hang on to its rows.
+            rows = tuple(rows)
+        if _ids is not None and not callable(_ids) and len(_ids) != len(rows):
+            raise ValueError(
+                "many() got {} id(s) for {} row(s); pass one id per "
+                "row".format(len(_ids), len(rows))
+            )
+        self.calls.append(RecordedBatch(key, rows, _ids, _marks, _id))
+
+    def iter_calls(self) -> Iterator["RecordedCall"]:
+        """
+        Iterate over every recorded call, expanding `.many()` batches into
+        their rows.
+        """
+        for call in self.calls:
+            if not isinstance(call, RecordedBatch):
+                yield call
+                continue
+            for index, row in enumerate(call.rows):
+                args, kwargs = unpack_row(row)
+                yield (
+                    call.key,
+                    args,
+                    kwargs,
+                    call.marks,
+                    batch_row_id(call, index, row),
+                )
+
+    def generate_params(self) -> Sequence["ParameterSet"]:
+        params = []
+        callnum = 0
+        for call in self.calls:
+            if not isinstance(call, RecordedBatch):
+                key, args, kwargs, marks, id_ = call
+                params.append(pytest.param(
+                    callnum,
+                    id=id_,
+                    marks=marks,
+                ))
+                callnum += 1
+                continue
+            for index in range(len(call.rows)):
+                # Only fetch the row if we need it for the id.
+                row = call.rows[index] if callable(call.ids) else None
+                params.append(pytest.param(
+                    callnum,
+                    id=batch_row_id(call, index, row),
+                    marks=call.marks,
+                ))
+                callnum += 1
+        return params
+
+
+def batch_row_id(batch: RecordedBatch, index: int, row: Any) -> Optional[str]:
+    if batch.ids is None:
+        return batch.id
+    if callable(batch.ids):
+        return batch.ids(row)
+    return batch.ids[index]
+
+
+class RuntestFunparamFixture(FunparamFixture):
+    """
+    The `funparam` fixture provided to each run of the test function.
+
+    Skips all calls to verify_function, except for when the current_call_number
+    matches the _funparam_call_number (provided by the parametrized fixture.)
+    """
+
+    def __init__(
+        self,
+        _funparam_call_number: int,
+        node: Optional["Item"] = None,
+    ) -> None:
+        super().__init__()
+
+        self._funparam_call_number = _funparam_call_number
+        # The test item this fixture was created for.
+        self._node = node
+        self.current_call_number = 0
+        # How long the selected verify function call took, in seconds. Stays
+        # `None` until that call has happened.
+        self.duration: Optional[float] = None
+        # The arcs executed by the selected call, with
+        # `--funparam-redundancy`.
+        self.coverage: Optional[FrozenSet[int]] = None
+        # Track when we're inside a call, so we can tell users not to nest
+        # funparams.
+        self._inside_call = False
+
+    def call_verify_function(
+        self,
+        key: int,
+        *args: Any,
+        _marks: "TYPE_MARKS" = (),
+        _id: Optional[str] = None,
+        _timeout: Optional[float] = None,
+        _resources: Mapping[str, int] = {},
+        **kwargs: Any,
+    ) -> None:
+        if self._inside_call is True:
+            raise NestedFunparamError(
+                "Cannot nest functions decorated with 'funparam'."
+            )
+        try:
+            if self.current_call_number == self._funparam_call_number:
+                self._inside_call = True
+                # Waiting for resources doesn't count towards the duration
+                # or the timeout.
+                with self._hold_resources(_resources):
+                    self._call_selected(key, args, kwargs, _timeout)
+        finally:
+            self.current_call_number += 1
+            self._inside_call = False
+
+    def _call_selected(
+        self,
+        key: int,
+        args: Sequence[Any],
+        kwargs: Dict[str, Any],
+        timeout: Optional[float],
+    ) -> None:
+        tracer = None
+        if self._node is not None and self._node.config.getoption(
+            "funparam_redundancy"
+        ):
+            from pytest_funparam._redundancy import ArcTracer
+            tracer = ArcTracer()
+            tracer.start()
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                self.verify_functions[key](*args, **kwargs)
+                return
+            from pytest_funparam._timeout import call_with_timeout
+            callspec = getattr(self._node, "callspec", None)
+            call_with_timeout(
+                self.verify_functions[key],
+                args,
+                kwargs,
+                timeout,
+                callspec.id if callspec is not None else None,
+            )
+        finally:
+            self.duration = time.perf_counter() - start
+            if tracer is not None:
+                self.coverage = tracer.stop()
+
+    def _hold_resources(
+        self,
+        resources: Mapping[str, int],
+    ) -> ContextManager[Any]:
+        if not resources:
+            return ExitStack()
+        if self._node is None:
+            raise ValueError("resources need the test item")
+        from pytest_funparam._resources import ResourcesPlugin
+        plugin = self._node.config.pluginmanager.get_plugin(
+            "funparam-resources"
+        )
+        assert isinstance(plugin, ResourcesPlugin)
+        return plugin.hold(self._node.nodeid, resources)
+
+    def memo(self, key: Hashable, factory: Callable[[], T]) -> T:
+        if self._node is None:
+            return factory()
+        from pytest_funparam._memo import MemoPlugin
+        memo = self._node.config.pluginmanager.get_plugin("funparam-memo")
+        assert isinstance(memo, MemoPlugin)
+        return memo.get(sibling_group(self._node), key, factory)
+
+    def shared(self, key: str, factory: Callable[[], Any]) -> Any:
+        if self._node is None:
+            return factory()
+        from pytest_funparam._shared import SharedPlugin
+        shared = self._node.config.pluginmanager.get_plugin("funparam-shared")
+        assert isinstance(shared, SharedPlugin)
+        return shared.get(sibling_group(self._node), key, factory)
+
+    def _check_snapshot(self, value: Any) -> None:
+        if self._node is None:
+            raise ValueError("snapshots need the test item")
+        from pytest_funparam._snapshot import SnapshotPlugin
+        snapshot = self._node.config.pluginmanager.get_plugin(
+            "funparam-snapshot"
+        )
+        assert isinstance(snapshot, SnapshotPlugin)
+        snapshot.check(self._node.nodeid, value)
+
+    def call_verify_function_many(
+        self,
+        key: int,
+        rows: Iterable[Any],
+        *,
+        _ids: "TYPE_IDS" = None,
+        _marks: "TYPE_MARKS" = (),
+        _id: Optional[str] = None,
+        _timeout: Optional[float] = None,
+        _resources: Mapping[str, int] = {},
+    ) -> None:
+        if self._inside_call is True:
+            raise NestedFunparamError(
+                "Cannot nest functions decorated with 'funparam'."
+            )
+        target = self._funparam_call_number - self.current_call_number
+
+        if isinstance(rows, Sequence):
+            count = len(rows)
+            if 0 <= target < count:
+                self.current_call_number += target
+                args, kwargs = unpack_row(rows[target])
+                self.call_verify_function(
+                    key,
+                    *args,
+                    _timeout=_timeout,
+                    _resources=_resources,
+                    **kwargs
+                )
+            self.current_call_number = (
+                self._funparam_call_number - target + count
+            )
+            return
+
+        for index, row in enumerate(rows):
+            if index == target:
+                args, kwargs = unpack_row(row)
+                self.call_verify_function(
+                    key,
+                    *args,
+                    _timeout=_timeout,
+                    _resources=_resources,
+                    **kwargs
+                )
+                # No later call can be the one we're looking for, so there's
+                # no need to count the rest of the rows.
+                return
+            self.current_call_number += 1
+
+
+def get_funparam_fixture(item: "Item") -> Optional[RuntestFunparamFixture]:
+    """
+    Return the `funparam` fixture value used by `item`, if it used ours.
+    """
+    funcargs = getattr(item, "funcargs", {})
+    value = funcargs.get("funparam")
+    if isinstance(value, RuntestFunparamFixture):
+        return value
+    return None
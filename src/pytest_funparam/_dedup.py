@@ -0,0 +1,85 @@
+"""
+Collapse funparam calls that pass equal arguments to the same verify function.
+"""
+import hashlib
+import pickle
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Set,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.mark import ParameterSet
+    from _pytest.terminal import TerminalReporter
+
+
+def call_fingerprint(
+    key: int,
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+) -> Optional[str]:
+    """
+    Return a stable hash of a verify function call, or `None` if its
+    arguments can't be hashed.
+
+    The arguments are pickled rather than compared with `==`, so `1`, `1.0`
+    and `True` stay distinct cases.
+    """
+    try:
+        dumped = pickle.dumps(
+            (tuple(args), sorted(kwargs.items())),
+            protocol=4,
+        )
+    except Exception:
+        # Unpicklable values (like the MagicMocks standing in for fixtures)
+        # are never considered duplicates.
+        return None
+    return "{}:{}".format(key, hashlib.sha1(dumped).hexdigest())
+
+
+class DedupPlugin:
+
+    def __init__(self) -> None:
+        self.collapsed: Dict[str, int] = {}
+
+    def select_params(
+        self,
+        definition_nodeid: str,
+        calls: Iterable[Any],
+        params: Sequence["ParameterSet"],
+    ) -> List["ParameterSet"]:
+        """
+        Drop the params of calls that repeat an earlier call.
+
+        `calls` are the calls recorded by the dry run, in the same order as
+        the `params` generated from them. Calls given an id or marks are
+        always kept, since they were singled out on purpose.
+        """
+        seen: Set[str] = set()
+        selected = []
+        for (key, args, kwargs, marks, id_), param in zip(calls, params):
+            if id_ is None and not marks:
+                fingerprint = call_fingerprint(key, args, kwargs)
+                if fingerprint is not None:
+                    if fingerprint in seen:
+                        continue
+                    seen.add(fingerprint)
+            selected.append(param)
+        if len(selected) < len(params):
+            self.collapsed[definition_nodeid] = (
+                self.collapsed.get(definition_nodeid, 0)
+                + len(params) - len(selected)
+            )
+        return selected
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if not self.collapsed:
+            return
+        terminalreporter.write_line(
+            "funparam: collapsed {} duplicate case(s) in {} test(s)".format(
+                sum(self.collapsed.values()), len(self.collapsed),
+            )
+        )
@@ -0,0 +1,116 @@
+"""
+Record how long each funparam item took, so later runs can plan around it.
+
+Durations are only recorded while an option that reads them is on
+(`--funparam-order=longest-first`, `--funparam-budget`, or
+`--funparam-durations`). They're kept in the pytest cache, or in the file
+named by `--funparam-durations`, which CI nodes can share.
+"""
+import json
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+import pytest
+
+from pytest_funparam._items import funparam_group, is_funparam_item
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+
+
+CACHE_KEY = "funparam/durations"
+
+
+def durations_path(config: "Config") -> Optional[str]:
+    path: Optional[str] = config.getoption("funparam_durations", None)
+    if path is None:
+        return None
+    invocation_params = getattr(config, "invocation_params", None)
+    if invocation_params is not None:
+        directory = str(invocation_params.dir)
+    else:
+        # pytest<5.1
+        directory = str(config.invocation_dir)  # type: ignore
+    return os.path.join(directory, path)
+
+
+def load_durations(config: "Config") -> Dict[str, float]:
+    """
+    Return the durations (in seconds) recorded for funparam items by earlier
+    runs, keyed by node id.
+    """
+    path = durations_path(config)
+    if path is not None:
+        try:
+            with open(path) as durations_file:
+                loaded: Dict[str, float] = json.load(durations_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            raise pytest.UsageError(
+                "--funparam-durations: {} isn't a durations file".format(path)
+            )
+        return loaded
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        # The cacheprovider plugin is disabled.
+        return {}
+    durations: Dict[str, float] = cache.get(CACHE_KEY, {})
+    return durations
+
+
+def save_durations(config: "Config", durations: Dict[str, float]) -> None:
+    path = durations_path(config)
+    if path is not None:
+        with open(path, "w") as durations_file:
+            json.dump(durations, durations_file, indent=2, sort_keys=True)
+        return
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        cache.set(CACHE_KEY, durations)
+
+
+class DurationsPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.durations: Dict[str, float] = {}
+        # Every funparam item generated by this run, before any were
+        # deselected, by group.
+        self.collected: Dict[str, Set[str]] = {}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, items: List["Item"]) -> None:
+        self.collected = {}
+        for item in items:
+            if is_funparam_item(item):
+                self.collected.setdefault(
+                    funparam_group(item.nodeid), set()
+                ).add(item.nodeid)
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        if report.when != "call":
+            return
+        if getattr(report, "funparam_group", None) is None:
+            return
+        self.durations[report.nodeid] = report.duration
+
+    def pytest_sessionfinish(self) -> None:
+        if hasattr(self.config, "workerinput"):
+            # The pytest-xdist controller sees every report. Let it save.
+            return
+        recorded = load_durations(self.config)
+        durations = dict(recorded)
+        if not self.config.getoption("funparam_shard"):
+            # Drop the cases that tests collected this time no longer
+            # generate. (A shard only generates some of them.)
+            for nodeid in list(durations):
+                siblings = self.collected.get(funparam_group(nodeid))
+                if siblings is not None and nodeid not in siblings:
+                    del durations[nodeid]
+        durations.update(self.durations)
+        if durations != recorded:
+            save_durations(self.config, durations)
@@ -0,0 +1,151 @@
+"""
+Measure how much of each funparam test's time goes to the execution model,
+rather than to its verify functions.
+
+`--funparam-efficiency` adds up, for each test function:
+
+- the dry runs that count its cases during collection,
+- the test body run by every sibling outside of its own verify call,
+- fixture setup and teardown, repeated for every sibling,
+
+and compares their total (the overhead) with the time spent inside verify
+functions. Tests are ranked by overhead, so the ones worth restructuring come
+first.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+import pytest
+
+from pytest_funparam._items import funparam_group, is_funparam_item
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+# How many tests to list without -v.
+TOP_COUNT = 10
+
+
+class GroupTimes:
+    """
+    The time one test function spent on each kind of work, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.cases = 0
+        self.dryrun = 0.0
+        self.body = 0.0
+        self.fixtures = 0.0
+        self.verify = 0.0
+
+    @property
+    def overhead(self) -> float:
+        return self.dryrun + self.body + self.fixtures
+
+    @property
+    def overhead_share(self) -> float:
+        total = self.overhead + self.verify
+        return self.overhead / total if total else 0.0
+
+
+class EfficiencyPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.groups: Dict[str, GroupTimes] = {}
+        # Dry run times measured by this process that no report has carried
+        # yet, by group.
+        self.dryruns: Dict[str, float] = {}
+
+    def record_dryrun(self, group: str, duration: float) -> None:
+        self.dryruns[group] = self.dryruns.get(group, 0.0) + duration
+
+    def _times(self, group: str) -> GroupTimes:
+        try:
+            return self.groups[group]
+        except KeyError:
+            times = self.groups[group] = GroupTimes()
+            return times
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        if not is_funparam_item(item):
+            return
+        group = funparam_group(item.nodeid)
+        if group in self.dryruns:
+            report: "TestReport" = outcome.get_result()
+            # The first report of each group carries the dry run time, so the
+            # pytest-xdist controller hears about it too.
+            report.funparam_dryrun_duration = (  # type: ignore
+                self.dryruns.pop(group)
+            )
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        group = getattr(report, "funparam_group", None)
+        if group is None:
+            return
+        times = self._times(group)
+        times.dryrun += getattr(report, "funparam_dryrun_duration", 0.0)
+        if report.when == "call":
+            verify = getattr(report, "funparam_call_duration", 0.0)
+            times.cases += 1
+            times.verify += verify
+            times.body += max(report.duration - verify, 0.0)
+        else:
+            times.fixtures += report.duration
+
+    def ranked(self) -> List[Tuple[str, GroupTimes]]:
+        """
+        Return `(group, times)` pairs, the most overhead first.
+        """
+        for group, duration in self.dryruns.items():
+            # Dry runs of tests that had no items run here.
+            self._times(group).dryrun += duration
+        self.dryruns = {}
+        return sorted(
+            self.groups.items(),
+            key=lambda pair: (-pair[1].overhead, pair[0]),
+        )
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if hasattr(self.config, "workerinput"):
+            return
+        ranked = self.ranked()
+        if not ranked:
+            return
+        terminalreporter.write_sep("=", "funparam efficiency")
+        shown = ranked if terminalreporter.verbosity > 0 else (
+            ranked[:TOP_COUNT]
+        )
+        for group, times in shown:
+            terminalreporter.write_line(
+                "{}: {} case(s), {:.0%} overhead: dry run {:.3f}s, body "
+                "{:.3f}s, fixtures {:.3f}s; verify {:.3f}s".format(
+                    group,
+                    times.cases,
+                    times.overhead_share,
+                    times.dryrun,
+                    times.body,
+                    times.fixtures,
+                    times.verify,
+                )
+            )
+        if len(shown) < len(ranked):
+            terminalreporter.write_line(
+                "({} more test(s) not shown, use -v to show them)".format(
+                    len(ranked) - len(shown)
+                )
+            )
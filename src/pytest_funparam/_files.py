@@ -0,0 +1,197 @@
+"""
+Rows of cases read lazily from CSV and JSON Lines files.
+
+The first time a file is used, we build an index of where each row starts.
+After that, looking up a row memory-maps the file and only parses that row.
+"""
+import csv
+import json
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    # `os.PathLike` is only subscriptable in annotations.
+    TYPE_PATH = Union[str, "os.PathLike[str]"]
+
+
+FORMATS = ("csv", "jsonl")
+
+SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+# How many file indexes to keep around.
+MAX_CACHED_INDEXES = 32
+
+
+class FileIndex:
+    """
+    Where each row of a file starts and ends.
+    """
+
+    def __init__(
+        self,
+        starts: "array[int]",
+        ends: "array[int]",
+        header: Optional[List[str]],
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.header = header
+
+
+# Keyed by path, modification time and size, so edited files get reindexed.
+_index_cache: "OrderedDict[Tuple[str, int, int], FileIndex]" = OrderedDict()
+
+
+def _line_bounds(data: "mmap.mmap") -> Tuple["array[int]", "array[int]"]:
+    starts = array("q")
+    ends = array("q")
+    position = 0
+    size = len(data)
+    while position < size:
+        newline = data.find(b"\n", position)
+        end = size if newline == -1 else newline
+        line_end = end
+        if line_end > position and data[line_end - 1:line_end] == b"\r":
+            line_end -= 1
+        if data[position:line_end].strip():
+            starts.append(position)
+            ends.append(line_end)
+        position = end + 1
+    return starts, ends
+
+
+def build_index(path: str, format: str, header: bool) -> FileIndex:
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Can't memory-map an empty file.
+            return FileIndex(array("q"), array("q"), None)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            starts, ends = _line_bounds(data)
+            fieldnames = None
+            if format == "csv" and header and starts:
+                line = data[starts[0]:ends[0]].decode("utf-8")
+                fieldnames = next(csv.reader([line]))
+                starts = starts[1:]
+                ends = ends[1:]
+    return FileIndex(starts, ends, fieldnames)
+
+
+def get_index(path: str, format: str, header: bool) -> FileIndex:
+    stat = os.stat(path)
+    key = (
+        "{}:{}:{}".format(os.path.realpath(path), format, header),
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+    try:
+        _index_cache.move_to_end(key)
+        return _index_cache[key]
+    except KeyError:
+        pass
+    index = build_index(path, format, header)
+    _index_cache[key] = index
+    while len(_index_cache) > MAX_CACHED_INDEXES:
+        _index_cache.popitem(last=False)
+    return index
+
+
+class FileRows(Sequence[Any]):
+    """
+    The rows of a CSV or JSON Lines file, for use with `.many()`.
+
+    CSV rows with a header become dicts (and so keyword arguments). JSON
+    Lines rows are whatever each line holds: objects become keyword
+    arguments, and arrays become positional arguments.
+
+    Rows can't contain line breaks.
+    """
+
+    def __init__(
+        self,
+        path: "TYPE_PATH",
+        format: Optional[str] = None,
+        *,
+        header: bool = True,
+    ) -> None:
+        self.path = os.fspath(path)
+        if format is None:
+            suffix = os.path.splitext(self.path)[1].lower()
+            try:
+                format = SUFFIX_FORMATS[suffix]
+            except KeyError:
+                raise ValueError(
+                    "Can't tell the format of {!r} from its name. "
+                    "Pass one of {!r} as `format`.".format(self.path, FORMATS)
+                ) from None
+        if format not in FORMATS:
+            raise ValueError(
+                "Unsupported format {!r}. Expected one of {!r}.".format(
+                    format, FORMATS,
+                )
+            )
+        self.format = format
+        self._index = get_index(self.path, format, header)
+        self._data: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self._index.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...  # pragma: no cover
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Any]:
+        ...  # pragma: no cover
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        if self._data is None:
+            with open(self.path, "rb") as file:
+                self._data = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ,
+                )
+        line = self._data[
+            self._index.starts[index]:self._index.ends[index]
+        ].decode("utf-8")
+        return self._parse(line)
+
+    def _parse(self, line: str) -> Any:
+        if self.format == "jsonl":
+            return json.loads(line)
+        values = next(csv.reader([line]))
+        if self._index.header is None:
+            return values
+        row: Dict[str, str] = dict(zip(self._index.header, values))
+        return row
+
+    def close(self) -> None:
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def __repr__(self) -> str:
+        return "<FileRows {!r} ({} rows)>".format(self.path, len(self))
@@ -0,0 +1,105 @@
+"""
+Helpers for recognizing (and reporting on) the test items generated by
+`pytest-funparam`.
+"""
+from typing import TYPE_CHECKING, Dict, Hashable, List, Sequence
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.nodes import Item
+    from _pytest.python import CallSpec2, Metafunc
+    from _pytest.reports import TestReport
+
+
+def is_funparam_item(item: "Item") -> bool:
+    """
+    Was `item` generated from one of the calls recorded by a dry run?
+    """
+    callspec = getattr(item, "callspec", None)
+    if callspec is None:
+        return False
+    return isinstance(callspec.params.get("_funparam_call_number"), int)
+
+
+def funparam_group(nodeid: str) -> str:
+    """
+    Return the node id of the test function that generated `nodeid`.
+
+    All the items generated from one test function are "siblings" and share a
+    group.
+    """
+    return nodeid.partition("[")[0]
+
+
+def parametrization_key(callspec: "CallSpec2") -> Hashable:
+    """
+    Identify the other parametrizations (like `pytest.mark.parametrize`
+    values) of `callspec`, leaving out the funparam call number.
+    """
+    return tuple(sorted(
+        (name, index)
+        for name, index in callspec.indices.items()
+        if name != "_funparam_call_number"
+    ))
+
+
+def place_call_id(
+    other_ids: Sequence[str],
+    call_id: str,
+    position: int,
+) -> List[str]:
+    """
+    Return the ids making up a case's id: `other_ids`, the ids of the test's
+    other parametrizations, with the call number's `call_id` at `position`.
+    """
+    ids = list(other_ids)
+    ids.insert(position, call_id)
+    return ids
+
+
+class IdPositionPlugin:
+    """
+    Remember where the call number's id goes in the ids of each test.
+
+    The dry run waits for the other parametrizations, but the call number's
+    id stays where it was when it didn't: after the ids of parametrized
+    fixtures (and other plugins' parametrizations), before the ones from
+    `pytest.mark.parametrize`. This hook runs at that point.
+    """
+
+    def __init__(self) -> None:
+        self.positions: Dict[str, int] = {}
+
+    def pytest_generate_tests(self, metafunc: "Metafunc") -> None:
+        if "funparam" not in metafunc.fixturenames:
+            return
+        calls: List["CallSpec2"] = metafunc._calls
+        self.positions[metafunc.definition.nodeid] = (
+            len(calls[0]._idlist) if calls else 0
+        )
+
+
+def sibling_group(item: "Item") -> str:
+    """
+    Like `funparam_group()`, but items from other parametrizations of the
+    test function (like other `pytest.mark.parametrize` values) are in
+    groups of their own, since their test bodies can compute different
+    values.
+    """
+    callspec = getattr(item, "callspec", None)
+    parametrization = (
+        parametrization_key(callspec) if callspec is not None else ()
+    )
+    return "{}{!r}".format(funparam_group(item.nodeid), parametrization)
+
+
+def point_skip_at_test(item: "Item", report: "TestReport") -> None:
+    """
+    Make the report of a case a plugin skipped point at the test, rather
+    than at the plugin, the same way pytest does for `pytest.mark.skip`.
+    """
+    if isinstance(report.longrepr, tuple):
+        filename, line = item.reportinfo()[:2]
+        assert line is not None
+        reason = report.longrepr[2]
+        report.longrepr = (str(filename), line + 1, reason)
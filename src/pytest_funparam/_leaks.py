@@ -0,0 +1,296 @@
+"""
+Look for memory that keeps growing across the sibling items of a test.
+
+Sibling items run the same code with different inputs, so memory that grows
+steadily from one case to the next points at a leak in the code under test.
+`--funparam-leak-check` fits a line through each test's memory use, as
+traced by `tracemalloc` (and the process's RSS, where available). Memory is
+only sampled after every few cases, and `tracemalloc`'s traces are cleared
+when a test's first sample is taken, so that later samples only have to look
+through what its cases allocated. With pytest-xdist, each worker's samples
+get a line of their own, since workers don't share memory.
+"""
+import fnmatch
+import gc
+import os
+import tracemalloc
+from typing import (
+    TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple,
+)
+
+import pytest
+
+from pytest_funparam._items import funparam_group, is_funparam_item
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+# Fewer samples than this can't tell a trend from noise.
+MIN_SAMPLES = 4
+
+# Growth below this many bytes per case is ignored, since interpreter caches
+# and free lists wobble by about that much.
+MIN_GROWTH = 1024
+
+# How closely the samples have to follow a straight line (as a correlation
+# coefficient) to count as steady growth.
+MIN_CORRELATION = 0.9
+
+TOP_SITES = 5
+
+
+# pytest holds on to a little memory for every item it runs (reports,
+# terminal statistics), so allocations made by pytest itself (and by this
+# plugin) don't count.
+IGNORED_FILES = [
+    os.path.join("*", "_pytest", "*"),
+    os.path.join("*", "pluggy", "*"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "*"),
+    tracemalloc.__file__,
+]
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, pattern) for pattern in IGNORED_FILES
+    ])
+
+
+def traced_memory() -> int:
+    """
+    Return how many bytes allocated since the traces were last cleared are
+    still in use, leaving out the files in `IGNORED_FILES`.
+
+    Cheaper than summing `take_snapshot()`, since each file is only matched
+    against the patterns once, rather than each allocation.
+    """
+    stats = tracemalloc.take_snapshot().statistics("filename")
+    return sum(
+        stat.size
+        for stat in stats
+        if not any(
+            fnmatch.fnmatch(stat.traceback[0].filename, pattern)
+            for pattern in IGNORED_FILES
+        )
+    )
+
+
+def current_rss() -> Optional[int]:
+    """
+    Return the resident set size of this process in bytes, if the platform
+    makes that cheap to find out.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def fit_growth(samples: Sequence[Tuple[int, int]]) -> Optional[float]:
+    """
+    Fit a line through `(case index, bytes)` samples.
+
+    Return its slope in bytes per case if memory grows steadily, or `None`.
+    """
+    if len(samples) < MIN_SAMPLES:
+        return None
+    count = len(samples)
+    mean_x = sum(x for x, _ in samples) / count
+    mean_y = sum(y for _, y in samples) / count
+    sxx = sum((x - mean_x) ** 2 for x, _ in samples)
+    syy = sum((y - mean_y) ** 2 for _, y in samples)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in samples)
+    if not sxx or not syy:
+        return None
+    slope = sxy / sxx
+    if slope < MIN_GROWTH or sxy / (sxx * syy) ** 0.5 < MIN_CORRELATION:
+        return None
+    return slope
+
+
+def combined_growth(
+    by_worker: Dict[str, List[Tuple[int, int, Optional[int]]]],
+) -> Optional[Tuple[float, Optional[float], int, int]]:
+    """
+    Fit a line through each process's samples of a group, and combine
+    the ones that grew.
+
+    Return the traced and RSS growth in bytes per case (averaged over
+    the growing processes, by how many cases they ran), how many
+    processes grew and how many cases they ran, or `None` if no process
+    grew.
+    """
+    traced_total = 0.0
+    rss_total: Optional[float] = 0.0
+    growing = 0
+    cases = 0
+    for samples in by_worker.values():
+        slope = fit_growth([
+            (index, traced) for index, traced, _ in samples
+        ])
+        if slope is None:
+            continue
+        count = samples[-1][0] + 1
+        growing += 1
+        cases += count
+        traced_total += slope * count
+        rss_samples = [
+            (index, rss) for index, _, rss in samples if rss is not None
+        ]
+        rss_slope = (
+            fit_growth(rss_samples)
+            if len(rss_samples) == len(samples) else None
+        )
+        if rss_slope is None or rss_total is None:
+            rss_total = None
+        else:
+            rss_total += rss_slope * count
+    if not growing:
+        return None
+    return (
+        traced_total / cases,
+        rss_total / cases if rss_total is not None else None,
+        growing,
+        cases,
+    )
+
+
+class LeakCheckPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        workerinput = getattr(config, "workerinput", None)
+        self.worker: str = (
+            workerinput["workerid"] if workerinput is not None else ""
+        )
+        self.every = max(1, config.getoption("funparam_leak_sample"))
+        self.started_tracing = False
+        # How many cases of each group this process has run.
+        self.case_counts: Dict[str, int] = {}
+        # This process's samples, by group.
+        self.local_samples: Dict[str, List[Tuple[int, int]]] = {}
+        # The group the traces were last cleared for. Its samples only count
+        # memory allocated since then, on top of its last sample before that
+        # (if its cases were interrupted by another group's).
+        self.traced_group: Optional[str] = None
+        self.traced_offset = 0
+        # Groups this process has already found the top sites of.
+        self.sited: Set[str] = set()
+        # Samples received from every process, by group and worker id, as
+        # `(case index, traced bytes, rss bytes or None)`. Case indexes count
+        # the cases each process ran.
+        self.samples: Dict[
+            str, Dict[str, List[Tuple[int, int, Optional[int]]]]
+        ] = {}
+        self.sites: Dict[str, List[str]] = {}
+
+    def pytest_collection_finish(self) -> None:
+        # Tracing slows down every allocation, and the traces are cleared
+        # before the first sample anyway, so there's no point tracing
+        # collection.
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def pytest_unconfigure(self) -> None:
+        if self.started_tracing:
+            tracemalloc.stop()
+
+    def top_sites(self) -> List[str]:
+        """
+        Where the memory allocated since the traces were cleared was
+        allocated.
+        """
+        stats = take_snapshot().statistics("lineno")
+        return [
+            "{}:{}: {:+.1f} KiB in {:+d} block(s)".format(
+                stat.traceback[0].filename,
+                stat.traceback[0].lineno,
+                stat.size / 1024,
+                stat.count,
+            )
+            for stat in stats[:TOP_SITES]
+        ]
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        if call.when != "teardown" or not is_funparam_item(item):
+            return
+        group = funparam_group(item.nodeid)
+        index = self.case_counts.get(group, 0)
+        self.case_counts[group] = index + 1
+        # The first cases warm up caches, so start sampling a little later.
+        if (index + 1) % self.every:
+            return
+
+        # The item's fixtures are gone by now, so collect what they left.
+        gc.collect()
+        samples = self.local_samples.setdefault(group, [])
+        if group != self.traced_group:
+            tracemalloc.clear_traces()
+            self.traced_group = group
+            self.traced_offset = samples[-1][1] if samples else 0
+        traced = self.traced_offset + traced_memory()
+        report: "TestReport" = outcome.get_result()
+        report.funparam_memory = (  # type: ignore
+            self.worker, index, traced, current_rss(),
+        )
+
+        samples.append((index, traced))
+        if group not in self.sited and fit_growth(samples) is not None:
+            # Finding them is slow, so only do it once per group.
+            self.sited.add(group)
+            report.funparam_leak_sites = self.top_sites()  # type: ignore
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        memory = getattr(report, "funparam_memory", None)
+        if memory is None:
+            return
+        group: str = report.funparam_group
+        worker, index, traced, rss = memory
+        self.samples.setdefault(group, {}).setdefault(worker, []).append(
+            (index, traced, rss)
+        )
+        sites = getattr(report, "funparam_leak_sites", None)
+        if sites is not None:
+            self.sites[group] = sites
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if hasattr(self.config, "workerinput"):
+            return
+        growing = []
+        for group, by_worker in sorted(self.samples.items()):
+            growth = combined_growth(by_worker)
+            if growth is not None:
+                growing.append((group, growth, len(by_worker)))
+        if not growing:
+            return
+        terminalreporter.write_sep("=", "funparam memory growth")
+        for group, (slope, rss_slope, grew, cases), processes in growing:
+            line = (
+                "{}: traced memory grew {:.1f} KiB per case over {} "
+                "case(s)".format(group, slope / 1024, cases)
+            )
+            if rss_slope is not None:
+                line += ", RSS {:.1f} KiB per case".format(rss_slope / 1024)
+            if processes > 1:
+                line += " (in {} of {} processes)".format(grew, processes)
+            terminalreporter.write_line(line)
+            for site in self.sites.get(group, []):
+                terminalreporter.write_line("    " + site)
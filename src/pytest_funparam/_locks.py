@@ -0,0 +1,96 @@
+"""
+Advisory file locks, for coordinating pytest processes (like pytest-xdist
+workers) that share files.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+
+if sys.platform == "win32":  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+
+def lock_path(name: str) -> str:
+    """
+    Return the path of a lock file for `name`, outside the project so it
+    never shows up next to the files it protects.
+    """
+    digest = hashlib.sha1(os.path.abspath(name).encode()).hexdigest()
+    return os.path.join(
+        tempfile.gettempdir(), "funparam-{}.lock".format(digest[:16])
+    )
+
+
+def _lock(handle: IO[bytes], blocking: bool) -> bool:
+    if sys.platform == "win32":  # pragma: no cover
+        # `msvcrt.locking` locks bytes from the current position, and its
+        # blocking mode gives up after 10 seconds, so poll instead.
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(0.05)
+                continue
+            return True
+    flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+    try:
+        fcntl.flock(handle.fileno(), flags)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _unlock(handle: IO[bytes]) -> None:
+    if sys.platform == "win32":  # pragma: no cover
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on the file at `path` (created if needed), waiting
+    for other processes to release it first.
+    """
+    with open(path, "a+b") as handle:
+        _lock(handle, blocking=True)
+        try:
+            yield
+        finally:
+            _unlock(handle)
+
+
+def try_lock(path: str) -> Optional[IO[bytes]]:
+    """
+    Lock the file at `path` (created if needed) without waiting.
+
+    Return the open file, which holds the lock until it's passed to
+    `unlock()`, or `None` if somebody else holds the lock.
+    """
+    handle = open(path, "a+b")
+    if _lock(handle, blocking=False):
+        return handle
+    handle.close()
+    return None
+
+
+def unlock(handle: IO[bytes]) -> None:
+    """
+    Release a lock taken by `try_lock()`.
+    """
+    try:
+        _unlock(handle)
+    finally:
+        handle.close()
@@ -0,0 +1,133 @@
+"""
+Per-test fail-fast: once enough of a test's funparam cases have failed, skip
+the rest of them.
+
+Failures are counted in files in the run's scratch directory, so every
+pytest-xdist worker sees the failures of the others.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set
+
+import pytest
+
+from pytest_funparam._items import (
+    funparam_group, is_funparam_item, point_skip_at_test,
+)
+from pytest_funparam._run import run_directory
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+class MaxfailPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.default: Optional[int] = config.getoption(
+            "funparam_maxfail_per_test"
+        )
+        self.directory: Optional[Path] = None
+        # Failures seen by this process, in case there's no cache to share.
+        self.local_failures: Dict[str, int] = {}
+        self.skipped_nodeids: Set[str] = set()
+        self.skip_counts: Dict[str, int] = {}
+
+    def get_limit(self, item: "Item") -> Optional[int]:
+        marker = item.get_closest_marker("funparam_maxfail")
+        if marker is not None:
+            (limit,) = marker.args
+            return int(limit)
+        return self.default
+
+    def _failures_path(self, group: str) -> Optional[Path]:
+        if self.directory is None:
+            self.directory = run_directory(self.config, "maxfail")
+            if self.directory is None:
+                return None
+        digest = hashlib.sha1(group.encode("utf-8")).hexdigest()
+        return self.directory / digest
+
+    def count_failures(self, group: str) -> int:
+        path = self._failures_path(group)
+        if path is None:
+            return self.local_failures.get(group, 0)
+        try:
+            # One byte per failure.
+            return os.path.getsize(str(path))
+        except OSError:
+            return 0
+
+    def record_failure(self, group: str) -> None:
+        self.local_failures[group] = self.local_failures.get(group, 0) + 1
+        path = self._failures_path(group)
+        if path is not None:
+            # Appends this small are atomic, even between processes.
+            with open(str(path), "ab") as failures:
+                failures.write(b"F")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: "Item") -> None:
+        if not is_funparam_item(item):
+            return
+        limit = self.get_limit(item)
+        if limit is None:
+            return
+        group = funparam_group(item.nodeid)
+        if self.count_failures(group) >= limit:
+            self.skipped_nodeids.add(item.nodeid)
+            pytest.skip(
+                "funparam: {} reached {} failure(s); "
+                "skipping its remaining cases".format(group, limit)
+            )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        report: "TestReport" = outcome.get_result()
+        if call.when == "setup" and item.nodeid in self.skipped_nodeids:
+            report.funparam_maxfail_skipped = True  # type: ignore
+            point_skip_at_test(item, report)
+        elif (
+            call.when == "call"
+            and report.failed
+            and is_funparam_item(item)
+            and self.get_limit(item) is not None
+        ):
+            # Only failures that some limit counts get written down.
+            report.funparam_maxfail_counted = True  # type: ignore
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        group = getattr(report, "funparam_group", None)
+        if group is None:
+            return
+        if getattr(report, "funparam_maxfail_skipped", False):
+            self.skip_counts[group] = self.skip_counts.get(group, 0) + 1
+        elif getattr(report, "funparam_maxfail_counted", False):
+            if hasattr(report, "node"):
+                # The pytest-xdist controller received this from a worker,
+                # which already counted it.
+                return
+            self.record_failure(group)
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if not self.skip_counts:
+            return
+        terminalreporter.write_sep("=", "funparam maxfail per test")
+        for group, skipped in sorted(self.skip_counts.items()):
+            terminalreporter.write_line(
+                "{}: skipped {} remaining case(s)".format(group, skipped)
+            )
@@ -0,0 +1,95 @@
+"""
+Share expensive values between the sibling items of a funparam test.
+
+Every generated item runs the whole test body again. `funparam.memo()` lets
+the body compute a value once per test function and parametrization (in each
+process), instead of once per item.
+"""
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Hashable,
+    Optional,
+    TypeVar,
+)
+
+import pytest
+
+from pytest_funparam._items import is_funparam_item, sibling_group
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.main import Session
+    from _pytest.nodes import Item
+
+
+T = TypeVar("T")
+
+
+class MemoPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        # pytest-xdist workers only run some of the items they collect.
+        self.is_worker = hasattr(config, "workerinput")
+        self.max_groups = int(config.getini("funparam_memo_groups"))
+        # Memoized values, by group. The most recently used group is last.
+        self.groups: "OrderedDict[str, Dict[Hashable, Any]]" = OrderedDict()
+        # How many items of each group are left to run in this process (not
+        # counted in pytest-xdist workers).
+        self.remaining: Dict[str, int] = {}
+
+    def get(self, group: str, key: Hashable, factory: Callable[[], T]) -> T:
+        try:
+            values = self.groups[group]
+            self.groups.move_to_end(group)
+        except KeyError:
+            values = self.groups[group] = {}
+            while len(self.groups) > self.max_groups:
+                self.groups.popitem(last=False)
+        try:
+            value: T = values[key]
+        except KeyError:
+            value = values[key] = factory()
+        return value
+
+    def pytest_collection_finish(self, session: "Session") -> None:
+        # Count once every plugin is done deselecting items.
+        self.remaining = {}
+        if self.is_worker:
+            return
+        for item in session.items:
+            if is_funparam_item(item):
+                group = sibling_group(item)
+                self.remaining[group] = self.remaining.get(group, 0) + 1
+
+    def release(self, group: str) -> None:
+        self.remaining.pop(group, None)
+        self.groups.pop(group, None)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(
+        self,
+        item: "Item",
+        nextitem: Optional["Item"],
+    ) -> Generator[None, None, None]:
+        yield
+        if not is_funparam_item(item):
+            return
+        group = sibling_group(item)
+        if self.is_worker:
+            # The controller hands out items as they're needed, so a worker
+            # can't count its own. It always knows the next one, though.
+            if nextitem is None or sibling_group(nextitem) != group:
+                self.release(group)
+            return
+        if group not in self.remaining:
+            return
+        self.remaining[group] -= 1
+        if self.remaining[group] <= 0:
+            # That was the last sibling. Nobody else needs these values.
+            self.release(group)
@@ -0,0 +1,47 @@
+"""
+Reorder funparam items based on durations recorded by earlier runs.
+"""
+from typing import TYPE_CHECKING, Any, Callable, List
+
+import pytest
+
+from pytest_funparam._durations import load_durations
+from pytest_funparam._items import is_funparam_item
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+
+
+def reorder_funparam_items(
+    items: List["Item"],
+    key: Callable[["Item"], Any],
+) -> None:
+    """
+    Sort the funparam items in `items` by `key`, in place.
+
+    Funparam items only trade places with each other. Every other item keeps
+    its position.
+    """
+    positions = [
+        index for index, item in enumerate(items) if is_funparam_item(item)
+    ]
+    ordered = sorted((items[index] for index in positions), key=key)
+    for index, item in zip(positions, ordered):
+        items[index] = item
+
+
+class LongestFirstPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.durations = load_durations(config)
+
+    def sort_key(self, item: "Item") -> float:
+        # Items without history might be slow, so put them up front with the
+        # slowest ones. The sort is stable, so they keep collection order.
+        return -self.durations.get(item.nodeid, float("inf"))
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items: List["Item"]) -> None:
+        reorder_funparam_items(items, self.sort_key)
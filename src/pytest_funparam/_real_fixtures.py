@@ -0,0 +1,149 @@
+"""
+Evaluate selected fixtures for real during the dry run.
+
+Normally, the dry run replaces every fixture unrelated to `funparam` with a
+MagicMock. Fixtures named in the `funparam_dryrun_fixtures` ini option are
+computed for real instead, so a test can generate its cases from them. The
+value is then reused when the tests run, so it's only computed once.
+"""
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import pytest
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.fixtures import FixtureDef, SubRequest
+
+
+SUPPORTED_SCOPES = ("session", "module")
+
+
+class RealFixtureError(Exception):
+    """
+    A fixture in `funparam_dryrun_fixtures` can't be evaluated during the dry
+    run.
+    """
+
+
+class RealFixturesPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.names = set(config.getini("funparam_dryrun_fixtures"))
+        # Keyed by fixture definition and (for module-scoped fixtures) the
+        # module's node id. The definition is kept in the value, so its id
+        # can't be reused while we're holding on to it.
+        self.values: Dict[
+            Tuple[int, str],
+            Tuple["FixtureDef[Any]", Any],
+        ] = {}
+        self.teardowns: List["Generator[Any, Any, Any]"] = []
+
+    def get_value(
+        self,
+        name: str,
+        name2fixturedefs: Dict[str, Sequence["FixtureDef[Any]"]],
+        module_nodeid: str,
+    ) -> Any:
+        """
+        Compute the value of fixture `name`, or return it from the cache.
+        """
+        try:
+            *_, fixturedef = name2fixturedefs[name]
+        except KeyError:
+            raise RealFixtureError(
+                "fixture {!r} not found".format(name)
+            ) from None
+        if fixturedef.scope not in SUPPORTED_SCOPES:
+            raise RealFixtureError(
+                "fixture {!r} is {}-scoped. Only {} fixtures can be listed "
+                "in funparam_dryrun_fixtures.".format(
+                    name, fixturedef.scope, " and ".join(SUPPORTED_SCOPES),
+                )
+            )
+        if fixturedef.params is not None:
+            raise RealFixtureError(
+                "fixture {!r} is parametrized, so it can't be listed in "
+                "funparam_dryrun_fixtures.".format(name)
+            )
+
+        key = self._key(fixturedef, module_nodeid)
+        try:
+            return self.values[key][1]
+        except KeyError:
+            pass
+
+        kwargs = {}
+        for argname in fixturedef.argnames:
+            if argname not in self.names:
+                raise RealFixtureError(
+                    "fixture {!r} requests {!r}, which isn't listed in "
+                    "funparam_dryrun_fixtures.".format(name, argname)
+                )
+            kwargs[argname] = self.get_value(
+                argname, name2fixturedefs, module_nodeid
+            )
+
+        value = fixturedef.func(**kwargs)
+        if inspect.isgenerator(value):
+            generator: "Generator[Any, Any, Any]" = value
+            value = next(generator)
+            self.teardowns.append(generator)
+        self.values[key] = (fixturedef, value)
+        return value
+
+    def _key(
+        self,
+        fixturedef: "FixtureDef[Any]",
+        module_nodeid: Optional[str],
+    ) -> Tuple[int, str]:
+        if fixturedef.scope == "session":
+            module_nodeid = ""
+        return (id(fixturedef), module_nodeid or "")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_fixture_setup(
+        self,
+        fixturedef: "FixtureDef[Any]",
+        request: "SubRequest",
+    ) -> Optional[Any]:
+        if fixturedef.argname not in self.names:
+            return None
+        module_nodeid = ""
+        if fixturedef.scope == "module":
+            module_nodeid = request.node.nodeid
+        try:
+            _, value = self.values[self._key(fixturedef, module_nodeid)]
+        except KeyError:
+            # The dry run never needed it. Let pytest set it up as usual.
+            return None
+        # This is what pytest's own `pytest_fixture_setup` does with a value.
+        fixturedef.cached_result = (
+            value, fixturedef.cache_key(request), None,
+        )
+        return value
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self) -> None:
+        while self.teardowns:
+            generator = self.teardowns.pop()
+            try:
+                next(generator)
+            except StopIteration:
+                pass
+            else:
+                raise RealFixtureError(
+                    "fixture generator {!r} yielded more than once".format(
+                        generator
+                    )
+                )
@@ -0,0 +1,158 @@
+"""
+Find funparam cases that exercise the same code as other cases.
+
+`--funparam-redundancy` traces the arcs (pairs of consecutive lines) executed
+by each selected verify function call. Within each test function, cases with
+identical arcs are reported as prunable, along with a small subset of cases
+that covers every arc any case covered.
+"""
+import sys
+import zlib
+from types import FrameType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.reports import TestReport
+    from _pytest.terminal import TerminalReporter
+
+
+class ArcTracer:
+    """
+    Record the arcs executed between `start()` and `stop()`.
+
+    Uses `sys.settrace`, so any other tracer (like coverage.py or a debugger)
+    is paused in the meantime.
+    """
+
+    def __init__(self) -> None:
+        self.arcs: Set[Tuple[str, int, int]] = set()
+        # Whatever was tracing before `start()`.
+        self._previous: Any = None
+
+    def _trace(self, frame: FrameType, event: str, arg: Any) -> Any:
+        if event != "call":
+            return None
+        code = frame.f_code
+        filename = code.co_filename
+        last = -code.co_firstlineno
+        arcs = self.arcs
+
+        def trace_lines(frame: FrameType, event: str, arg: Any) -> Any:
+            nonlocal last
+            if event == "line":
+                arcs.add((filename, last, frame.f_lineno))
+                last = frame.f_lineno
+            elif event == "return":
+                arcs.add((filename, last, -code.co_firstlineno))
+            return trace_lines
+
+        return trace_lines
+
+    def start(self) -> None:
+        self._previous = sys.gettrace()
+        sys.settrace(self._trace)
+
+    def stop(self) -> FrozenSet[int]:
+        """
+        Stop tracing, and return the recorded arcs as stable integers.
+
+        Integers are cheap to send between pytest-xdist processes, and unlike
+        `hash()`, `crc32` gives every process the same value.
+        """
+        sys.settrace(self._previous)
+        return frozenset(
+            zlib.crc32("{}:{}:{}".format(*arc).encode())
+            for arc in self.arcs
+        )
+
+
+def covering_subset(cases: Dict[str, FrozenSet[int]]) -> List[str]:
+    """
+    Greedily pick cases until every arc of `cases` is covered.
+
+    Each round picks the case covering the most uncovered arcs; ties go to
+    the earliest case.
+    """
+    uncovered = set().union(*cases.values()) if cases else set()
+    chosen = []
+    while uncovered:
+        best = max(cases, key=lambda nodeid: len(cases[nodeid] & uncovered))
+        chosen.append(best)
+        uncovered -= cases[best]
+    return chosen
+
+
+class RedundancyPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.output: Optional[str] = config.getoption(
+            "funparam_redundancy_output"
+        )
+        # The arcs of each passed case, by group, in the order they ran.
+        self.coverage: Dict[str, Dict[str, FrozenSet[int]]] = {}
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        arcs = getattr(report, "funparam_coverage", None)
+        if arcs is None or not report.passed:
+            return
+        group: str = report.funparam_group
+        self.coverage.setdefault(group, {})[report.nodeid] = frozenset(arcs)
+
+    def analyse(self) -> Dict[str, Tuple[List[List[str]], List[str]]]:
+        """
+        For each group, return the cases sharing identical coverage (only
+        the classes with more than one case) and the covering subset.
+        """
+        analysis = {}
+        for group, cases in sorted(self.coverage.items()):
+            classes: Dict[FrozenSet[int], List[str]] = {}
+            for nodeid, arcs in cases.items():
+                classes.setdefault(arcs, []).append(nodeid)
+            analysis[group] = (
+                [nodeids for nodeids in classes.values() if len(nodeids) > 1],
+                covering_subset(cases),
+            )
+        return analysis
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if hasattr(self.config, "workerinput") or not self.coverage:
+            return
+        analysis = self.analyse()
+        terminalreporter.write_sep("=", "funparam redundancy")
+        for group, (duplicates, subset) in analysis.items():
+            total = len(self.coverage[group])
+            prunable = sum(len(nodeids) - 1 for nodeids in duplicates)
+            terminalreporter.write_line(
+                "{}: {} case(s), {} with the same coverage as another, "
+                "{} cover everything".format(
+                    group, total, prunable, len(subset),
+                )
+            )
+            if terminalreporter.verbosity > 0:
+                for first, *others in duplicates:
+                    terminalreporter.write_line(
+                        "  same as {}: {}".format(first, ", ".join(others))
+                    )
+        if self.output is not None:
+            with open(self.output, "w") as output:
+                for group, (duplicates, subset) in analysis.items():
+                    for nodeid in subset:
+                        output.write(nodeid + "\n")
+            terminalreporter.write_line(
+                "funparam: wrote covering cases to {}".format(self.output)
+            )
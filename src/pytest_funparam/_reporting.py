@@ -0,0 +1,193 @@
+"""
+Compact reporting for tests with many funparam cases.
+
+`--funparam-compact` reports each group of sibling items (the items generated
+from one test function) as a whole: one progress character per group, and
+one junitxml testcase for all of a group's passed cases. Failing, erroring
+and skipped cases are still reported one by one, in full. With `-v`, pytest
+writes each item's node id before it knows the outcome, so the terminal
+shows every case as usual.
+
+`--funparam-results` writes a CSV file with a row per funparam case.
+"""
+import csv
+import os
+import xml.etree.ElementTree as ET
+from typing import (
+    TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple,
+)
+
+import pytest
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.reports import TestReport
+    from _pytest.terminal import TerminalReporter
+
+
+def junit_key(group: str, prefix: Optional[str]) -> Tuple[str, str]:
+    """
+    The junitxml `classname` and `name` a group's testcases share, up to the
+    case id.
+    """
+    from _pytest.junitxml import mangle_test_address
+    names = mangle_test_address(group)
+    if prefix:
+        names.insert(0, prefix)
+    return ".".join(names[:-1]), names[-1]
+
+
+def aggregate_junitxml(path: str, keys: Set[Tuple[str, str]]) -> None:
+    """
+    Replace the passed testcases of each funparam group in the junitxml file
+    at `path` with one testcase for the whole group.
+
+    The group's testcase takes the place of its first passed case, and has a
+    `funparam_passed_cases` property counting the cases it stands for.
+    """
+    tree = ET.parse(path)
+    for suite in tree.iter("testsuite"):
+        merged: Dict[Tuple[str, str], ET.Element] = {}
+        counts: Dict[Tuple[str, str], int] = {}
+        durations: Dict[Tuple[str, str], float] = {}
+        for testcase in list(suite):
+            name, bracket, _ = testcase.get("name", "").partition("[")
+            key = (testcase.get("classname", ""), name)
+            if testcase.tag != "testcase" or not bracket or key not in keys:
+                continue
+            if any(
+                child.tag in ("failure", "error", "skipped")
+                for child in testcase
+            ):
+                continue
+            if key not in merged:
+                merged[key] = ET.Element(
+                    "testcase", classname=key[0], name=key[1],
+                )
+                suite.insert(list(suite).index(testcase), merged[key])
+            suite.remove(testcase)
+            counts[key] = counts.get(key, 0) + 1
+            durations[key] = (
+                durations.get(key, 0.0) + float(testcase.get("time", 0))
+            )
+        for key, testcase in merged.items():
+            testcase.set("time", "{:.3f}".format(durations[key]))
+            properties = ET.SubElement(testcase, "properties")
+            ET.SubElement(
+                properties,
+                "property",
+                name="funparam_passed_cases",
+                value=str(counts[key]),
+            )
+        if "tests" in suite.attrib:
+            removed = sum(counts.values()) - len(merged)
+            suite.set("tests", str(int(suite.get("tests", 0)) - removed))
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+class CompactPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        xmlpath = getattr(config.option, "xmlpath", None)
+        self.xmlpath = os.path.abspath(xmlpath) if xmlpath else None
+        # The groups that have already shown their progress character.
+        self.shown: Set[str] = set()
+        self.hidden = 0
+        self.verbose = config.getoption("verbose") > 0
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_report_teststatus(
+        self,
+        report: "TestReport",
+    ) -> Optional[Tuple[str, str, str]]:
+        group = getattr(report, "funparam_group", None)
+        if group is None or report.failed:
+            return None
+        if report.when != "call" and not (
+            report.when == "setup" and report.skipped
+        ):
+            return None
+        if group not in self.shown:
+            self.shown.add(group)
+            return None
+        if self.verbose:
+            # The node id is already on the terminal, waiting for a status.
+            return None
+        self.hidden += 1
+        # The progress percentage counts the items the terminal reporter has
+        # shown, so count this one as shown too.
+        reporter = self.config.pluginmanager.get_plugin("terminalreporter")
+        reported = getattr(reporter, "_progress_nodeids_reported", None)
+        if isinstance(reported, set):
+            reported.add(report.nodeid)
+        return report.outcome, "", ""
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if self.hidden:
+            terminalreporter.write_line(
+                "funparam: {} passed or skipped case(s) not shown "
+                "individually".format(self.hidden)
+            )
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self) -> None:
+        # `trylast`, so junitxml has already written its file.
+        if hasattr(self.config, "workerinput") or self.xmlpath is None:
+            return
+        if not os.path.exists(self.xmlpath):
+            return
+        prefix = self.config.getoption("junitprefix", None)
+        aggregate_junitxml(
+            self.xmlpath,
+            {junit_key(group, prefix) for group in self.shown},
+        )
+
+
+RESULTS_COLUMNS = ["test", "case", "outcome", "duration"]
+
+
+class ResultsPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.path = os.path.abspath(config.getoption("funparam_results"))
+        # The outcome and call duration of each case, by node id.
+        self.results: Dict[str, List[Any]] = {}
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        group = getattr(report, "funparam_group", None)
+        if group is None:
+            return
+        result = self.results.setdefault(
+            report.nodeid,
+            [group, report.nodeid[len(group) + 1:-1], "passed", ""],
+        )
+        if report.when == "call":
+            result[3] = "{:.6f}".format(report.duration)
+        if report.failed:
+            result[2] = "failed" if report.when == "call" else "error"
+        elif report.skipped and result[2] == "passed":
+            result[2] = "skipped"
+
+    def pytest_sessionfinish(self) -> None:
+        if hasattr(self.config, "workerinput"):
+            return
+        with open(self.path, "w", newline="") as results_file:
+            writer = csv.writer(results_file)
+            writer.writerow(RESULTS_COLUMNS)
+            writer.writerows(self.results.values())
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        terminalreporter.write_line(
+            "funparam: wrote {} case result(s) to {}".format(
+                len(self.results), self.path,
+            )
+        )
@@ -0,0 +1,186 @@
+"""
+Throttle verify functions that use scarce resources, with `.resources()`.
+
+Each resource has a fixed number of tokens, set with the `funparam_resources`
+ini option. Every token is a lock file in the pytest cache directory, so the
+tokens are shared by everything running in the project: pytest-xdist workers,
+threads started by tests, and separate pytest runs. A call takes all of its
+tokens at once, or none of them, so calls waiting for tokens never hold any.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import (
+    IO, TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional,
+)
+
+import pytest
+
+from pytest_funparam._locks import try_lock, unlock
+from pytest_funparam._run import cache_directory
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+# How long to wait before looking for free tokens again, in seconds. The wait
+# doubles after every attempt, up to the maximum.
+MIN_POLL_INTERVAL = 0.005
+MAX_POLL_INTERVAL = 0.1
+
+
+def parse_capacities(lines: List[str]) -> Dict[str, int]:
+    capacities = {}
+    for line in lines:
+        name, sep, count = line.partition("=")
+        name = name.strip()
+        try:
+            capacity = int(count)
+        except ValueError:
+            capacity = 0
+        if not sep or not name.isidentifier() or capacity < 1:
+            raise pytest.UsageError(
+                "funparam_resources: expected NAME=COUNT with a positive "
+                "COUNT, got {!r}".format(line)
+            )
+        capacities[name] = capacity
+    return capacities
+
+
+class ResourcesPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.capacities = parse_capacities(
+            config.getini("funparam_resources")
+        )
+        self._directory: Optional[str] = None
+        # How long each item waited for its tokens, in seconds.
+        self.waits: Dict[str, float] = {}
+        # The total wait, counted from the reports so it includes the
+        # pytest-xdist workers.
+        self.total_wait = 0.0
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            cache = getattr(self.config, "cache", None)
+            if cache is not None:
+                self._directory = str(
+                    cache_directory(cache, "funparam-resources")
+                )
+            else:
+                # The cache plugin is disabled. Use a directory that's still
+                # specific to this project.
+                rootpath = getattr(self.config, "rootpath", None)
+                if rootpath is None:
+                    # pytest < 6.1
+                    rootpath = self.config.rootdir  # type: ignore
+                digest = hashlib.sha1(str(rootpath).encode()).hexdigest()
+                self._directory = os.path.join(
+                    tempfile.gettempdir(),
+                    "funparam-resources-{}".format(digest[:16]),
+                )
+                os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def token_path(self, name: str, slot: int) -> str:
+        return os.path.join(self.directory, "{}.{}.lock".format(name, slot))
+
+    def try_acquire(
+        self,
+        resources: Mapping[str, int],
+    ) -> Optional[List[IO[bytes]]]:
+        """
+        Take the tokens for `resources` if they're all free, and return the
+        lock files holding them. Otherwise, take none and return `None`.
+        """
+        held = []
+        for name, count in sorted(resources.items()):
+            taken = 0
+            for slot in range(self.capacities[name]):
+                if taken == count:
+                    break
+                handle = try_lock(self.token_path(name, slot))
+                if handle is not None:
+                    held.append(handle)
+                    taken += 1
+            if taken < count:
+                for handle in held:
+                    unlock(handle)
+                return None
+        return held
+
+    @contextmanager
+    def hold(
+        self,
+        nodeid: str,
+        resources: Mapping[str, int],
+    ) -> Iterator[None]:
+        """
+        Wait for the tokens of `resources`, and hold them until the block
+        exits.
+        """
+        for name, count in resources.items():
+            capacity = self.capacities.get(name)
+            if capacity is None:
+                raise ValueError(
+                    "unknown resource {!r}; set its capacity with a line like "
+                    "'{}=1' in the funparam_resources ini option".format(
+                        name, name,
+                    )
+                )
+            if count > capacity:
+                raise ValueError(
+                    "resource {!r} only has {} token(s), but {} were "
+                    "requested".format(name, capacity, count)
+                )
+        held = self.try_acquire(resources)
+        if held is None:
+            start = time.perf_counter()
+            interval = MIN_POLL_INTERVAL
+            while held is None:
+                time.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
+                held = self.try_acquire(resources)
+            self.waits[nodeid] = (
+                self.waits.get(nodeid, 0.0) + time.perf_counter() - start
+            )
+        try:
+            yield
+        finally:
+            for handle in held:
+                unlock(handle)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        if call.when == "call" and item.nodeid in self.waits:
+            report: "TestReport" = outcome.get_result()
+            report.funparam_resource_wait = (  # type: ignore
+                self.waits.pop(item.nodeid)
+            )
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        self.total_wait += getattr(report, "funparam_resource_wait", 0.0)
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if self.total_wait:
+            terminalreporter.write_line(
+                "funparam: waited {:.2f}s in total for resource "
+                "tokens".format(self.total_wait)
+            )
@@ -0,0 +1,87 @@
+"""
+State shared by every process taking part in one test run.
+
+Under pytest-xdist, the controller and its workers all agree on a run id, and
+use it to find a scratch directory in the pytest cache.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import pytest
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.cacheprovider import Cache
+    from _pytest.config import Config
+
+
+def cache_directory(cache: "Cache", name: str) -> Path:
+    """
+    Return the directory `name` in the pytest cache, creating it if needed.
+    """
+    mkdir = getattr(cache, "mkdir", None)
+    if mkdir is None:
+        # pytest < 7.0
+        mkdir = cache.makedir  # type: ignore
+    return Path(str(mkdir(name)))
+
+
+class RunPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput is not None:
+            self.uid: str = workerinput["funparam_run_uid"]
+        else:
+            self.uid = os.urandom(16).hex()
+        self._directory: Optional[Path] = None
+        # Set once some process might have used the scratch directory.
+        self._used = False
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node: object) -> None:
+        # Hand our run id down to each pytest-xdist worker.
+        node.workerinput["funparam_run_uid"] = self.uid  # type: ignore
+        self._used = True
+
+    def directory(self) -> Optional[Path]:
+        """
+        A scratch directory shared by all the processes in this run, or
+        `None` if the cacheprovider plugin is disabled.
+        """
+        if self._directory is None:
+            cache = getattr(self.config, "cache", None)
+            if cache is None:
+                return None
+            path = cache_directory(cache, "funparam-runs") / self.uid
+            path.mkdir(parents=True, exist_ok=True)
+            self._directory = path
+            self._used = True
+        return self._directory
+
+    def pytest_unconfigure(self) -> None:
+        if hasattr(self.config, "workerinput"):
+            # The controller outlives its workers. Let it clean up.
+            return
+        if not self._used:
+            return
+        directory = self.directory()
+        if directory is not None:
+            shutil.rmtree(str(directory), ignore_errors=True)
+
+
+def run_directory(config: "Config", name: str) -> Optional[Path]:
+    """
+    Return the subdirectory `name` of this run's scratch directory.
+    """
+    run = config.pluginmanager.get_plugin("funparam-run")
+    assert isinstance(run, RunPlugin)
+    directory = run.directory()
+    if directory is None:
+        return None
+    path = directory / name
+    path.mkdir(exist_ok=True)
+    return path
@@ -0,0 +1,212 @@
+"""
+Guess whether a test function is about to be deselected, so its dry run can
+be skipped.
+
+Selection normally happens after collection, which is after every dry run.
+These checks only look at what's known before the dry run: the node ids on
+the command line, `--deselect`, the failures recorded for `--lf`, and the
+function's own markers and keywords. Marks and ids given to individual
+funparam cases aren't known yet, and can only add markers and keywords, so
+`-m` and `-k` only exclude a function when no case could match them
+whatever it adds (like `-m "not slow"` for a function marked `slow`).
+"""
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Tuple,
+)
+
+import pytest
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.python import FunctionDefinition
+
+
+# How many guesses at what the cases add to try before giving up on an
+# expression.
+MAX_EVALUATIONS = 256
+
+
+def _evaluate(expression: str, matcher: Callable[..., bool]) -> bool:
+    from _pytest.mark.expression import Expression
+    return bool(Expression.compile(expression).evaluate(matcher))
+
+
+def _never_matches(expression: str, known: Callable[..., bool]) -> bool:
+    """
+    Is `expression` false for every item, given that `known` matches what
+    every item has, and that each item might match anything else too?
+
+    Tries every combination of the names `known` doesn't match, following
+    only the ones the expression looks at.
+    """
+    pending: List[Dict[Tuple[str, Hashable], bool]] = [{}]
+    evaluations = 0
+    while pending:
+        evaluations += 1
+        if evaluations > MAX_EVALUATIONS:
+            return False
+        assumed = pending.pop()
+        unknown: List[Tuple[str, Hashable]] = []
+
+        def matcher(name: str, **kwargs: Any) -> bool:
+            if known(name, **kwargs):
+                return True
+            key = (name, tuple(sorted(kwargs.items())))
+            if key in assumed:
+                return assumed[key]
+            unknown.append(key)
+            return False
+
+        matched = _evaluate(expression, matcher)
+        if unknown:
+            # Try again with the first unknown name both ways.
+            for value in (False, True):
+                pending.append({**assumed, unknown[0]: value})
+        elif matched:
+            return False
+    return True
+
+
+def _function_names(
+    definition: "FunctionDefinition",
+    module: pytest.Module,
+) -> List[str]:
+    """
+    The parts of the node id after the module, like `["TestClass", "test"]`.
+    """
+    return definition.nodeid[len(module.nodeid):].lstrip(":").split("::")
+
+
+def excluded_by_args(
+    config: "Config",
+    definition: "FunctionDefinition",
+    module: pytest.Module,
+) -> bool:
+    invocation_params = getattr(config, "invocation_params", None)
+    if invocation_params is not None:
+        invocation_dir = Path(str(invocation_params.dir))
+    else:
+        # pytest<5.1
+        invocation_dir = Path(str(config.invocation_dir))  # type: ignore
+    for prefix in config.getoption("deselect", None) or ():
+        # `--deselect` matches node id prefixes, so it drops every case of a
+        # function as long as it doesn't name one of the cases.
+        if "[" not in prefix and definition.nodeid.startswith(prefix):
+            return True
+
+    module_path = Path(str(module.fspath)).resolve()
+    names = _function_names(definition, module)
+
+    named_elsewhere = False
+    for arg in config.args:
+        path_part, *arg_names = arg.split("::")
+        path = (invocation_dir / path_part).resolve()
+        if not arg_names:
+            if path == module_path or path in module_path.parents:
+                return False
+            continue
+        if path != module_path:
+            continue
+        arg_names[-1] = arg_names[-1].partition("[")[0]
+        if names[:len(arg_names)] == arg_names:
+            return False
+        named_elsewhere = True
+    # If no argument mentions this module at all, it might have been
+    # collected some other way (like `--pyargs`). Don't guess.
+    return named_elsewhere
+
+
+def excluded_by_markers(
+    config: "Config",
+    definition: "FunctionDefinition",
+) -> bool:
+    expression = config.option.markexpr
+    if not expression:
+        return False
+    markers = list(definition.iter_markers())
+
+    def matcher(name: str, **kwargs: Any) -> bool:
+        return any(
+            marker.name == name
+            and all(marker.kwargs.get(k) == v for k, v in kwargs.items())
+            for marker in markers
+        )
+
+    return _never_matches(expression, matcher)
+
+
+def excluded_by_keywords(
+    config: "Config",
+    definition: "FunctionDefinition",
+) -> bool:
+    expression = config.option.keyword.lstrip()
+    if not expression:
+        return False
+    from _pytest.mark import KeywordMatcher
+    return _never_matches(expression, KeywordMatcher.from_item(definition))
+
+
+def excluded_by_last_failed(
+    config: "Config",
+    definition: "FunctionDefinition",
+    module: pytest.Module,
+) -> bool:
+    cache = getattr(config, "cache", None)
+    if not config.getoption("lf", False) or cache is None:
+        return False
+    lastfailed = cache.get("cache/lastfailed", {})
+    prefix = definition.nodeid + "["
+    if any(nodeid == definition.nodeid or nodeid.startswith(prefix)
+           for nodeid in lastfailed):
+        return False
+    # `--lf` only narrows things down within files that had failures, so
+    # only trust it when this module is one of them. And when none of the
+    # failures is collected again (say the test was renamed), it runs
+    # everything, so one of them must still be defined.
+    module_prefix = module.nodeid + "::"
+    return any(
+        nodeid.startswith(module_prefix)
+        and _is_defined(module, nodeid[len(module_prefix):])
+        for nodeid in lastfailed
+    )
+
+
+def _is_defined(module: pytest.Module, names: str) -> bool:
+    """
+    Does `module` still define the test named by the rest of a node id, like
+    `"TestClass::test[1]"`?
+    """
+    obj = module.obj
+    for name in names.partition("[")[0].split("::"):
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return False
+    return True
+
+
+def is_deselected(
+    config: "Config",
+    definition: "FunctionDefinition",
+) -> bool:
+    """
+    Is `definition` (and every item it would generate) going to be
+    deselected?
+
+    Only returns `True` when none of the cases could be selected, whatever
+    marks and ids they're given. Returns `False` whenever a check fails, like
+    when it relies on parts of pytest that have changed.
+    """
+    module = definition.getparent(pytest.Module)
+    if module is None:
+        return False
+    try:
+        return (
+            excluded_by_args(config, definition, module)
+            or excluded_by_markers(config, definition)
+            or excluded_by_keywords(config, definition)
+            or excluded_by_last_failed(config, definition, module)
+        )
+    except Exception:
+        return False
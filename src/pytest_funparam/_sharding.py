@@ -0,0 +1,143 @@
+"""
+Split funparam cases between CI nodes with `--funparam-shard=I/N`.
+
+Cases are filtered out in `pytest_generate_tests`, so the cases belonging to
+other shards are never turned into items.
+"""
+import statistics
+import zlib
+from typing import TYPE_CHECKING, List, Sequence, Set
+
+import pytest
+
+from pytest_funparam._durations import load_durations
+from pytest_funparam._items import (
+    funparam_group,
+    is_funparam_item,
+    place_call_id,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.mark import ParameterSet
+    from _pytest.nodes import Item
+
+
+def stable_shard(key: str, count: int) -> int:
+    """
+    Map `key` to a shard index in `range(count)`.
+
+    Unlike `hash()`, this doesn't change between interpreter runs.
+    """
+    return zlib.crc32(key.encode("utf-8")) % count
+
+
+def case_nodeid(
+    definition_nodeid: str,
+    param: "ParameterSet",
+    other_ids: Sequence[str] = (),
+    id_position: int = 0,
+) -> str:
+    """
+    The node id of the item generated for `param`, where `other_ids` are the
+    ids of the test's other parametrizations and the call number's id goes
+    at `id_position` among them.
+    """
+    (call_number,) = param.values
+    call_id = str(param.id) if param.id is not None else str(call_number)
+    return "{}[{}]".format(
+        definition_nodeid,
+        "-".join(place_call_id(other_ids, call_id, id_position)),
+    )
+
+
+class ShardPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        index, self.count = config.getoption("funparam_shard")
+        # Zero-based, to match `stable_shard`.
+        self.index = index - 1
+        self.by_duration = config.getoption("funparam_shard_by") == "duration"
+        if self.by_duration and config.getoption("funparam_durations") is None:
+            # Shards only line up if every node plans with the same durations,
+            # and each node's own pytest cache has different ones.
+            raise pytest.UsageError(
+                "--funparam-shard-by=duration needs "
+                "--funparam-durations=PATH, a durations file shared by every "
+                "shard"
+            )
+        self.durations = load_durations(config) if self.by_duration else {}
+        # Total estimated time assigned to each shard so far. Every node
+        # collects in the same order, so they all agree on these.
+        self.loads = [0.0] * self.count
+        # Test functions that have no cases left on this shard.
+        self.emptied: Set[str] = set()
+
+    def select_params(
+        self,
+        definition_nodeid: str,
+        params: Sequence["ParameterSet"],
+        other_ids: Sequence[str] = (),
+        id_position: int = 0,
+    ) -> List["ParameterSet"]:
+        nodeids = [
+            case_nodeid(definition_nodeid, param, other_ids, id_position)
+            for param in params
+        ]
+        if self.by_duration and any(
+            nodeid in self.durations for nodeid in nodeids
+        ):
+            shards = self._assign_by_duration(nodeids)
+        else:
+            shards = [stable_shard(nodeid, self.count) for nodeid in nodeids]
+
+        selected = [
+            param
+            for param, shard in zip(params, shards)
+            if shard == self.index
+        ]
+        if params and not selected:
+            self.emptied.add(definition_nodeid)
+        return selected
+
+    def _assign_by_duration(self, nodeids: Sequence[str]) -> List[int]:
+        known = [
+            self.durations[nodeid]
+            for nodeid in nodeids
+            if nodeid in self.durations
+        ]
+        # Assume cases without history take a typical amount of time.
+        default = statistics.median(known)
+        estimates = [self.durations.get(nodeid, default) for nodeid in nodeids]
+
+        shards = [0] * len(nodeids)
+        # Longest cases first, onto whichever shard has the least work.
+        order = sorted(range(len(nodeids)), key=lambda i: -estimates[i])
+        for i in order:
+            shard = self.loads.index(min(self.loads))
+            shards[i] = shard
+            self.loads[shard] += estimates[i]
+        return shards
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(
+        self,
+        config: "Config",
+        items: List["Item"],
+    ) -> None:
+        keep: List["Item"] = []
+        deselected: List["Item"] = []
+        for item in items:
+            if is_funparam_item(item):
+                selected = True
+            elif funparam_group(item.nodeid) in self.emptied:
+                # The empty parametrization left behind when all of a test's
+                # cases went to other shards.
+                selected = False
+            else:
+                selected = stable_shard(item.nodeid, self.count) == self.index
+            (keep if selected else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = keep
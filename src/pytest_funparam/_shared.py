@@ -0,0 +1,174 @@
+"""
+Share large buffers between the items of a test, in every process, with
+`funparam.shared()`.
+
+The first process that needs a buffer writes it to a file in the run's
+scratch directory. Every item then gets a read-only view of that file,
+memory-mapped once per process, so pytest-xdist workers share the same pages
+instead of each holding a copy. The controller removes the scratch directory
+(and so every buffer) when the run ends.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from pytest_funparam._locks import file_lock
+from pytest_funparam._run import run_directory
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+
+
+MAGIC = b"FPSHRD01"
+# The magic bytes, then the length of the JSON header describing the buffer.
+HEADER = struct.Struct("<8sQ")
+# The data starts at a multiple of this, so arrays mapped from it are aligned
+# for any element type.
+ALIGNMENT = 64
+
+
+def _is_ndarray(value: Any) -> bool:
+    # Nothing can be an array unless NumPy was imported already.
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(value, numpy.ndarray)
+
+
+def _data_offset(header_length: int) -> int:
+    end = HEADER.size + header_length
+    return -(-end // ALIGNMENT) * ALIGNMENT
+
+
+def read_only(value: Any) -> Any:
+    """
+    Return a read-only view of the buffer `value`, without copying it.
+    """
+    if _is_ndarray(value):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    view = memoryview(value)
+    if hasattr(view, "toreadonly"):
+        # Python >= 3.8
+        view = view.toreadonly()
+    return view
+
+
+def write_buffer(path: Path, value: Any) -> None:
+    """
+    Write the buffer `value` to `path`, along with what's needed to view it
+    the same way again.
+
+    The file is written next to `path` and moved into place, so nobody maps a
+    partly written buffer.
+    """
+    if _is_ndarray(value):
+        import numpy
+        array = numpy.ascontiguousarray(value)
+        header: Dict[str, Any] = {
+            "descr": numpy.lib.format.dtype_to_descr(array.dtype),
+            "shape": list(array.shape),
+        }
+        data = array.data.cast("B")
+    else:
+        view = memoryview(value)
+        header = {"format": view.format, "shape": list(view.shape or ())}
+        if view.c_contiguous:
+            data = view.cast("B")
+        else:
+            data = memoryview(view.tobytes())
+    header_bytes = json.dumps(header).encode()
+    offset = _data_offset(len(header_bytes))
+
+    descriptor, temporary = tempfile.mkstemp(
+        dir=str(path.parent), prefix=".shared-"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(HEADER.pack(MAGIC, len(header_bytes)))
+            handle.write(header_bytes)
+            handle.write(bytes(offset - HEADER.size - len(header_bytes)))
+            handle.write(data)
+        os.replace(temporary, str(path))
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def map_buffer(path: Path) -> Any:
+    """
+    Map the buffer written to `path` by `write_buffer()`, and return a
+    read-only view of it: a NumPy array if it was one, otherwise a
+    memoryview with the original format and shape.
+    """
+    with open(str(path), "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, header_length = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise ValueError("{} is not a funparam shared buffer".format(path))
+    header = json.loads(
+        bytes(mapped[HEADER.size:HEADER.size + header_length])
+    )
+    offset = _data_offset(header_length)
+    shape = tuple(header["shape"])
+    if "descr" in header:
+        import numpy
+        dtype = numpy.lib.format.descr_to_dtype(header["descr"])
+        count = 1
+        for size in shape:
+            count *= size
+        return numpy.frombuffer(
+            mapped, dtype=dtype, count=count, offset=offset,
+        ).reshape(shape)
+    view = memoryview(mapped)[offset:]
+    try:
+        return view.cast(header["format"], shape)
+    except (TypeError, ValueError):
+        # A format memoryview can't cast to, like a struct. The bytes are
+        # still right.
+        return view
+
+
+class SharedPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.directory: Optional[Path] = None
+        # The views of this process, so its items all share one mapping of
+        # each buffer.
+        self.views: Dict[str, Any] = {}
+
+    def get(self, group: str, key: str, factory: Callable[[], Any]) -> Any:
+        # `group` tells the parametrizations of a test apart, so they each get
+        # buffers of their own.
+        name = hashlib.sha1(
+            "{}\0{}".format(group, key).encode("utf-8")
+        ).hexdigest()
+        try:
+            return self.views[name]
+        except KeyError:
+            pass
+        if self.directory is None:
+            self.directory = run_directory(self.config, "shared")
+        if self.directory is None:
+            # There's no scratch directory (the cacheprovider plugin is
+            # disabled), so only share within this process.
+            view = read_only(factory())
+        else:
+            path = self.directory / name
+            with file_lock(str(path) + ".lock"):
+                if not path.exists():
+                    write_buffer(path, factory())
+            view = map_buffer(path)
+        self.views[name] = view
+        return view
+
+    def pytest_unconfigure(self) -> None:
+        # The mappings go away with the last view of them.
+        self.views.clear()
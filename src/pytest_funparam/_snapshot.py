@@ -0,0 +1,231 @@
+"""
+Golden-output snapshots for `@funparam.snapshot` verify functions.
+
+All the snapshots of a project live in one binary store: a header, the
+pickled values one after another, and a JSON index of where each one is.
+The store is memory-mapped, so each item only reads (and unpickles) its own
+value, and values that pickle to the same bytes are compared without
+unpickling or copying anything.
+
+`--funparam-snapshot-update` records the values instead. Each process merges
+its values into the store at the end of the session, under a file lock, so
+pytest-xdist workers don't overwrite each other.
+"""
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from typing import (
+    TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple,
+)
+
+import pytest
+
+from pytest_funparam._locks import file_lock, lock_path
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.reports import TestReport
+    from _pytest.runner import CallInfo
+    from _pytest.terminal import TerminalReporter
+
+
+MAGIC = b"FPSNAP01"
+# The magic bytes, then the offset and length of the index.
+HEADER = struct.Struct("<8sQQ")
+
+
+class SnapshotStore:
+    """
+    A read-only view of the snapshot store at `path`. A missing store is
+    empty.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.index: Dict[str, Tuple[int, int]] = {}
+        self._map: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        try:
+            with open(path, "rb") as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    return
+                self._map = mmap.mmap(
+                    handle.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        except FileNotFoundError:
+            return
+        self._view = memoryview(self._map)
+        try:
+            magic, index_offset, index_length = HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = b""
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(
+                "{} is not a funparam snapshot store".format(path)
+            )
+        index = json.loads(
+            bytes(self._view[index_offset:index_offset + index_length])
+        )
+        self.index = {
+            key: (offset, length) for key, (offset, length) in index.items()
+        }
+
+    def get(self, key: str) -> memoryview:
+        """
+        Return the pickled value stored for `key`, without copying it.
+
+        Release the memoryview before closing the store.
+        """
+        offset, length = self.index[key]
+        assert self._view is not None
+        return self._view[offset:offset + length]
+
+    def save(self, updates: Mapping[str, bytes]) -> None:
+        """
+        Replace the store with its current values plus `updates`.
+
+        The new store is written next to the old one and moved into place,
+        so readers never see half of it.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary = tempfile.mkstemp(
+            dir=directory, prefix=".funparam-snapshots-"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                index = {}
+                offset = HEADER.size
+                handle.write(bytes(HEADER.size))
+                for key in sorted(set(self.index) | set(updates)):
+                    if key in updates:
+                        length = handle.write(updates[key])
+                    else:
+                        with self.get(key) as value:
+                            length = handle.write(value)
+                    index[key] = (offset, length)
+                    offset += length
+                index_bytes = json.dumps(
+                    index, sort_keys=True, separators=(",", ":")
+                ).encode()
+                handle.write(index_bytes)
+                handle.seek(0)
+                handle.write(HEADER.pack(MAGIC, offset, len(index_bytes)))
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def dumps(value: Any) -> bytes:
+    return pickle.dumps(value, protocol=4)
+
+
+class SnapshotPlugin:
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        self.update: bool = config.getoption("funparam_snapshot_update")
+        rootpath = getattr(config, "rootpath", None)
+        if rootpath is None:
+            # pytest < 6.1
+            rootpath = config.rootdir  # type: ignore
+        self.path = os.path.join(
+            str(rootpath), config.getini("funparam_snapshot_store"),
+        )
+        self._store: Optional[SnapshotStore] = None
+        # Values recorded with `--funparam-snapshot-update`, by node id.
+        self.updates: Dict[str, bytes] = {}
+        # How many snapshots were updated, counted from the reports so it
+        # includes the ones updated by pytest-xdist workers.
+        self.updated = 0
+
+    @property
+    def store(self) -> SnapshotStore:
+        if self._store is None:
+            self._store = SnapshotStore(self.path)
+        return self._store
+
+    def check(self, nodeid: str, value: Any) -> None:
+        """
+        Compare `value` with the snapshot stored for `nodeid`, or record it
+        with `--funparam-snapshot-update`.
+        """
+        if self.update:
+            self.updates[nodeid] = dumps(value)
+            return
+        if nodeid not in self.store.index:
+            raise AssertionError(
+                "no snapshot stored for {} in {}; run with "
+                "--funparam-snapshot-update to record one".format(
+                    nodeid, self.path,
+                )
+            )
+        with self.store.get(nodeid) as stored:
+            try:
+                if stored == dumps(value):
+                    return
+            except Exception:
+                # Unpicklable values can still be compared below, and fail
+                # there if the stored value can't be loaded either.
+                pass
+            expected = pickle.loads(stored)
+        if value != expected:
+            raise AssertionError(
+                "output doesn't match the snapshot for {}:\n"
+                "  expected: {!r}\n"
+                "  got:      {!r}".format(nodeid, expected, value)
+            )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(
+        self,
+        item: "Item",
+        call: "CallInfo[None]",
+    ) -> Any:
+        outcome = yield
+        if call.when == "call" and item.nodeid in self.updates:
+            report: "TestReport" = outcome.get_result()
+            report.funparam_snapshot_updated = True  # type: ignore
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        if getattr(report, "funparam_snapshot_updated", False):
+            self.updated += 1
+
+    def pytest_sessionfinish(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        if not self.updates:
+            return
+        with file_lock(lock_path(self.path)):
+            # Read the store again, in case another process updated it.
+            store = SnapshotStore(self.path)
+            try:
+                store.save(self.updates)
+            finally:
+                store.close()
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if self.update:
+            terminalreporter.write_line(
+                "funparam: updated {} snapshot(s) in {}".format(
+                    self.updated, self.path,
+                )
+            )
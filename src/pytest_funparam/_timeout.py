@@ -0,0 +1,129 @@
+"""
+Per-call timeouts for verify functions.
+
+On Unix, the main thread is interrupted with `SIGALRM`, so a hanging verify
+function fails with a traceback showing where it was stuck. Anywhere else,
+the verify function runs in a separate thread that's abandoned if it takes
+too long.
+"""
+import signal
+import threading
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class FunparamTimeoutError(Exception):
+    """
+    A verify function call took longer than its timeout.
+    """
+
+
+def can_use_alarm() -> bool:
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+def timeout_message(
+    function: Callable[..., Any],
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    timeout: float,
+    case_id: Optional[str],
+) -> str:
+    # Only built once a call times out, since the arguments' reprs can be
+    # costly.
+    arguments = [repr(arg) for arg in args]
+    arguments.extend(
+        "{}={!r}".format(name, value) for name, value in kwargs.items()
+    )
+    message = "{}({}) timed out after {:g}s".format(
+        getattr(function, "__name__", "verify function"),
+        ", ".join(arguments),
+        timeout,
+    )
+    if case_id is not None:
+        message = "case {}: {}".format(case_id, message)
+    return message
+
+
+def _call_with_alarm(
+    function: Callable[..., Any],
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    timeout: float,
+    case_id: Optional[str],
+) -> Any:
+    def on_alarm(signum: int, frame: Optional[FrameType]) -> None:
+        raise FunparamTimeoutError(
+            timeout_message(function, args, kwargs, timeout, case_id)
+        )
+
+    previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    # Someone else (like pytest-timeout) may have an alarm pending. Put it
+    # back afterwards, minus the time we took.
+    previous_delay, previous_interval = signal.setitimer(
+        signal.ITIMER_REAL, timeout,
+    )
+    start = time.monotonic()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        if previous_delay:
+            remaining = previous_delay - (time.monotonic() - start)
+            signal.setitimer(
+                signal.ITIMER_REAL,
+                # Zero would cancel the alarm instead of firing it.
+                max(remaining, 1e-6),
+                previous_interval,
+            )
+
+
+def _call_in_thread(
+    function: Callable[..., Any],
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    timeout: float,
+    case_id: Optional[str],
+) -> Any:
+    result: List[Any] = []
+    error: List[BaseException] = []
+
+    def run() -> None:
+        try:
+            result.append(function(*args, **kwargs))
+        except BaseException as exc:
+            error.append(exc)
+
+    # A daemon thread, so a call that never returns can't keep the
+    # interpreter alive.
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise FunparamTimeoutError(
+            timeout_message(function, args, kwargs, timeout, case_id)
+        )
+    if error:
+        raise error[0]
+    return result[0]
+
+
+def call_with_timeout(
+    function: Callable[..., Any],
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    timeout: float,
+    case_id: Optional[str] = None,
+) -> Any:
+    """
+    Return `function(*args, **kwargs)`, or raise `FunparamTimeoutError` if it
+    takes longer than `timeout` seconds.
+    """
+    if can_use_alarm():
+        return _call_with_alarm(function, args, kwargs, timeout, case_id)
+    return _call_in_thread(function, args, kwargs, timeout, case_id)
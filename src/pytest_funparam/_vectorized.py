@@ -0,0 +1,171 @@
+"""
+Vectorized verify functions, which check a whole batch of rows at once.
+
+The rows are split into chunks, and each chunk becomes one test item. Failing
+rows are listed one by one in the chunk's failure.
+"""
+import inspect
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence, Tuple
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pytest_funparam._core import FunparamFixture
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Don't flood the terminal when most of a chunk fails.
+MAX_REPORTED_ROWS = 20
+
+
+class VectorizedFailure(AssertionError):
+    """
+    Some rows of a vectorized verify function's chunk failed.
+    """
+
+    def __init__(self, message: str, failed_rows: Sequence[int]) -> None:
+        super().__init__(message)
+        #: The (absolute) indexes of the rows that failed.
+        self.failed_rows = failed_rows
+
+
+def failing_rows(result: Any, size: int) -> List[int]:
+    """
+    Return the indexes of the rows that failed, given the result of a check
+    over `size` rows.
+
+    `result` is either `None` (everything passed), a single boolean for all
+    the rows, or something with one boolean per row, like a NumPy mask.
+    """
+    if result is None:
+        return []
+    try:
+        import numpy
+    except ImportError:
+        return _failing_rows_without_numpy(result, size)
+
+    mask = numpy.asarray(result, dtype=bool)
+    if mask.ndim == 0:
+        mask = numpy.full(size, bool(mask))
+    if mask.shape != (size,):
+        raise ValueError(
+            "expected a result for each of {} rows, got shape {!r}".format(
+                size, mask.shape,
+            )
+        )
+    return [int(index) for index in numpy.flatnonzero(~mask)]
+
+
+def _failing_rows_without_numpy(result: Any, size: int) -> List[int]:
+    try:
+        flags = list(result)
+    except TypeError:
+        flags = [result] * size
+    if len(flags) != size:
+        raise ValueError(
+            "expected a result for each of {} rows, got {}".format(
+                size, len(flags),
+            )
+        )
+    return [index for index, flag in enumerate(flags) if not flag]
+
+
+class VectorizedFunparamFunction:
+    """
+    A verify function that takes whole columns of values.
+
+    Call it with one sequence (or array) per argument. The rows are split into
+    chunks of `chunk_size` rows, and each chunk becomes one test item.
+    """
+
+    def __init__(
+        self,
+        funparam: "FunparamFixture",
+        check: Callable[..., Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError(
+                "chunk_size must be at least 1, got {!r}".format(chunk_size)
+            )
+        self._funparam = funparam
+        self._check = check
+        self._chunk_size = chunk_size
+
+    def _column_names(
+        self,
+        columns: Tuple[Any, ...],
+        named_columns: Dict[str, Any],
+    ) -> List[str]:
+        # In the order of `columns` and then `named_columns`, like the values
+        # they're reported with.
+        names = ["[{}]".format(index) for index in range(len(columns))]
+        try:
+            signature = inspect.signature(self._check)
+            signature.bind(*columns, **named_columns)
+        except (TypeError, ValueError):
+            return names + list(named_columns)
+        positional = [
+            parameter.name
+            for parameter in signature.parameters.values()
+            if parameter.kind in (
+                parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD,
+            )
+        ]
+        for index, name in enumerate(positional[:len(columns)]):
+            names[index] = name
+        return names + list(named_columns)
+
+    def __call__(self, *columns: Any, **named_columns: Any) -> None:
+        all_columns = [*columns, *named_columns.values()]
+        sizes = {len(column) for column in all_columns}
+        if len(sizes) > 1:
+            raise ValueError(
+                "columns must all have the same length, got lengths "
+                "{!r}".format(sorted(sizes))
+            )
+        size = sizes.pop() if sizes else 0
+        names = self._column_names(columns, named_columns)
+        check = self._check
+
+        def verify_chunk(start: int, stop: int) -> None:
+            result = check(
+                *(column[start:stop] for column in columns),
+                **{
+                    name: column[start:stop]
+                    for name, column in named_columns.items()
+                }
+            )
+            failed = [
+                start + row for row in failing_rows(result, stop - start)
+            ]
+            if not failed:
+                return
+            lines = [
+                "{} of {} rows failed in rows {}-{}:".format(
+                    len(failed), stop - start, start, stop - 1,
+                )
+            ]
+            for row in failed[:MAX_REPORTED_ROWS]:
+                values = ", ".join(
+                    "{}={!r}".format(name, column[row])
+                    for name, column in zip(names, all_columns)
+                )
+                lines.append("  row {}: {}".format(row, values))
+            if len(failed) > MAX_REPORTED_ROWS:
+                lines.append("  ... and {} more".format(
+                    len(failed) - MAX_REPORTED_ROWS
+                ))
+            raise VectorizedFailure("\n".join(lines), failed)
+
+        verify_chunk.__name__ = getattr(check, "__name__", "verify_chunk")
+        chunks = [
+            (start, min(start + self._chunk_size, size))
+            for start in range(0, size, self._chunk_size)
+        ]
+        self._funparam(verify_chunk).many(
+            chunks,
+            ids=[
+                "rows{}-{}".format(start, stop - 1) for start, stop in chunks
+            ],
+        )
@@ -0,0 +1,439 @@
+"""
+`--funparam-watch`: keep pytest resident, and re-run affected cases whenever
+a source file changes.
+
+The resident process only imports pytest and its plugins. Each run happens
+in a forked child, so it starts without interpreter startup or plugin
+loading, and still imports the test modules fresh. The resident process
+remembers, for every funparam case, a fingerprint of what it ran and whether
+it passed. The fingerprint covers the test function's source, the rest of
+its module (fixtures, helpers and constants, but not the other test
+functions), the verify function's code and the recorded arguments.
+
+When only test modules change, only those modules are collected again, and
+only the cases whose fingerprint changed (or that didn't pass last time) are
+run. When any other Python file changes, every case runs again, since there's
+no telling which ones depend on it.
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import CodeType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import pytest
+
+from pytest_funparam._dedup import call_fingerprint
+from pytest_funparam._items import (
+    funparam_group, is_funparam_item, parametrization_key,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.config import Config
+    from _pytest.nodes import Item
+    from _pytest.python import FunctionDefinition
+    from _pytest.reports import TestReport
+    from _pytest.terminal import TerminalReporter
+    from pytest_funparam._core import GenerateTestsFunparamFixture
+
+
+# How often to look for changed files, in seconds.
+POLL_INTERVAL = 0.2
+
+# Set in forked runs, which mustn't start watching themselves.
+_in_run = False
+
+# Directories that never hold the code under test.
+IGNORED_DIRECTORIES = {"__pycache__", "node_modules", "venv", "build", "dist"}
+
+# Mtime and size of each watched file, by path.
+FileState = Dict[str, Tuple[int, int]]
+
+
+def code_fingerprint(code: CodeType) -> str:
+    """
+    Hash what `code` does, but not where it is, so edits elsewhere in the
+    file (which move it to other lines) don't change its fingerprint.
+    """
+    digest = hashlib.sha1()
+
+    def update(code: CodeType) -> None:
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode())
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                update(const)
+            else:
+                digest.update(repr(const).encode())
+
+    update(code)
+    return digest.hexdigest()
+
+
+def function_fingerprint(function: Callable[..., Any]) -> str:
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return repr(function)
+    return code_fingerprint(code)
+
+
+def module_fingerprints(
+    source: str,
+    is_test: Callable[[str], bool],
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Fingerprint the top-level test functions of a module's `source`, and
+    everything else in it (fixtures, helpers, constants and imports)
+    together.
+
+    Like `code_fingerprint()`, these ignore line numbers and comments.
+    """
+    def fingerprint(text: str) -> str:
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    functions = {}
+    rest = []
+    for node in ast.parse(source).body:
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and is_test(node.name)
+        ):
+            functions[node.name] = fingerprint(ast.dump(node))
+        else:
+            rest.append(ast.dump(node))
+    return fingerprint("\n".join(rest)), functions
+
+
+def iter_source_files(root: Path) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(str(root)):
+        dirnames[:] = [
+            name for name in dirnames
+            if not name.startswith(".") and name not in IGNORED_DIRECTORIES
+        ]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                yield os.path.join(dirpath, filename)
+
+
+def scan(root: Path) -> FileState:
+    state = {}
+    for path in iter_source_files(root):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_files(before: FileState, after: FileState) -> Set[str]:
+    return {
+        path for path in set(before) | set(after)
+        if before.get(path) != after.get(path)
+    }
+
+
+class WatchPlugin:
+    """
+    Registered in each forked run, to skip the unchanged cases and report
+    back what happened.
+    """
+
+    def __init__(
+        self,
+        known: Dict[str, Tuple[Optional[str], bool]],
+        skip_unchanged: bool,
+        results_path: str,
+    ) -> None:
+        # The fingerprint of each case, and whether it passed, from earlier
+        # runs.
+        self.known = known
+        self.skip_unchanged = skip_unchanged
+        self.results_path = results_path
+        # `module_fingerprints()` of each test module, or `None` if it
+        # couldn't be parsed.
+        self.module_fingerprints: Dict[
+            str, Optional[Tuple[str, Dict[str, str]]]
+        ] = {}
+        # Fingerprints of the calls recorded by each dry run, by definition
+        # node id, parametrization and call number.
+        self.call_fingerprints: Dict[
+            Tuple[str, Hashable, int], Optional[str]
+        ] = {}
+        self.fingerprints: Dict[str, Optional[str]] = {}
+        self.passed: Dict[str, bool] = {}
+        self.modules: Set[str] = set()
+        self.unchanged = 0
+
+    def test_fingerprint(
+        self,
+        definition: "FunctionDefinition",
+    ) -> Optional[str]:
+        """
+        Fingerprint the source of the test function and of the rest of its
+        module, or return `None` if the test function can't be found in it.
+        """
+        module = definition.getparent(pytest.Module)
+        if module is None:
+            return None
+        path = str(module.fspath)
+        if path not in self.module_fingerprints:
+            is_test = getattr(
+                module, "funcnamefilter",
+                lambda name: name.startswith("test"),
+            )
+            try:
+                with open(path, "rb") as source_file:
+                    source = source_file.read().decode("utf-8")
+                self.module_fingerprints[path] = module_fingerprints(
+                    source, is_test,
+                )
+            except (OSError, SyntaxError, UnicodeDecodeError):
+                self.module_fingerprints[path] = None
+        fingerprints = self.module_fingerprints[path]
+        if fingerprints is None or definition.parent is not module:
+            # Test methods aren't fingerprinted on their own.
+            return None
+        rest, functions = fingerprints
+        function = functions.get(definition.name)
+        if function is None:
+            return None
+        return "{}:{}".format(rest, function)
+
+    def record_calls(
+        self,
+        definition: "FunctionDefinition",
+        dryrun_funparam: "GenerateTestsFunparamFixture",
+        parametrization: Hashable,
+    ) -> None:
+        test = self.test_fingerprint(definition)
+        for number, (key, args, kwargs, _, _) in enumerate(
+            dryrun_funparam.iter_calls()
+        ):
+            # The key is the verify function's `id()`, which changes from one
+            # run to the next, so leave it out of the arguments' fingerprint.
+            arguments = call_fingerprint(0, args, kwargs)
+            if test is None or arguments is None:
+                # Can't tell whether anything changed.
+                fingerprint = None
+            else:
+                verify = dryrun_funparam.verify_functions[key]
+                fingerprint = "{}:{}:{}".format(
+                    test, function_fingerprint(verify), arguments,
+                )
+            self.call_fingerprints[
+                (definition.nodeid, parametrization, number)
+            ] = fingerprint
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(
+        self,
+        config: "Config",
+        items: List["Item"],
+    ) -> None:
+        selected = []
+        deselected = []
+        for item in items:
+            self.modules.add(str(item.fspath))
+            if not is_funparam_item(item):
+                selected.append(item)
+                continue
+            callspec = getattr(item, "callspec")
+            fingerprint = self.call_fingerprints.get((
+                funparam_group(item.nodeid),
+                parametrization_key(callspec),
+                callspec.params["_funparam_call_number"],
+            ))
+            self.fingerprints[item.nodeid] = fingerprint
+            if (
+                self.skip_unchanged
+                and fingerprint is not None
+                and self.known.get(item.nodeid) == (fingerprint, True)
+            ):
+                deselected.append(item)
+                continue
+            selected.append(item)
+        if deselected:
+            self.unchanged = len(deselected)
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_runtest_logreport(self, report: "TestReport") -> None:
+        if report.nodeid not in self.fingerprints:
+            return
+        passed = self.passed.get(report.nodeid, True)
+        self.passed[report.nodeid] = passed and not report.failed
+
+    def pytest_sessionfinish(self) -> None:
+        results = {
+            nodeid: [self.fingerprints[nodeid], passed]
+            for nodeid, passed in self.passed.items()
+        }
+        with open(self.results_path, "w") as results_file:
+            json.dump(
+                {"results": results, "modules": sorted(self.modules)},
+                results_file,
+            )
+
+    def pytest_terminal_summary(
+        self,
+        terminalreporter: "TerminalReporter",
+    ) -> None:
+        if self.unchanged:
+            terminalreporter.write_line(
+                "funparam watch: {} unchanged case(s) not re-run".format(
+                    self.unchanged,
+                )
+            )
+
+
+class WatchRegistration:
+    """
+    Passed to `pytest.main()` in each forked run, to register the run's
+    `WatchPlugin` under the name the rest of funparam looks it up by.
+    """
+
+    def __init__(self, plugin: WatchPlugin) -> None:
+        self.plugin = plugin
+
+    def pytest_configure(self, config: "Config") -> None:
+        config.pluginmanager.register(self.plugin, "funparam-watch")
+
+
+def run_arguments(config: "Config") -> Tuple[List[str], List[str]]:
+    """
+    Return the command line arguments pytest was started with, minus
+    `--funparam-watch`, split into options and file or directory arguments.
+    """
+    invocation_params = getattr(config, "invocation_params", None)
+    if invocation_params is not None:
+        args = list(invocation_params.args)
+    else:
+        # pytest<5.1
+        args = sys.argv[1:]
+    args = [arg for arg in args if arg != "--funparam-watch"]
+    # The file or directory arguments are the positional ones pytest parsed;
+    # remove one occurrence of each, starting from the end, to be left with
+    # the options.
+    paths = list(config.getoption("file_or_dir") or [])
+    for path in reversed(paths):
+        for index in range(len(args) - 1, -1, -1):
+            if args[index] == path:
+                del args[index]
+                break
+    return args, paths
+
+
+class Watcher:
+    """
+    The resident process: runs pytest in a forked child on every change.
+    """
+
+    def __init__(self, config: "Config") -> None:
+        self.config = config
+        rootpath = getattr(config, "rootpath", None)
+        if rootpath is None:
+            # pytest<6.1
+            rootpath = config.rootdir  # type: ignore
+        self.root = Path(str(rootpath))
+        self.options, self.paths = run_arguments(config)
+        self.known: Dict[str, Tuple[Optional[str], bool]] = {}
+        self.test_modules: Set[str] = set()
+        self.directory = tempfile.mkdtemp(prefix="funparam-watch-")
+
+    def run_once(self, paths: List[str], skip_unchanged: bool) -> int:
+        global _in_run
+
+        results_path = os.path.join(self.directory, "results.json")
+        if os.path.exists(results_path):
+            os.remove(results_path)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            status = 3
+            try:
+                _in_run = True
+                plugin = WatchPlugin(self.known, skip_unchanged, results_path)
+                status = int(pytest.main(
+                    self.options + paths,
+                    plugins=[WatchRegistration(plugin)],
+                ))
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+        _, wait_status = os.waitpid(pid, 0)
+        try:
+            with open(results_path) as results_file:
+                results = json.load(results_file)
+        except (OSError, ValueError):
+            results = {"results": {}, "modules": []}
+        for nodeid, (fingerprint, passed) in results["results"].items():
+            self.known[nodeid] = (fingerprint, passed)
+        self.test_modules.update(results["modules"])
+        if os.WIFEXITED(wait_status):
+            return os.WEXITSTATUS(wait_status)
+        return 3
+
+    def wait_for_changes(self, state: FileState) -> Tuple[FileState, Set[str]]:
+        print(
+            "funparam watch: waiting for changes (Ctrl-C to stop)",
+            flush=True,
+        )
+        while True:
+            time.sleep(POLL_INTERVAL)
+            new_state = scan(self.root)
+            changed = changed_files(state, new_state)
+            if changed:
+                return new_state, changed
+
+    def watch(self) -> int:
+        status = 0
+        try:
+            state = scan(self.root)
+            status = self.run_once(self.paths, skip_unchanged=False)
+            while True:
+                state, changed = self.wait_for_changes(state)
+                if changed <= self.test_modules:
+                    args = sorted(
+                        path for path in changed if os.path.exists(path)
+                    )
+                    if not args:
+                        continue
+                    status = self.run_once(args, skip_unchanged=True)
+                else:
+                    status = self.run_once(self.paths, skip_unchanged=False)
+        except KeyboardInterrupt:
+            return status
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def watch(config: "Config") -> Optional[int]:
+    if _in_run:
+        # A forked run, with `--funparam-watch` in the ini file's addopts.
+        return None
+    if not hasattr(os, "fork"):
+        raise pytest.UsageError(
+            "--funparam-watch needs os.fork(), which this platform lacks"
+        )
+    return Watcher(config).watch()
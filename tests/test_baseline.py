@@ -0,0 +1,72 @@
+import pytest
+
+from pytest_funparam._baseline import find_regression
+
+
+SLOW_TEST = """\
+    import os
+    import time
+
+    def test_sleep(funparam):
+
+        @funparam
+        def verify_sleep(name):
+            if name == os.environ.get("SLOW_CASE"):
+                time.sleep(0.05)
+
+        verify_sleep("fast")
+        verify_sleep("slow")
+"""
+
+
+def test_find_regression_ignores_noise():
+    samples = [0.010, 0.011, 0.009]
+    assert find_regression(0.0105, samples, 0.2) is None
+    assert find_regression(0.050, samples, 0.2) is not None
+    # Without a baseline, nothing can regress.
+    assert find_regression(0.050, [], 0.2) is None
+
+
+def test_find_regression_ignores_tiny_slowdowns():
+    # Doubling a microsecond-long call is well within timer noise.
+    assert find_regression(0.000002, [0.000001], 0.2) is None
+
+
+def test_baseline_compare_reports(testdir, monkeypatch):
+    testdir.makepyfile(SLOW_TEST)
+
+    result = testdir.runpytest("--funparam-baseline=save")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(["funparam: saved baseline for 2 case(s)"])
+
+    monkeypatch.setenv("SLOW_CASE", "slow")
+    result = testdir.runpytest("--funparam-baseline=compare")
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines([
+        "*funparam performance regressions*",
+        "*test_sleep[[]1[]]: verify call took*",
+    ])
+    assert "test_sleep[0]:" not in result.stdout.str()
+
+
+@pytest.mark.parametrize("mode", ["compare", "save"])
+def test_baseline_without_history(testdir, mode):
+    testdir.makepyfile(SLOW_TEST)
+    result = testdir.runpytest("--funparam-baseline=" + mode)
+    result.assert_outcomes(passed=2)
+    assert "regressions" not in result.stdout.str()
+
+
+def test_baseline_compare_fail(testdir, monkeypatch):
+    testdir.makepyfile(SLOW_TEST)
+    testdir.runpytest("--funparam-baseline=save")
+
+    monkeypatch.setenv("SLOW_CASE", "slow")
+    result = testdir.runpytest(
+        "--funparam-baseline=compare",
+        "--funparam-baseline-fail",
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        "*funparam performance regression: verify call took*",
+    ])
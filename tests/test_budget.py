@@ -0,0 +1,78 @@
+import json
+import re
+
+import pytest
+
+
+SLOW_TEST = """\
+    def test_slow(funparam):
+
+        @funparam
+        def verify_sleep(num):
+            pass
+
+        for num in range(5):
+            verify_sleep(num)
+"""
+
+
+def passed_cases(result):
+    return re.findall(r"test_slow\[(\d+)\] PASSED", result.stdout.str())
+
+
+def test_budget_skips_and_resumes(testdir):
+    path = testdir.makepyfile(SLOW_TEST)
+    # The cases are quick, but earlier runs say the last three aren't, so
+    # they won't fit in the budget.
+    testdir.tmpdir.join("durations.json").write(json.dumps({
+        "{}::test_slow[{}]".format(path.basename, num): duration
+        for num, duration in enumerate([0.1, 0.1, 10.0, 10.0, 10.0])
+    }))
+    args = ("--funparam-budget=0.5s", "--funparam-durations=durations.json")
+
+    result = testdir.runpytest(*args, "-v")
+    assert passed_cases(result) == ["0", "1"]
+    result.assert_outcomes(passed=2, skipped=3)
+    result.stdout.fnmatch_lines([
+        "funparam: the 0.5s time budget ran out; skipped 3 case(s), "
+        "which will run first next time",
+    ])
+
+    # The cases that were left out run first next time.
+    result = testdir.runpytest(
+        "--funparam-budget=1h", "--funparam-durations=durations.json", "-v",
+    )
+    second = passed_cases(result)
+    assert second[:3] == ["2", "3", "4"]
+    assert sorted(second[3:]) == ["0", "1"]
+    assert "time budget ran out" not in result.stdout.str()
+
+
+def test_budget_runs_failures_first(testdir):
+    testdir.makepyfile("""\
+        def test_order(funparam):
+
+            @funparam
+            def verify(num):
+                assert num != 3
+
+            for num in range(5):
+                verify(num)
+    """)
+    testdir.runpytest("--funparam-budget=1h")
+
+    result = testdir.runpytest("--funparam-budget=1h", "-v")
+    result.assert_outcomes(passed=4, failed=1)
+    result.stdout.fnmatch_lines([
+        "*::test_order[[]3[]] FAILED*",
+        "*::test_order[[]0[]] PASSED*",
+    ])
+    assert "time budget ran out" not in result.stdout.str()
+
+
+@pytest.mark.parametrize("value", ["0", "-5s", "5x", "soon"])
+def test_budget_rejects_bad_values(testdir, value):
+    testdir.makepyfile(SLOW_TEST)
+    result = testdir.runpytest("--funparam-budget=" + value)
+    assert result.ret != 0
+    result.stderr.fnmatch_lines(["*expected a positive duration*"])
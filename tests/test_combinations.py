@@ -0,0 +1,87 @@
+import itertools
+
+import pytest
+
+from pytest_funparam._combinatorics import _covering_array, covering_array
+
+
+@pytest.mark.parametrize("sizes, strength", [
+    ([3, 3, 3, 3], 2),
+    ([2] * 10, 2),
+    ([4, 3, 5, 2, 3], 3),
+    ([5, 1, 4], 2),
+])
+def test_covering_array_covers_everything(sizes, strength):
+    rows = covering_array(sizes, strength)
+
+    for params in itertools.combinations(range(len(sizes)), strength):
+        covered = {tuple(row[param] for param in params) for row in rows}
+        assert covered == set(itertools.product(
+            *(range(sizes[param]) for param in params)
+        ))
+
+
+def test_covering_array_is_smaller_than_product():
+    assert len(covering_array([2] * 10, 2)) < 20
+    # ... unless the strength covers every parameter.
+    assert len(covering_array([2, 3], 2)) == 6
+
+
+def test_covering_array_edge_cases():
+    assert covering_array([], 2) == []
+    assert covering_array([3, 0, 2], 2) == []
+    with pytest.raises(ValueError, match="strength must be at least 1"):
+        covering_array([2, 2], 0)
+
+
+def test_covering_array_is_cached():
+    rows = covering_array([3] * 6, 3)
+    rows.append((0,) * 6)
+    hits = _covering_array.cache_info().hits
+    # Built once, and callers can't change the cached copy.
+    assert covering_array((3,) * 6, 3) == rows[:-1]
+    assert _covering_array.cache_info().hits == hits + 1
+
+
+def test_funparam_combinations(testdir):
+    testdir.makepyfile("""\
+        def test_pairs(funparam):
+
+            @funparam
+            def verify_types(a, b, c, d):
+                assert not (a == "x" and d is None)
+
+            verify_types.combinations(
+                a=["x", "y", "z"],
+                b=[1, 2, 3],
+                c=[True, False],
+                d=[None, 0, 1.5],
+            )
+    """)
+    items, _ = testdir.inline_genitems()
+    # A lot fewer than the 54 items of the full cross product.
+    assert len(items) < 15
+
+    result = testdir.runpytest()
+    # The covering array is deterministic, so the dry run and the test runs
+    # agree, and the one failing pair is found.
+    result.assert_outcomes(passed=len(items) - 1, failed=1)
+    result.stdout.fnmatch_lines(["*a = 'x', b = *, c = *, d = None*"])
+
+
+def test_funparam_combinations_with_marks(testdir):
+    testdir.makepyfile("""\
+        import pytest
+
+        def test_pairs(funparam):
+
+            @funparam
+            def verify_sum(a, b):
+                assert a + b > 0
+
+            verify_sum.marks(pytest.mark.skip).combinations(
+                a=[1, 2], b=[3, 4], strength=1,
+            )
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(skipped=2)
@@ -0,0 +1,64 @@
+DUPLICATES_TEST = """\
+    import pytest
+
+    def test_sums(funparam):
+
+        @funparam
+        def verify_sum(a, b, expected):
+            assert a + b == expected
+
+        @funparam
+        def verify_sum_again(a, b, expected):
+            assert a + b == expected
+
+        for _ in range(3):
+            verify_sum(1, 2, 3)
+            verify_sum(a=2, b=2, expected=4)
+        # Equal, but not the same values.
+        verify_sum(1.0, 2, 3)
+        verify_sum(True, 2, 3)
+        # A different verify function.
+        verify_sum_again(1, 2, 3)
+        # Singled out on purpose.
+        verify_sum.id("again")(1, 2, 3)
+        verify_sum.marks(pytest.mark.skip)(1, 2, 3)
+"""
+
+
+def test_dedup_collapses_duplicates(testdir):
+    testdir.makepyfile(DUPLICATES_TEST)
+    result = testdir.runpytest("--funparam-dedup", "-v")
+    result.assert_outcomes(passed=6, skipped=1)
+    result.stdout.fnmatch_lines([
+        "*::test_sums[[]0[]] PASSED*",
+        "*::test_sums[[]1[]] PASSED*",
+        "*::test_sums[[]6[]] PASSED*",
+        "*::test_sums[[]7[]] PASSED*",
+        "*::test_sums[[]8[]] PASSED*",
+        "*::test_sums[[]again[]] PASSED*",
+        "*::test_sums[[]10[]] SKIPPED*",
+        "funparam: collapsed 4 duplicate case(s) in 1 test(s)",
+    ])
+
+
+def test_dedup_is_opt_in(testdir):
+    testdir.makepyfile(DUPLICATES_TEST)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=10, skipped=1)
+    assert "collapsed" not in result.stdout.str()
+
+
+def test_dedup_keeps_unpicklable_arguments(testdir):
+    testdir.makepyfile("""\
+        def test_lambdas(funparam):
+
+            @funparam
+            def verify_callable(func):
+                assert callable(func)
+
+            func = lambda: None
+            verify_callable(func)
+            verify_callable(func)
+    """)
+    result = testdir.runpytest("--funparam-dedup")
+    result.assert_outcomes(passed=2)
@@ -0,0 +1,57 @@
+def test_dryrun_flag(testdir):
+    testdir.makepyfile("""\
+        def build_big_input():
+            raise AssertionError("built during the dry run")
+
+        def test_big(funparam):
+            if funparam.dryrun:
+                big = None
+            else:
+                big = build_big_input()
+
+            @funparam
+            def verify_big(index):
+                assert big[index]
+
+            verify_big(0)
+            verify_big(1)
+    """)
+    result = testdir.runpytest()
+    # Collection works, and the real runs still build the input.
+    result.assert_outcomes(failed=2)
+    result.stdout.fnmatch_lines(["*built during the dry run*"])
+
+
+def test_slow_dryrun_warns(testdir):
+    testdir.makepyfile("""\
+        import time
+
+        def test_slow(funparam):
+            time.sleep(0.05)
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+
+        def test_fast(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+    """)
+    result = testdir.runpytest("--funparam-dryrun-warn=0.04")
+    outcomes = result.parseoutcomes()
+    assert outcomes["passed"] == 2
+    # "warning" or "warnings", depending on the pytest version.
+    assert outcomes.get("warnings", outcomes.get("warning")) == 1
+    result.stdout.fnmatch_lines([
+        "*FunparamDryRunWarning: The funparam dry run of "
+        "test_slow_dryrun_warns.py::test_slow took *s.*",
+    ])
+
+    result = testdir.runpytest("--funparam-dryrun-warn=0")
+    result.assert_outcomes(passed=2)
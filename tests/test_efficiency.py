@@ -0,0 +1,93 @@
+import re
+
+from pytest_funparam._efficiency import GroupTimes
+
+
+EFFICIENCY_TEST = """\
+    import time
+
+    import pytest
+
+    @pytest.fixture
+    def slow_fixture():
+        time.sleep(0.02)
+
+    def test_wasteful(funparam, slow_fixture):
+        time.sleep(0.02)
+
+        @funparam
+        def verify_fast(num):
+            pass
+
+        for num in range(3):
+            verify_fast(num)
+
+    def test_efficient(funparam):
+
+        @funparam
+        def verify_slow(num):
+            time.sleep(0.02)
+
+        for num in range(3):
+            verify_slow(num)
+
+    def test_plain():
+        pass
+"""
+
+
+def test_overhead_share():
+    times = GroupTimes()
+    assert times.overhead_share == 0.0
+    times.dryrun = 1.0
+    times.body = 2.0
+    times.fixtures = 1.0
+    times.verify = 4.0
+    assert times.overhead == 4.0
+    assert times.overhead_share == 0.5
+
+
+def test_efficiency_report(testdir):
+    testdir.makepyfile(EFFICIENCY_TEST)
+    result = testdir.runpytest("--funparam-efficiency")
+    result.assert_outcomes(passed=7)
+    result.stdout.fnmatch_lines([
+        "*funparam efficiency*",
+        "*::test_wasteful: 3 case(s), *% overhead: dry run *s, body *s, "
+        "fixtures *s; verify *s",
+        "*::test_efficient: 3 case(s), *",
+    ])
+    assert "test_plain" not in result.stdout.str().split("efficiency")[-1]
+
+    line = next(
+        line for line in result.outlines if "::test_wasteful:" in line
+    )
+    match = re.search(r"dry run (\S+)s, body (\S+)s, fixtures (\S+)s", line)
+    assert match is not None
+    dryrun, body, fixtures = (float(value) for value in match.groups())
+    # The dry run sleeps once, the body once per case, and the fixture is
+    # set up for every case (but not for the dry run).
+    assert dryrun >= 0.02
+    assert body >= 0.06
+    assert fixtures >= 0.06
+
+
+def test_efficiency_report_top(testdir):
+    testdir.makepyfile("\n".join(
+        """\
+        def test_{}(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+        """.format(index)
+        for index in range(12)
+    ))
+    result = testdir.runpytest("--funparam-efficiency")
+    result.stdout.fnmatch_lines([
+        "(2 more test(s) not shown, use -v to show them)",
+    ])
+    result = testdir.runpytest("--funparam-efficiency", "-v")
+    assert "not shown" not in result.stdout.str()
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from pytest_funparam._files import FileRows
+
+
+def test_csv_rows(tmp_path):
+    path = tmp_path / "cases.csv"
+    path.write_bytes(b'a,b,expected\r\n1,2,3\r\n\r\n"4",",",x\r\n')
+
+    rows = FileRows(path)
+    assert len(rows) == 2
+    assert rows[0] == {"a": "1", "b": "2", "expected": "3"}
+    assert rows[-1] == {"a": "4", "b": ",", "expected": "x"}
+    assert rows[:1] == [rows[0]]
+    with pytest.raises(IndexError):
+        rows[2]
+    rows.close()
+
+    assert list(FileRows(path, header=False))[0] == ["a", "b", "expected"]
+
+
+def test_jsonl_rows(tmp_path):
+    path = tmp_path / "cases.data"
+    path.write_text('{"a": 1}\n[1, 2]\n"no trailing newline"')
+
+    rows = FileRows(path, format="jsonl")
+    assert list(rows) == [{"a": 1}, [1, 2], "no trailing newline"]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("")
+    assert len(FileRows(path)) == 0
+
+
+def test_reindexes_changed_files(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("[1]\n")
+    assert len(FileRows(path)) == 1
+
+    path.write_text("[1]\n[2]\n")
+    stat = path.stat()
+    # Make sure the modification time moves, even on coarse filesystems.
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert len(FileRows(path)) == 2
+
+
+@pytest.mark.parametrize("name, format, message", [
+    ("cases.txt", None, "Can't tell the format*"),
+    ("cases.csv", "xml", "Unsupported format 'xml'*"),
+])
+def test_bad_formats(tmp_path, name, format, message):
+    path = tmp_path / name
+    path.write_text("")
+    with pytest.raises(ValueError) as excinfo:
+        FileRows(path, format)
+    excinfo.match(message.replace("*", ".*").replace("(", r"\("))
+
+
+def test_funparam_from_file(testdir):
+    testdir.makefile(
+        ".jsonl",
+        cases='{"a": 1, "b": 2, "expected": 3}\n'
+        '[2, 2, 5]\n'
+        '{"a": 4, "b": 2, "expected": 6}\n',
+    )
+    testdir.makepyfile("""\
+        def test_sums(funparam):
+
+            @funparam
+            def verify_sum(a, b, expected):
+                assert a + b == expected
+
+            verify_sum.many(funparam.from_file("cases.jsonl"))
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines(["*a = 2, b = 2, expected = 5*"])
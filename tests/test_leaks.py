@@ -0,0 +1,82 @@
+from pytest_funparam._leaks import MIN_GROWTH, combined_growth, fit_growth
+
+
+LEAKY_TEST = """\
+    LEAKED = []
+
+    def process(num):
+        LEAKED.append(bytearray(20000))
+        return num
+
+    def test_leaky(funparam):
+
+        @funparam
+        def verify_process(num):
+            assert process(num) == num
+
+        for num in range(40):
+            verify_process(num)
+
+    def test_tidy(funparam):
+
+        @funparam
+        def verify_sum(num):
+            assert sum([bytearray(20000)][0]) == 0
+
+        for num in range(40):
+            verify_sum(num)
+"""
+
+
+def test_fit_growth():
+    steady = [(index, 1000000 + index * 5000) for index in range(0, 40, 5)]
+    assert fit_growth(steady) == 5000
+    flat = [(index, 1000000 + index % 2) for index in range(0, 40, 5)]
+    assert fit_growth(flat) is None
+    tiny = [(index, index * (MIN_GROWTH // 2)) for index in range(10)]
+    assert fit_growth(tiny) is None
+    assert fit_growth(steady[:2]) is None
+
+
+def test_combined_growth_fits_each_worker():
+    # Two workers with different baselines, each growing 5000 bytes per
+    # case. Merged into one series, they'd look like noise.
+    by_worker = {
+        "gw0": [
+            (index, 1000000 + index * 5000, None) for index in range(0, 40, 5)
+        ],
+        "gw1": [
+            (index, 9000000 + index * 5000, None) for index in range(0, 20, 5)
+        ],
+    }
+    merged = sorted(
+        (index, traced) for samples in by_worker.values()
+        for index, traced, _ in samples
+    )
+    assert fit_growth(merged) is None
+    assert combined_growth(by_worker) == (5000, None, 2, 52)
+
+    by_worker["gw1"] = [(index, 9000000, None) for index in range(0, 20, 5)]
+    assert combined_growth(by_worker) == (5000, None, 1, 36)
+    assert combined_growth({"gw1": by_worker["gw1"]}) is None
+
+
+def test_leak_check_reports_growth(testdir):
+    testdir.makepyfile(LEAKY_TEST)
+    result = testdir.runpytest(
+        "--funparam-leak-check", "--funparam-leak-sample=5",
+    )
+    result.assert_outcomes(passed=80)
+    result.stdout.fnmatch_lines([
+        "*funparam memory growth*",
+        "*::test_leaky: traced memory grew 19.* KiB per case over 40 case(s)*",
+        "    *test_leak_check_reports_growth.py:4: +* KiB in +* block(s)",
+    ])
+    assert "test_tidy:" not in result.stdout.str()
+
+
+def test_leak_check_off_by_default(testdir):
+    testdir.makepyfile(LEAKY_TEST)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=80)
+    assert "memory growth" not in result.stdout.str()
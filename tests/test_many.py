@@ -0,0 +1,135 @@
+import pytest
+
+
+def test_many_sequence(testdir):
+    testdir.makepyfile("""\
+        def test_sums(funparam):
+
+            @funparam
+            def verify_sum(a, b, expected):
+                assert a + b == expected
+
+            verify_sum(0, 0, 0)
+            verify_sum.many([
+                (1, 2, 3),
+                (2, 2, 5),
+                {"a": 4, "b": 2, "expected": 6},
+            ])
+            verify_sum(1, 1, 2)
+    """)
+    result = testdir.runpytest("-v")
+    result.assert_outcomes(passed=4, failed=1)
+    result.stdout.fnmatch_lines([
+        "*::test_sums[[]0[]] PASSED*",
+        "*::test_sums[[]1[]] PASSED*",
+        "*::test_sums[[]2[]] FAILED*",
+        "*::test_sums[[]3[]] PASSED*",
+        "*::test_sums[[]4[]] PASSED*",
+    ])
+
+
+def test_many_indexes_rows_directly(testdir):
+    testdir.makepyfile("""\
+        import pytest
+        from collections.abc import Sequence
+
+        class Rows(Sequence):
+            def __init__(self, count):
+                self.count = count
+
+            def __len__(self):
+                return self.count
+
+            def __getitem__(self, index):
+                if not 0 <= index < self.count:
+                    raise IndexError(index)
+                return (index,)
+
+            def __iter__(self):
+                # Iterating would be O(n) for every test run. Make sure it's
+                # never done.
+                raise AssertionError("iterated over rows")
+
+        def test_rows(funparam):
+            rows = Rows(200)
+
+            @funparam
+            def verify_row(index):
+                assert index == 198
+
+            verify_row.id("only").marks(pytest.mark.skip).many(
+                rows, ids=lambda row: "case{}".format(*row),
+            )
+            verify_row.many(rows)
+    """)
+    items, _ = testdir.inline_genitems()
+    assert items[0].name == "test_rows[case0]"
+    assert len(items) == 400
+
+    result = testdir.runpytest("-k", "not case")
+    result.assert_outcomes(passed=1, failed=199)
+
+
+def test_many_iterator(testdir):
+    testdir.makepyfile("""\
+        def test_iterator(funparam):
+
+            @funparam
+            def verify_even(num):
+                assert num % 2 == 0
+
+            verify_even.many(
+                ((num,) for num in range(6)),
+                ids=["zero", "one", "two", "three", "four", "five"],
+            )
+            verify_even(8)
+    """)
+    result = testdir.runpytest("-v")
+    result.assert_outcomes(passed=4, failed=3)
+    result.stdout.fnmatch_lines([
+        "*::test_iterator[[]zero[]] PASSED*",
+        "*::test_iterator[[]one[]] FAILED*",
+        "*::test_iterator[[]five[]] FAILED*",
+        "*::test_iterator[[]6[]] PASSED*",
+    ])
+
+
+@pytest.mark.parametrize("rows", ["[(1,)]", "iter([(1,)])"])
+def test_many_cannot_nest(testdir, rows):
+    testdir.makepyfile("""\
+        def test_nested(funparam):
+
+            @funparam
+            def verify_one(num):
+                assert num == 1
+
+            @funparam
+            def verify_all(rows):
+                verify_one.many(rows)
+
+            verify_all(%s)
+    """ % rows)
+    result = testdir.runpytest()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "*Cannot nest functions decorated with 'funparam'*",
+    ])
+
+
+@pytest.mark.parametrize("ids", ['["a", "b"]', '["a", "b", "c", "d"]'])
+def test_many_ids_must_match_rows(testdir, ids):
+    testdir.makepyfile("""\
+        def test_ids(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify.many([(1,), (2,), (3,)], ids=%s)
+    """ % ids)
+    result = testdir.runpytest()
+    assert result.ret != 0
+    result.stdout.fnmatch_lines([
+        "*ValueError: many() got {} id(s) for 3 row(s); pass one id per "
+        "row".format(ids.count(",") + 1),
+    ])
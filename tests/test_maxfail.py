@@ -0,0 +1,60 @@
+import pytest
+from textwrap import dedent
+
+
+MAXFAIL_TEST = """\
+    def test_all_fail(funparam):
+
+        @funparam
+        def verify_positive(num):
+            assert num > 0
+
+        for num in range(-10, 0):
+            verify_positive(num)
+
+    def test_other(funparam):
+
+        @funparam
+        def verify_negative(num):
+            assert num < 0
+
+        verify_negative(-1)
+        verify_negative(1)
+        verify_negative(-2)
+"""
+
+
+def test_maxfail_per_test_option(testdir):
+    testdir.makepyfile(MAXFAIL_TEST)
+    result = testdir.runpytest("--funparam-maxfail-per-test=3", "-rs")
+    # The other test keeps running, even past its own failure.
+    result.assert_outcomes(failed=4, passed=2, skipped=7)
+    result.stdout.fnmatch_lines([
+        "*funparam maxfail per test*",
+        "*::test_all_fail: skipped 7 remaining case(s)",
+        "*short test summary info*",
+        "SKIPPED [[]7[]] test_maxfail_per_test_option.py:1: funparam: "
+        "*::test_all_fail reached 3 failure(s); skipping its remaining cases",
+    ])
+
+
+def test_maxfail_marker(testdir):
+    testdir.makepyfile(
+        "import pytest\n"
+        "pytestmark = pytest.mark.funparam_maxfail(1)\n"
+        + dedent(MAXFAIL_TEST)
+    )
+    result = testdir.runpytest()
+    result.assert_outcomes(failed=2, passed=1, skipped=10)
+
+
+@pytest.mark.parametrize("args", [(), ("-p", "no:cacheprovider")])
+def test_no_limit_by_default(testdir, args):
+    testdir.makepyfile(MAXFAIL_TEST)
+    result = testdir.runpytest(*args)
+    result.assert_outcomes(failed=11, passed=2)
+    # Without a limit, failures aren't counted in the run's scratch
+    # directory.
+    assert not testdir.tmpdir.join(
+        ".pytest_cache", "d", "funparam-runs"
+    ).check()
@@ -0,0 +1,182 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_funparam._memo import MemoPlugin
+
+
+MEMO_TEST = """\
+    import pytest
+
+    calls = []
+
+    def build_reference():
+        calls.append(1)
+        return {num: num * num for num in range(3)}
+
+    @pytest.fixture
+    def reference(funparam):
+        return funparam.memo("reference", build_reference)
+
+    def test_squares(funparam, reference):
+
+        @funparam
+        def verify_square(num):
+            assert reference[num] == num * num
+
+        for num in range(3):
+            verify_square(num)
+
+    def test_again(funparam):
+        # A different test function doesn't share the memoized values.
+        assert funparam.memo("reference", lambda: "other") == "other"
+
+        @funparam
+        def verify(num):
+            pass
+
+        verify(1)
+
+    def test_calls():
+        # Once for the dry run, and once for all of `test_squares`'s items.
+        assert len(calls) == 2
+"""
+
+
+def test_memo_shares_values(testdir):
+    testdir.makepyfile(MEMO_TEST)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=5)
+
+
+def test_memo_releases_finished_groups(testdir):
+    testdir.makepyfile("""\
+        import weakref
+
+        class Reference:
+            pass
+
+        refs = []
+
+        def test_first(funparam):
+            value = funparam.memo("key", Reference)
+            refs.append(weakref.ref(value))
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+            verify(2)
+
+        def test_check():
+            # The dry run's value, then the one shared by both items.
+            assert len(refs) == 3
+            assert refs[1]() is refs[2]() is None
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
+
+
+def test_memo_evicts_least_recently_used(testdir):
+    testdir.makeini("""\
+        [pytest]
+        funparam_memo_groups = 1
+    """)
+    testdir.makepyfile("""\
+        import pytest
+
+        calls = []
+
+        def count_call():
+            calls.append(1)
+            return len(calls)
+
+        @pytest.fixture
+        def value(funparam):
+            value = funparam.memo("key", count_call)
+            if not funparam.dryrun:
+                print("VALUE", value)
+            return value
+
+        def test_a(funparam, value):
+            @funparam
+            def verify(num):
+                pass
+            verify(1)
+            verify(2)
+
+        def test_b(funparam, value):
+            @funparam
+            def verify(num):
+                pass
+            verify(1)
+            verify(2)
+    """)
+    # Interleave the siblings, so every item evicts the other group.
+    result = testdir.runpytest(
+        "test_memo_evicts_least_recently_used.py::test_a[0]",
+        "test_memo_evicts_least_recently_used.py::test_b[0]",
+        "test_memo_evicts_least_recently_used.py::test_a[1]",
+        "test_memo_evicts_least_recently_used.py::test_b[1]",
+        "-s",
+    )
+    result.assert_outcomes(passed=4)
+    # The two dry runs come first. After that, each item had to recompute
+    # the value its sibling memoized.
+    result.stdout.fnmatch_lines([
+        "*VALUE 3*",
+        "*VALUE 4*",
+        "*VALUE 5*",
+        "*VALUE 6*",
+    ])
+
+
+def test_memo_per_parametrization(testdir):
+    testdir.makepyfile("""\
+        import pytest
+
+        @pytest.mark.parametrize("n", [1, 2])
+        def test_repeated(funparam, n):
+            data = funparam.memo("data", lambda: [n] * n)
+
+            @funparam
+            def verify(index):
+                assert data == [n] * n
+
+            for index in range(n):
+                verify(index)
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
+
+
+def test_memo_worker_releases_when_moving_on():
+    def make_item(nodeid, number):
+        return SimpleNamespace(nodeid=nodeid, callspec=SimpleNamespace(
+            params={"_funparam_call_number": number},
+            indices={"_funparam_call_number": number},
+        ))
+
+    config = SimpleNamespace(workerinput={}, getini=lambda name: "8")
+    plugin = MemoPlugin(config)
+    first, second = make_item("t.py::a[0]", 0), make_item("t.py::a[1]", 1)
+    other = make_item("t.py::b[0]", 0)
+    # A worker runs only some of the items it collects, so it doesn't count
+    # them.
+    plugin.pytest_collection_finish(
+        SimpleNamespace(items=[first, second, other])
+    )
+    assert plugin.remaining == {}
+
+    def teardown(item, nextitem):
+        hook = plugin.pytest_runtest_teardown(item, nextitem)
+        next(hook)
+        with pytest.raises(StopIteration):
+            next(hook)
+
+    assert plugin.get("t.py::a()", "key", lambda: 1) == 1
+    teardown(first, second)
+    assert "t.py::a()" in plugin.groups
+    teardown(second, other)
+    assert "t.py::a()" not in plugin.groups
@@ -0,0 +1,104 @@
+import json
+
+
+def test_longest_first(testdir):
+    testdir.makepyfile("""\
+        import time
+
+        def test_plain():
+            pass
+
+        def test_sleep(funparam):
+
+            @funparam
+            def verify_sleep(seconds):
+                time.sleep(seconds)
+
+            verify_sleep.id("short")(0.0)
+            verify_sleep.id("long")(0.05)
+            verify_sleep.id("medium")(0.02)
+    """)
+    testdir.runpytest("--funparam-order=longest-first")
+    # A case the earlier run never saw.
+    testdir.makepyfile("""\
+        import time
+
+        def test_plain():
+            pass
+
+        def test_sleep(funparam):
+
+            @funparam
+            def verify_sleep(seconds):
+                time.sleep(seconds)
+
+            verify_sleep.id("short")(0.0)
+            verify_sleep.id("long")(0.05)
+            verify_sleep.id("medium")(0.02)
+            verify_sleep.id("new")(0.0)
+    """)
+
+    result = testdir.runpytest(
+        "--funparam-order=longest-first", "--collect-only", "-q"
+    )
+    result.stdout.fnmatch_lines([
+        "*::test_plain",
+        "*::test_sleep[[]new[]]",
+        "*::test_sleep[[]long[]]",
+        "*::test_sleep[[]medium[]]",
+        "*::test_sleep[[]short[]]",
+    ])
+
+
+def test_collection_order_by_default(testdir):
+    testdir.makepyfile("""\
+        def test_it(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+            verify(2)
+    """)
+    result = testdir.runpytest("--collect-only", "-q")
+    result.stdout.fnmatch_lines([
+        "*::test_it[[]0[]]",
+        "*::test_it[[]1[]]",
+    ])
+
+
+DURATIONS_TEST = """\
+    def test_it(funparam):
+
+        @funparam
+        def verify(num):
+            pass
+
+        for num in range({count}):
+            verify(num)
+"""
+
+
+def test_durations_only_recorded_when_used(testdir):
+    testdir.makepyfile(DURATIONS_TEST.format(count=2))
+    testdir.runpytest()
+    config = testdir.parseconfigure()
+    assert config.cache.get("funparam/durations", None) is None
+
+
+def test_durations_drop_stale_cases(testdir):
+    path = testdir.tmpdir.join("durations.json")
+    testdir.makepyfile(DURATIONS_TEST.format(count=3))
+    testdir.runpytest("--funparam-durations=durations.json")
+    assert sorted(
+        nodeid.split("::")[-1] for nodeid in json.loads(path.read())
+    ) == ["test_it[0]", "test_it[1]", "test_it[2]"]
+
+    testdir.makepyfile(DURATIONS_TEST.format(count=2))
+    # Deselected cases keep their durations, but the ones that are gone
+    # don't.
+    testdir.runpytest("--funparam-durations=durations.json", "-k", "0")
+    assert sorted(
+        nodeid.split("::")[-1] for nodeid in json.loads(path.read())
+    ) == ["test_it[0]", "test_it[1]"]
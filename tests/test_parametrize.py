@@ -0,0 +1,110 @@
+DEPENDENT_TEST = """\
+    import pytest
+
+    {marker}
+    @pytest.mark.parametrize('count', [1, 3, 3])
+    def test_count(count, funparam):
+        if funparam.dryrun:
+            with open("dryruns.txt", "a") as dryruns:
+                dryruns.write("{{}}\\n".format(count))
+
+        @funparam
+        def verify_below(num):
+            assert num < count
+
+        for num in range(count):
+            verify_below(num)
+"""
+
+
+def dryrun_counts(testdir):
+    return testdir.tmpdir.join("dryruns.txt").read().split()
+
+
+def test_call_count_depends_on_parameter(testdir):
+    testdir.makepyfile(DEPENDENT_TEST.format(marker=""))
+    result = testdir.runpytest("--collect-only", "-q")
+    result.stdout.fnmatch_lines([
+        "*test_count[[]0-1[]]",
+        # Duplicate ids get a suffix: "3_1" since pytest 7.4, "31" before.
+        "*test_count[[]2-3*1[]]",
+        "*7 tests collected*",
+    ])
+    # The funparam call number comes before the `pytest.mark.parametrize`
+    # ids, as it did before the dry run had to wait for them.
+    assert "test_count[1-0]" not in result.stdout.str()
+    assert "test_count[1-1]" not in result.stdout.str()
+
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=7)
+
+
+def test_call_number_id_follows_fixture_params(testdir):
+    testdir.makepyfile("""\
+        import pytest
+
+        @pytest.fixture(params=["fa", "fb"])
+        def fixture_param(request):
+            return request.param
+
+        def test_fixture(fixture_param, funparam):
+            @funparam
+            def verify(a):
+                pass
+
+            verify(1)
+
+        @pytest.mark.parametrize("mark_param", ["ma"])
+        def test_both(fixture_param, mark_param, funparam):
+            @funparam
+            def verify(a):
+                pass
+
+            verify(1)
+    """)
+    result = testdir.runpytest("--collect-only", "-q")
+    result.stdout.fnmatch_lines([
+        "*test_fixture[[]fa-0[]]",
+        "*test_fixture[[]fb-0[]]",
+        "*test_both[[]fa-0-ma[]]",
+        "*test_both[[]fb-0-ma[]]",
+        "*4 tests collected*",
+    ])
+
+
+def test_equal_parameters_share_a_dryrun(testdir):
+    testdir.makepyfile(DEPENDENT_TEST.format(marker=""))
+    testdir.runpytest("--collect-only")
+    assert dryrun_counts(testdir) == ["1", "3"]
+
+
+def test_static_marker_does_one_dryrun(testdir):
+    testdir.makepyfile(
+        DEPENDENT_TEST.format(marker="@pytest.mark.funparam_static")
+    )
+    result = testdir.runpytest()
+    assert dryrun_counts(testdir) == ["1"]
+    # The single dry run only saw one call, so that's all anybody gets.
+    result.assert_outcomes(passed=3)
+
+
+def test_indirect_parameters(testdir):
+    testdir.makepyfile("""\
+        import pytest
+
+        @pytest.fixture
+        def letters(request):
+            return request.param * 2
+
+        @pytest.mark.parametrize('letters', ['a', 'b'], indirect=True)
+        def test_letters(letters, funparam):
+
+            @funparam
+            def verify_doubled(value):
+                assert value[0] == value[1]
+
+            verify_doubled(letters)
+            verify_doubled(letters.upper())
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=4)
@@ -0,0 +1,71 @@
+import pytest
+
+
+REAL_FIXTURE_TEST = """\
+    import pytest
+
+    setups = []
+    teardowns = []
+
+    @pytest.fixture(scope="session")
+    def dataset_path():
+        return "dataset"
+
+    @pytest.fixture(scope="session")
+    def some_strings(dataset_path):
+        setups.append(dataset_path)
+        yield ["bar", "baz", "foo"]
+        teardowns.append(dataset_path)
+
+    def test_strings_start_with_b(funparam, some_strings):
+
+        @funparam
+        def verify_startswith_b(some_str):
+            assert some_str.startswith("b")
+
+        for some_str in some_strings:
+            verify_startswith_b(some_str)
+
+    def test_computed_once():
+        assert setups == ["dataset"]
+        assert teardowns == []
+"""
+
+
+def test_real_fixture_generates_cases(testdir):
+    testdir.makeini("""\
+        [pytest]
+        funparam_dryrun_fixtures = some_strings dataset_path
+    """)
+    testdir.makepyfile(REAL_FIXTURE_TEST)
+    result = testdir.runpytest("-v")
+    result.assert_outcomes(passed=3, failed=1)
+    result.stdout.fnmatch_lines([
+        "*::test_strings_start_with_b[[]0[]] PASSED*",
+        "*::test_strings_start_with_b[[]1[]] PASSED*",
+        "*::test_strings_start_with_b[[]2[]] FAILED*",
+    ])
+
+
+def test_without_opting_in(testdir):
+    testdir.makepyfile(REAL_FIXTURE_TEST)
+    result = testdir.runpytest("-k", "test_strings_start_with_b")
+    # The MagicMock stand-in doesn't produce any cases.
+    result.assert_outcomes(skipped=1)
+
+
+@pytest.mark.parametrize("fixtures, message", [
+    ("some_strings", "*requests 'dataset_path', which isn't listed*"),
+    ("some_strings dataset_path tmp_path",
+     "*'tmp_path' is function-scoped*"),
+])
+def test_real_fixture_errors(testdir, fixtures, message):
+    testdir.makeini("""\
+        [pytest]
+        funparam_dryrun_fixtures = {}
+    """.format(fixtures))
+    testdir.makepyfile(REAL_FIXTURE_TEST.replace(
+        "(funparam, some_strings)", "(funparam, some_strings, tmp_path)"
+    ))
+    result = testdir.runpytest()
+    result.stdout.fnmatch_lines(["*RealFixtureError*", message])
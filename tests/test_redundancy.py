@@ -0,0 +1,79 @@
+from pytest_funparam._redundancy import covering_subset
+
+
+REDUNDANT_TEST = """\
+    def classify(num):
+        if num < 0:
+            return "negative"
+        if num == 0:
+            return "zero"
+        return "positive"
+
+    def test_classify(funparam):
+
+        @funparam
+        def verify_classify(num, expected):
+            assert classify(num) == expected
+
+        verify_classify(-1, "negative")
+        verify_classify(1, "positive")
+        verify_classify(-5, "negative")
+        verify_classify(0, "zero")
+        verify_classify(7, "positive")
+"""
+
+
+def test_covering_subset():
+    cases = {
+        "a": frozenset({1, 2}),
+        "b": frozenset({1, 2, 3}),
+        "c": frozenset({4}),
+        "d": frozenset({3}),
+    }
+    assert covering_subset(cases) == ["b", "c"]
+    assert covering_subset({}) == []
+
+
+def test_redundancy_report(testdir):
+    testdir.makepyfile(REDUNDANT_TEST)
+    result = testdir.runpytest(
+        "--funparam-redundancy",
+        "--funparam-redundancy-output=subset.txt",
+        "-v",
+    )
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines([
+        "*funparam redundancy*",
+        "*::test_classify: 5 case(s), 2 with the same coverage as another, "
+        "3 cover everything",
+        "  same as *::test_classify[[]0[]]: *::test_classify[[]2[]]",
+        "  same as *::test_classify[[]1[]]: *::test_classify[[]4[]]",
+        "funparam: wrote covering cases to subset.txt",
+    ])
+    subset = testdir.tmpdir.join("subset.txt").read().splitlines()
+    assert sorted(nodeid.split("::")[-1] for nodeid in subset) == [
+        "test_classify[0]", "test_classify[1]", "test_classify[3]",
+    ]
+
+    # The subset file can be handed straight back to pytest.
+    result = testdir.runpytest(*subset)
+    result.assert_outcomes(passed=3)
+
+
+def test_redundancy_ignores_failures(testdir):
+    testdir.makepyfile("""\
+        def test_fails(funparam):
+
+            @funparam
+            def verify(num):
+                assert num == 1
+
+            verify(1)
+            verify(2)
+    """)
+    result = testdir.runpytest("--funparam-redundancy")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        "*::test_fails: 1 case(s), 0 with the same coverage as another, "
+        "1 cover everything",
+    ])
@@ -0,0 +1,93 @@
+import csv
+import xml.etree.ElementTree as ET
+
+
+MANY_CASES_TEST = """\
+    import pytest
+
+    def test_many(funparam):
+
+        @funparam
+        def verify_small(num):
+            assert num < 8
+
+        for num in range(10):
+            verify_small(num)
+        verify_small.marks(pytest.mark.skip)(0)
+
+    def test_plain():
+        pass
+"""
+
+
+def test_compact_progress(testdir):
+    testdir.makepyfile(MANY_CASES_TEST)
+    result = testdir.runpytest("--funparam-compact")
+    result.assert_outcomes(passed=9, failed=2, skipped=1)
+    result.stdout.fnmatch_lines([
+        "test_compact_progress.py .FF. *[[]100%[]]",
+        # Failures are still reported in full.
+        "*_ test_many[[]8[]] _*",
+        "*assert 8 < 8*",
+        "*_ test_many[[]9[]] _*",
+        "funparam: 8 passed or skipped case(s) not shown individually",
+    ])
+
+
+def test_compact_verbose(testdir):
+    testdir.makepyfile(MANY_CASES_TEST)
+    result = testdir.runpytest("--funparam-compact", "-v")
+    result.assert_outcomes(passed=9, failed=2, skipped=1)
+    # Every case that's started gets its status, rather than a bare node id.
+    result.stdout.fnmatch_lines([
+        "*::test_many[[]0[]] PASSED*",
+        "*::test_many[[]1[]] PASSED*",
+        "*::test_many[[]8[]] FAILED*",
+        "*::test_many[[]10[]] SKIPPED*",
+        "*::test_plain PASSED*",
+    ])
+    assert result.stdout.str().count(" PASSED ") == 9
+    assert "not shown individually" not in result.stdout.str()
+
+
+def test_compact_junitxml(testdir):
+    testdir.makepyfile(MANY_CASES_TEST)
+    result = testdir.runpytest("--funparam-compact", "--junitxml=out.xml")
+    result.assert_outcomes(passed=9, failed=2, skipped=1)
+
+    suite = ET.parse(str(testdir.tmpdir.join("out.xml"))).find("testsuite")
+    assert suite is not None
+    names = [testcase.get("name") for testcase in suite.iter("testcase")]
+    assert names == [
+        "test_many", "test_many[8]", "test_many[9]", "test_many[10]",
+        "test_plain",
+    ]
+    assert suite.get("tests") == "5"
+    group = suite.find("testcase")
+    assert group is not None
+    assert group.find("properties/property").attrib == {
+        "name": "funparam_passed_cases", "value": "8",
+    }
+    assert suite.find("testcase[@name='test_many[8]']/failure") is not None
+
+
+def test_results_file(testdir):
+    testdir.makepyfile(MANY_CASES_TEST)
+    result = testdir.runpytest("--funparam-results=results.csv")
+    result.assert_outcomes(passed=9, failed=2, skipped=1)
+    result.stdout.fnmatch_lines([
+        "funparam: wrote 11 case result(s) to *results.csv",
+    ])
+
+    with testdir.tmpdir.join("results.csv").open() as results_file:
+        rows = list(csv.DictReader(results_file))
+    assert len(rows) == 11
+    assert {row["test"] for row in rows} == {
+        "test_results_file.py::test_many",
+    }
+    outcomes = {row["case"]: row["outcome"] for row in rows}
+    assert outcomes["0"] == "passed"
+    assert outcomes["9"] == "failed"
+    assert outcomes["10"] == "skipped"
+    assert float(rows[0]["duration"]) >= 0
+    assert rows[10]["duration"] == ""
@@ -0,0 +1,116 @@
+import subprocess
+import sys
+
+import pytest
+
+from pytest_funparam._locks import unlock
+
+
+RESOURCE_TEST = """\
+    import os
+    import time
+
+    def test_db(funparam):
+
+        @funparam
+        def verify_query(num):
+            start = time.time()
+            time.sleep(0.1)
+            line = "{} {}\\n".format(start, time.time())
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+            fd = os.open("intervals.txt", flags)
+            try:
+                os.write(fd, line.encode())
+            finally:
+                os.close(fd)
+
+        for num in range(3):
+            verify_query.resources(db=1)(num)
+"""
+
+
+def test_tokens_are_all_or_nothing(testdir):
+    testdir.makeini("""\
+        [pytest]
+        funparam_resources =
+            db = 2
+            ports = 1
+    """)
+    config = testdir.parseconfigure()
+    plugin = config.pluginmanager.get_plugin("funparam-resources")
+
+    first = plugin.try_acquire({"db": 1})
+    assert first is not None
+    # Only one db token is left, so nothing is taken.
+    assert plugin.try_acquire({"db": 2, "ports": 1}) is None
+    second = plugin.try_acquire({"db": 1, "ports": 1})
+    assert second is not None
+    assert plugin.try_acquire({"ports": 1}) is None
+    for handle in first + second:
+        unlock(handle)
+    assert plugin.try_acquire({"ports": 1}) is not None
+
+
+def test_resources_throttle_across_processes(testdir):
+    testdir.makeini("""\
+        [pytest]
+        funparam_resources = db=1
+    """)
+    testdir.makepyfile(RESOURCE_TEST)
+    runs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "pytest"],
+            cwd=str(testdir.tmpdir),
+            stdout=subprocess.DEVNULL,
+        )
+        for _ in range(2)
+    ]
+    assert [run.wait(timeout=60) for run in runs] == [0, 0]
+
+    intervals = sorted(
+        tuple(map(float, line.split()))
+        for line in testdir.tmpdir.join("intervals.txt").readlines()
+    )
+    assert len(intervals) == 6
+    for (_, end), (start, _) in zip(intervals, intervals[1:]):
+        assert end <= start
+
+
+def test_unknown_resource(testdir):
+    testdir.makepyfile("""\
+        def test_it(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify.resources(gpu=1)(1)
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "*unknown resource 'gpu'; set its capacity with a line like 'gpu=1' "
+        "in the funparam_resources ini option",
+    ])
+
+
+def test_bad_capacity(testdir):
+    testdir.makeini("""\
+        [pytest]
+        funparam_resources = db=none
+    """)
+    testdir.makepyfile(RESOURCE_TEST)
+    result = testdir.runpytest()
+    assert result.ret != 0
+    result.stderr.fnmatch_lines([
+        "*funparam_resources: expected NAME=COUNT with a positive COUNT*",
+    ])
+
+
+@pytest.mark.parametrize("count", [0, 1.5])
+def test_resources_need_positive_token_counts(count):
+    from pytest_funparam._core import UnidentifiedFunparamFunction
+
+    function = UnidentifiedFunparamFunction(print)
+    with pytest.raises(ValueError, match="positive number of tokens"):
+        function.resources(db=count)
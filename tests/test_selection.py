@@ -0,0 +1,160 @@
+import pytest
+
+
+SELECTION_TEST = """\
+    import os
+
+    import pytest
+
+    def record_dryrun(name):
+        with open(os.environ["DRYRUN_LOG"], "a") as log:
+            log.write(name + "\\n")
+
+    def test_one(funparam):
+        if funparam.dryrun:
+            record_dryrun("test_one")
+
+        @funparam
+        def verify(num):
+            assert num == 1
+
+        verify(1)
+
+    @pytest.mark.slow
+    def test_two(funparam):
+        if funparam.dryrun:
+            record_dryrun("test_two")
+
+        @funparam
+        def verify(num):
+            assert num == 2
+
+        verify(2)
+
+    def test_three(funparam):
+        if funparam.dryrun:
+            record_dryrun("test_three")
+
+        @funparam
+        def verify(num):
+            assert num == 3
+
+        verify(3)
+"""
+
+
+@pytest.fixture
+def dryrun_log(testdir, monkeypatch):
+    path = testdir.tmpdir.join("dryrun.log")
+    monkeypatch.setenv("DRYRUN_LOG", str(path))
+
+    def dryruns():
+        if not path.check():
+            return set()
+        names = set(path.read().split())
+        path.remove()
+        return names
+
+    testdir.makeini("""\
+        [pytest]
+        markers = slow
+    """)
+    return dryruns
+
+
+ALL_TESTS = {"test_one", "test_two", "test_three"}
+
+
+@pytest.mark.parametrize("args, selected, dryruns", [
+    ([], ALL_TESTS, ALL_TESTS),
+    (["{path}::test_one"], {"test_one"}, {"test_one"}),
+    (["{path}::test_two[0]"], {"test_two"}, {"test_two"}),
+    (
+        ["--deselect={path}::test_one"],
+        {"test_two", "test_three"},
+        {"test_two", "test_three"},
+    ),
+    (
+        ["-m", "not slow"],
+        {"test_one", "test_three"},
+        {"test_one", "test_three"},
+    ),
+    (["-k", "not test_t"], {"test_one"}, {"test_one"}),
+    # The cases of the other tests could have marks or ids that match.
+    (["-m", "slow"], {"test_two"}, ALL_TESTS),
+    (["-k", "three or one"], {"test_one", "test_three"}, ALL_TESTS),
+    (["-m", "slow and not slow"], set(), set()),
+])
+def test_skip_deselected(testdir, dryrun_log, args, selected, dryruns):
+    path = testdir.makepyfile(SELECTION_TEST)
+    args = [arg.format(path=path.basename) for arg in args]
+    if not any(arg.startswith(path.basename) for arg in args):
+        args.append(path.basename)
+
+    result = testdir.runpytest("--funparam-skip-deselected", *args)
+    result.assert_outcomes(passed=len(selected))
+    assert dryrun_log() == dryruns
+
+    # Without the option, every test is dry run.
+    result = testdir.runpytest(*args)
+    result.assert_outcomes(passed=len(selected))
+    assert dryrun_log() == ALL_TESTS
+
+
+def test_skip_deselected_last_failed(testdir, dryrun_log, monkeypatch):
+    testdir.makepyfile(SELECTION_TEST)
+    monkeypatch.setenv("FAIL", "1")
+    testdir.makeconftest("""\
+        import os
+
+        def pytest_runtest_call(item):
+            if os.environ.get("FAIL") and "test_two" in item.nodeid:
+                raise AssertionError("failing on purpose")
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2, failed=1)
+    dryrun_log()
+
+    result = testdir.runpytest("--funparam-skip-deselected", "--lf")
+    result.assert_outcomes(failed=1)
+    assert dryrun_log() == {"test_two"}
+
+
+def test_skip_deselected_last_failed_gone(testdir, dryrun_log):
+    testdir.makepyfile(
+        SELECTION_TEST + "\n"
+        "    def test_gone():\n"
+        "        assert False\n"
+    )
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3, failed=1)
+
+    # Without the failing test, `--lf` has nothing to rerun, so it runs
+    # everything.
+    testdir.makepyfile(SELECTION_TEST)
+    result = testdir.runpytest("--funparam-skip-deselected", "--lf")
+    result.assert_outcomes(passed=3)
+
+
+def test_skip_deselected_keeps_case_marks_and_ids(testdir, dryrun_log):
+    testdir.makepyfile("""\
+        import pytest
+
+        def test_cases(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+            verify.marks(pytest.mark.slow)(2)
+            verify.id("special")(3)
+    """)
+    result = testdir.runpytest("--funparam-skip-deselected", "-m", "slow")
+    result.assert_outcomes(passed=1)
+    result = testdir.runpytest("--funparam-skip-deselected", "-k", "special")
+    result.assert_outcomes(passed=1)
+    result = testdir.runpytest(
+        "--funparam-skip-deselected", "-m", "not slow", "-k", "not special",
+    )
+    result.assert_outcomes(passed=1)
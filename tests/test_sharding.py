@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+
+SHARD_TEST = """\
+    def test_many(funparam):
+
+        @funparam
+        def verify_int(num):
+            assert int(num) == num
+
+        for num in range(40):
+            verify_int(num)
+
+    def test_plain():
+        pass
+"""
+
+
+def collect_names(testdir, *args):
+    result = testdir.runpytest("--collect-only", "-q", *args)
+    return {
+        line.split("::")[-1]
+        for line in result.outlines
+        if "::" in line
+    }
+
+
+@pytest.mark.parametrize("shard_by", ["hash", "duration"])
+def test_shards_partition_cases(testdir, shard_by):
+    testdir.makepyfile(SHARD_TEST)
+    # Give the duration-based split some history to work from.
+    testdir.runpytest("--funparam-durations=durations.json")
+    assert testdir.tmpdir.join("durations.json").check()
+
+    everything = collect_names(testdir)
+    shards = [
+        collect_names(
+            testdir,
+            "--funparam-shard={}/3".format(index),
+            "--funparam-shard-by=" + shard_by,
+            "--funparam-durations=durations.json",
+        )
+        for index in (1, 2, 3)
+    ]
+
+    assert set.union(*shards) == everything
+    assert sum(len(shard) for shard in shards) == len(everything)
+    for shard in shards:
+        # Every shard gets a share of the work.
+        assert len(shard) >= 5
+
+
+PARAMETRIZED_SHARD_TEST = """\
+    import pytest
+
+    @pytest.mark.parametrize("n", range(30))
+    def test_p(n, funparam):
+
+        @funparam
+        def verify_int(num):
+            assert int(num) == num
+
+        verify_int(n)
+"""
+
+
+@pytest.mark.parametrize("shard_by", ["hash", "duration"])
+def test_shards_balance_parametrized_tests(testdir, shard_by):
+    testdir.makepyfile(PARAMETRIZED_SHARD_TEST)
+    testdir.runpytest("--funparam-durations=durations.json")
+
+    shards = [
+        collect_names(
+            testdir,
+            "--funparam-shard={}/3".format(index),
+            "--funparam-shard-by=" + shard_by,
+            "--funparam-durations=durations.json",
+        )
+        for index in (1, 2, 3)
+    ]
+
+    assert sum(len(shard) for shard in shards) == 30
+    for shard in shards:
+        # Each parametrization's case has a node id of its own, so they
+        # don't all land on one shard.
+        assert len(shard) >= 5
+
+
+def test_shard_by_duration_uses_parametrized_node_ids(testdir):
+    testdir.makepyfile(PARAMETRIZED_SHARD_TEST)
+    durations = {
+        "test_shard_by_duration_uses_parametrized_node_ids.py::"
+        "test_p[0-{}]".format(n): 0.01
+        for n in range(30)
+    }
+    durations[
+        "test_shard_by_duration_uses_parametrized_node_ids.py::test_p[0-0]"
+    ] = 100.0
+    testdir.tmpdir.join("durations.json").write(json.dumps(durations))
+
+    shard = collect_names(
+        testdir,
+        "--funparam-shard=1/3",
+        "--funparam-shard-by=duration",
+        "--funparam-durations=durations.json",
+    )
+    # The slow case has a shard to itself.
+    assert shard == {"test_p[0-0]"}
+
+
+def test_shard_never_creates_other_items(testdir):
+    testdir.makepyfile("""\
+        def test_one(funparam):
+
+            @funparam
+            def verify(num):
+                assert num == 1
+
+            verify(1)
+    """)
+    outcomes = []
+    for index in (1, 2):
+        result = testdir.runpytest("--funparam-shard={}/2".format(index))
+        outcomes.append(result.parseoutcomes())
+    # The single case runs on exactly one shard, and the other shard doesn't
+    # get an "empty parameter set" skip for it.
+    assert sorted(outcome.get("passed", 0) for outcome in outcomes) == [0, 1]
+    assert not any("skipped" in outcome for outcome in outcomes)
+
+
+def test_shard_by_duration_needs_shared_durations(testdir):
+    testdir.makepyfile(SHARD_TEST)
+    # Durations in one node's pytest cache aren't enough.
+    testdir.runpytest("--funparam-order=longest-first")
+    result = testdir.runpytest(
+        "--funparam-shard=1/2", "--funparam-shard-by=duration",
+    )
+    assert result.ret != 0
+    result.stderr.fnmatch_lines([
+        "*--funparam-shard-by=duration needs --funparam-durations=PATH*",
+    ])
+
+
+@pytest.mark.parametrize("value", ["3/2", "0/2", "1", "a/b"])
+def test_shard_rejects_bad_values(testdir, value):
+    testdir.makepyfile(SHARD_TEST)
+    result = testdir.runpytest("--funparam-shard=" + value)
+    assert result.ret != 0
+    result.stderr.fnmatch_lines(["*expected I/N with 1 <= I <= N*"])
@@ -0,0 +1,97 @@
+import array
+
+import pytest
+
+from pytest_funparam._shared import map_buffer, write_buffer
+
+
+SHARED_TEST = """\
+    import array
+
+    def test_blob(funparam):
+
+        def load():
+            if not funparam.dryrun:
+                with open("loads.txt", "a") as loads:
+                    loads.write("load\\n")
+            return array.array("i", range(1000))
+
+        numbers = funparam.shared("numbers", load)
+
+        @funparam
+        def verify_number(index):
+            assert isinstance(numbers, memoryview)
+            assert numbers.readonly
+            assert numbers[index] == index
+
+        for index in (0, 10, 999):
+            verify_number(index)
+"""
+
+
+@pytest.mark.parametrize("value", [
+    b"",
+    b"some bytes",
+    bytearray(b"mutable bytes"),
+    array.array("d", [1.5, 2.5, 3.5]),
+])
+def test_buffer_round_trip(tmp_path, value):
+    path = tmp_path / "buffer"
+    write_buffer(path, value)
+    view = map_buffer(path)
+    assert view.readonly
+    assert view.format == memoryview(value).format
+    assert view.tolist() == memoryview(value).tolist()
+
+
+def test_array_round_trip(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    path = tmp_path / "buffer"
+    values = [
+        numpy.arange(12, dtype=numpy.float32).reshape(3, 4),
+        # Not contiguous.
+        numpy.arange(12, dtype=">i8").reshape(3, 4)[:, ::2],
+        numpy.zeros(3, dtype=[("x", "<f8"), ("label", "S4")]),
+    ]
+    for value in values:
+        write_buffer(path, value)
+        mapped = map_buffer(path)
+        assert mapped.dtype == value.dtype
+        assert (mapped == value).all()
+        assert not mapped.flags.writeable
+
+
+def test_shared_computes_once(testdir):
+    testdir.makepyfile(SHARED_TEST)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
+    assert testdir.tmpdir.join("loads.txt").readlines() == ["load\n"]
+    # The run's scratch directory is gone, along with the buffer.
+    runs = testdir.tmpdir.join(".pytest_cache", "d", "funparam-runs")
+    assert runs.listdir() == []
+
+
+def test_shared_without_cache(testdir):
+    testdir.makepyfile(SHARED_TEST)
+    result = testdir.runpytest("-p", "no:cacheprovider")
+    result.assert_outcomes(passed=3)
+    assert testdir.tmpdir.join("loads.txt").readlines() == ["load\n"]
+
+
+def test_shared_per_parametrization(testdir):
+    testdir.makepyfile("""\
+        import pytest
+
+        @pytest.mark.parametrize("n", [1, 2])
+        def test_repeated(funparam, n):
+            data = funparam.shared("data", lambda: bytes([n] * n))
+
+            @funparam
+            def verify(index):
+                assert data.tobytes() == bytes([n] * n)
+
+            for index in range(n):
+                verify(index)
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
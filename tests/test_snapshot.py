@@ -0,0 +1,99 @@
+import pytest
+
+from pytest_funparam._snapshot import SnapshotStore, dumps
+
+
+SNAPSHOT_TEST = """\
+    import os
+
+    def test_square(funparam):
+
+        @funparam.snapshot
+        def verify_square(num):
+            if os.environ.get("BROKEN_SQUARE") == str(num):
+                return num * 3
+            return {"square": num * num}
+
+        verify_square(2)
+        verify_square(3)
+        verify_square.id("five")(5)
+"""
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / "snapshots.bin")
+    store = SnapshotStore(path)
+    assert store.index == {}
+    store.save({"a": dumps([1, 2]), "b": dumps("bee")})
+    store.close()
+
+    store = SnapshotStore(path)
+    store.save({"b": dumps("bumble"), "c": dumps(None)})
+    store.close()
+
+    store = SnapshotStore(path)
+    try:
+        assert sorted(store.index) == ["a", "b", "c"]
+        with store.get("a") as value:
+            assert value == dumps([1, 2])
+        with store.get("b") as value:
+            assert value == dumps("bumble")
+    finally:
+        store.close()
+
+
+def test_store_rejects_other_files(tmp_path):
+    path = tmp_path / "snapshots.bin"
+    path.write_bytes(b"not a snapshot store")
+    with pytest.raises(ValueError, match="not a funparam snapshot store"):
+        SnapshotStore(str(path))
+
+
+def test_snapshot_update_then_compare(testdir, monkeypatch):
+    testdir.makepyfile(SNAPSHOT_TEST)
+
+    result = testdir.runpytest()
+    result.assert_outcomes(failed=3)
+    result.stdout.fnmatch_lines([
+        "*no snapshot stored for *test_square[[]0[]]*"
+        "--funparam-snapshot-update*",
+    ])
+
+    result = testdir.runpytest("--funparam-snapshot-update")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines([
+        "funparam: updated 3 snapshot(s) in *funparam-snapshots.bin",
+    ])
+
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=3)
+
+    monkeypatch.setenv("BROKEN_SQUARE", "3")
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines([
+        "*output doesn't match the snapshot for *test_square[[]1[]]:",
+        "*expected: {'square': 9}",
+        "*got:      9",
+    ])
+
+
+def test_snapshot_compares_values_not_bytes(testdir, monkeypatch):
+    testdir.makepyfile("""\
+        import os
+
+        def test_dict(funparam):
+
+            @funparam.snapshot
+            def verify_dict(keys):
+                if os.environ.get("REVERSED"):
+                    keys = reversed(keys)
+                return {key: len(key) for key in keys}
+
+            verify_dict(["a", "bb"])
+    """)
+    testdir.runpytest("--funparam-snapshot-update")
+    # An equal dict, which pickles differently.
+    monkeypatch.setenv("REVERSED", "1")
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=1)
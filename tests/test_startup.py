@@ -0,0 +1,108 @@
+import pytest
+
+
+REPORT_MODULES = """\
+    import sys
+
+    def pytest_sessionfinish(session):
+        loaded = [
+            name for name in ("pytest_funparam._core", "unittest.mock")
+            if name in sys.modules
+        ]
+        with open("modules.txt", "w") as modules:
+            modules.write(" ".join(loaded))
+"""
+
+
+@pytest.mark.parametrize("test_source, expected", [
+    (
+        """\
+        def test_plain():
+            pass
+        """,
+        "",
+    ),
+    (
+        """\
+        def test_funparam(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+        """,
+        "pytest_funparam._core unittest.mock",
+    ),
+])
+def test_core_loaded_on_demand(testdir, test_source, expected):
+    testdir.makeconftest(REPORT_MODULES)
+    testdir.makepyfile(test_source)
+    result = testdir.runpytest_subprocess()
+    result.assert_outcomes(passed=1)
+    assert testdir.tmpdir.join("modules.txt").read() == expected
+
+
+# Imported by the plugins behind the fixture's features.
+FEATURE_MODULES = {
+    "pytest_funparam._maxfail",
+    "pytest_funparam._memo",
+    "pytest_funparam._resources",
+    "pytest_funparam._shared",
+    "pytest_funparam._snapshot",
+    "mmap",
+    "pickle",
+}
+
+
+@pytest.mark.parametrize("test_source, uses_funparam", [
+    (
+        """\
+        def test_plain():
+            pass
+        """,
+        False,
+    ),
+    (
+        """\
+        def test_funparam(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify(1)
+        """,
+        True,
+    ),
+])
+def test_feature_plugins_imported_on_demand(
+    testdir, test_source, uses_funparam,
+):
+    # A fresh interpreter, so nothing imported earlier hides what the
+    # session imports.
+    testdir.makeconftest("""\
+        import sys
+
+        def pytest_unconfigure(config):
+            with open("modules.txt", "w") as modules:
+                modules.write(" ".join(sorted(sys.modules)))
+    """)
+    testdir.makepyfile(test_source)
+    result = testdir.runpytest_subprocess()
+    result.assert_outcomes(passed=1)
+    modules = set(testdir.tmpdir.join("modules.txt").read().split())
+    assert "pytest_funparam" in modules
+    if uses_funparam:
+        assert FEATURE_MODULES <= modules
+    else:
+        assert modules.isdisjoint(FEATURE_MODULES)
+
+
+def test_public_names_still_importable():
+    from pytest_funparam import FunparamFixture, NestedFunparamError
+    from pytest_funparam._core import FunparamFixture as CoreFixture
+    assert FunparamFixture is CoreFixture
+    assert issubclass(NestedFunparamError, Exception)
+    with pytest.raises(ImportError):
+        from pytest_funparam import NoSuchThing  # noqa: F401
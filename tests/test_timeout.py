@@ -0,0 +1,98 @@
+import pytest
+
+
+HANGING_TEST = """\
+    import threading
+    import time
+
+    def test_hang(funparam):
+
+        @funparam(timeout=0.2)
+        def verify_wait(seconds):
+            threading.Event().wait(seconds)
+
+        verify_wait(0)
+        verify_wait.id("hangs")(60)
+        verify_wait.timeout(5)(0.3)
+        verify_wait.many([(0,), (60,)])
+        verify_wait(0)
+"""
+
+
+def test_timeout_fails_only_the_slow_case(testdir):
+    testdir.makepyfile(HANGING_TEST)
+    result = testdir.runpytest("-v")
+    result.assert_outcomes(passed=4, failed=2)
+    result.stdout.fnmatch_lines([
+        "*::test_hang[[]0[]] PASSED*",
+        "*::test_hang[[]hangs[]] FAILED*",
+        "*::test_hang[[]2[]] PASSED*",
+        "*::test_hang[[]3[]] PASSED*",
+        "*::test_hang[[]4[]] FAILED*",
+        "*::test_hang[[]5[]] PASSED*",
+    ])
+    result.stdout.fnmatch_lines([
+        "E*FunparamTimeoutError: case hangs: verify_wait(60) timed out "
+        "after 0.2s",
+    ])
+    result.stdout.fnmatch_lines([
+        "E*FunparamTimeoutError: case 4: verify_wait(60) timed out "
+        "after 0.2s",
+    ])
+
+
+def test_timeout_in_thread(testdir):
+    # Off the main thread, there's no SIGALRM to lean on.
+    testdir.makepyfile("""\
+        import threading
+
+        from pytest_funparam._timeout import (
+            FunparamTimeoutError, call_with_timeout,
+        )
+        import pytest
+
+        def test_thread():
+            errors = []
+
+            def run():
+                try:
+                    call_with_timeout(
+                        threading.Event().wait, (60,), {}, 0.1, "slow",
+                    )
+                except FunparamTimeoutError as exc:
+                    errors.append(str(exc))
+
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join(10)
+            assert errors == ["case slow: wait(60) timed out after 0.1s"]
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(passed=1)
+
+
+def test_arguments_only_formatted_on_timeout():
+    from pytest_funparam._timeout import call_with_timeout
+
+    class Expensive:
+        def __repr__(self):
+            raise AssertionError("repr() of a call that didn't time out")
+
+    assert call_with_timeout(len, ([Expensive()],), {}, 10) == 1
+
+
+@pytest.mark.parametrize("timeout", ["0", "-1"])
+def test_timeout_must_be_positive(testdir, timeout):
+    testdir.makepyfile("""\
+        def test_bad(funparam):
+
+            @funparam
+            def verify(num):
+                pass
+
+            verify.timeout({})(1)
+    """.format(timeout))
+    result = testdir.runpytest()
+    result.stdout.fnmatch_lines([
+        "*ValueError: timeout must be a positive number of seconds*",
+    ])
@@ -0,0 +1,109 @@
+import pytest
+
+from pytest_funparam._vectorized import (
+    _failing_rows_without_numpy,
+    failing_rows,
+)
+
+
+@pytest.mark.parametrize("find_failing", [
+    failing_rows,
+    _failing_rows_without_numpy,
+])
+def test_failing_rows(find_failing):
+    assert find_failing([True, False, True, False], 4) == [1, 3]
+    assert find_failing(True, 3) == []
+    assert find_failing(False, 2) == [0, 1]
+    with pytest.raises(ValueError, match="expected a result for each of 3"):
+        find_failing([True], 3)
+
+
+def test_failing_rows_none():
+    assert failing_rows(None, 5) == []
+
+
+def test_vectorized_lists(testdir):
+    testdir.makepyfile("""\
+        def test_squares(funparam):
+
+            @funparam.vectorized(chunk_size=4)
+            def verify_square(x, expected):
+                return [a * a == b for a, b in zip(x, expected)]
+
+            verify_square(
+                list(range(10)),
+                expected=[0, 1, 4, 9, 16, 0, 36, 49, 0, 81],
+            )
+    """)
+    result = testdir.runpytest("-v")
+    result.assert_outcomes(passed=1, failed=2)
+    result.stdout.fnmatch_lines([
+        "*::test_squares[[]rows0-3[]] PASSED*",
+        "*::test_squares[[]rows4-7[]] FAILED*",
+        "*::test_squares[[]rows8-9[]] FAILED*",
+    ])
+    result.stdout.fnmatch_lines([
+        "E*VectorizedFailure: 1 of 4 rows failed in rows 4-7:",
+        "E*  row 5: x=5, expected=0",
+    ])
+    result.stdout.fnmatch_lines([
+        "E*VectorizedFailure: 1 of 2 rows failed in rows 8-9:",
+        "E*  row 8: x=8, expected=0",
+    ])
+
+
+def test_vectorized_keyword_columns_out_of_order(testdir):
+    testdir.makepyfile("""\
+        def test_columns(funparam):
+
+            @funparam.vectorized
+            def verify(a, b):
+                return [x != "a1" for x in a]
+
+            verify(b=[100, 200], a=["a0", "a1"])
+    """)
+    result = testdir.runpytest()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "E*  row 1: b=200, a='a1'",
+    ])
+
+
+def test_vectorized_numpy(testdir):
+    pytest.importorskip("numpy")
+    testdir.makepyfile("""\
+        import numpy as np
+
+        def test_sqrt(funparam):
+
+            @funparam.vectorized
+            def verify_sqrt(x):
+                return np.isclose(np.sqrt(x) ** 2, x)
+
+            verify_sqrt(np.array([4.0, -1.0, 9.0, -4.0]))
+    """)
+    result = testdir.runpytest("-W", "ignore::RuntimeWarning")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines([
+        "E*2 of 4 rows failed in rows 0-3:",
+        "E*  row 1: x=*-1.0*",
+        "E*  row 3: x=*-4.0*",
+    ])
+
+
+def test_vectorized_mismatched_columns(testdir):
+    testdir.makepyfile("""\
+        import pytest
+
+        def test_columns(funparam):
+
+            @funparam.vectorized
+            def verify(a, b):
+                pass
+
+            with pytest.raises(ValueError, match="same length"):
+                verify([1, 2], [1])
+    """)
+    result = testdir.runpytest()
+    # No chunks, so no items to run.
+    result.assert_outcomes(skipped=1)
@@ -0,0 +1,149 @@
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from pytest_funparam._watch import code_fingerprint, module_fingerprints
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="--funparam-watch needs os.fork()",
+)
+
+
+WATCHED_TEST = """\
+    def scaled(num):
+        return num
+
+    def test_cases(funparam):
+        limit = 10
+
+        @funparam
+        def verify_small(num):
+            assert scaled(num) < limit
+
+        verify_small(1)
+        verify_small(2)
+
+    def test_other(funparam):
+
+        @funparam
+        def verify_positive(num):
+            assert num > 0
+
+        verify_positive(1)
+        verify_positive(2)
+"""
+
+
+class Watching:
+
+    def __init__(self, testdir):
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "pytest", "--funparam-watch",
+                "-p", "no:cacheprovider",
+            ],
+            cwd=str(testdir.tmpdir),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            self.lines.put(line.rstrip("\n"))
+
+    def wait_for_run(self):
+        """
+        Return the lines printed by the next run.
+        """
+        lines = []
+        while True:
+            line = self.lines.get(timeout=30)
+            if line.startswith("funparam watch: waiting for changes"):
+                return lines
+            lines.append(line)
+
+    def stop(self):
+        self.process.send_signal(signal.SIGINT)
+        self.process.wait(timeout=30)
+        self.process.stdout.close()
+
+
+@pytest.fixture
+def watching(testdir):
+    testdir.makepyfile(WATCHED_TEST)
+    watching = Watching(testdir)
+    yield watching
+    watching.stop()
+
+
+def test_watch_reruns_changed_cases(testdir, watching):
+    assert "4 passed" in "\n".join(watching.wait_for_run())
+    # A value the verify function captures changed, so every case of that
+    # test runs again, but not those of the other test.
+    testdir.makepyfile(WATCHED_TEST.replace("limit = 10", "limit = 0"))
+
+    output = "\n".join(watching.wait_for_run())
+    assert "2 failed, 2 deselected" in output
+    assert "funparam watch: 2 unchanged case(s) not re-run" in output
+
+    # A change outside the test modules runs everything again.
+    testdir.makepyfile(helper="VALUE = 1\n")
+    output = "\n".join(watching.wait_for_run())
+    assert "2 failed, 2 passed" in output
+
+
+def test_watch_reruns_module_after_helper_change(testdir, watching):
+    assert "4 passed" in "\n".join(watching.wait_for_run())
+    testdir.makepyfile(
+        WATCHED_TEST.replace("return num", "return num * 100")
+    )
+
+    output = "\n".join(watching.wait_for_run())
+    assert "2 failed, 2 passed" in output
+    assert "unchanged case(s)" not in output
+
+
+def test_code_fingerprint_ignores_position():
+    first = compile("def f():\n    return g(1)\n", "a.py", "exec")
+    moved = compile("\n\n\ndef f():\n    return g(1)\n", "a.py", "exec")
+    changed = compile("def f():\n    return g(2)\n", "a.py", "exec")
+    assert code_fingerprint(first) == code_fingerprint(moved)
+    assert code_fingerprint(first) != code_fingerprint(changed)
+
+
+def test_module_fingerprints():
+    source = "X = 1\n\ndef test_a():\n    pass\n\ndef test_b():\n    pass\n"
+
+    def is_test(name):
+        return name.startswith("test")
+
+    rest, functions = module_fingerprints(source, is_test)
+    assert set(functions) == {"test_a", "test_b"}
+
+    # Comments and blank lines don't count.
+    assert module_fingerprints(
+        "# comment\n" + source.replace("\n\n", "\n\n\n"), is_test,
+    ) == (rest, functions)
+
+    changed_test = module_fingerprints(
+        source.replace("def test_b():\n    pass", "def test_b():\n    1"),
+        is_test,
+    )
+    assert changed_test[0] == rest
+    assert changed_test[1]["test_a"] == functions["test_a"]
+    assert changed_test[1]["test_b"] != functions["test_b"]
+
+    changed_constant = module_fingerprints(
+        source.replace("X = 1", "X = 2"), is_test,
+    )
+    assert changed_constant[0] != rest
+    assert changed_constant[1] == functions